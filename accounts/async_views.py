@@ -0,0 +1,9 @@
+from django.http import JsonResponse
+
+from api.asynchronous import async_api_view
+from .serializers import UserSerializer
+
+
+@async_api_view()
+async def me(request):
+    return JsonResponse(UserSerializer(request.user, context={"request": request}).data)
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import active_users
+
+
+class RoleTokenUser(TokenUser):
+    """کاربر سبک ساخته‌شده از claim های توکن؛ برای خواندن role و شناسه‌ها نیازی به دیتابیس نیست."""
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def email(self):
+        return self.token.get("email", "")
+
+    @cached_property
+    def role(self):
+        return self.token.get("role")
+
+    @cached_property
+    def student_id(self):
+        return self.token.get("student_id")
+
+    @cached_property
+    def professor_id(self):
+        return self.token.get("professor_id")
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication با مسیر سریع اختیاری (JWT_STATELESS_READS).
+
+    در درخواست‌های خواندنی، اگر توکن claim نقش را داشته باشد، کاربر از خود توکن ساخته می‌شود و فقط
+    وضعیت فعال بودن از LRU بررسی می‌شود. درخواست‌های تغییر دهنده همیشه کاربر کامل را از دیتابیس می‌خوانند.
+    """
+
+    def authenticate(self, request):
+        self._safe_request = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    async def aauthenticate(self, request):
+        """
+        همان authenticate برای view های async (api.asynchronous) روی HttpRequest خام Django.
+        اعتبارسنجی توکن فقط CPU است؛ خواندن کاربر (یا LRU) در thread جدا انجام می‌شود.
+        """
+        self._safe_request = request.method in SAFE_METHODS
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await sync_to_async(self.get_user)(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        stateless = (
+            getattr(settings, "JWT_STATELESS_READS", False)
+            and getattr(self, "_safe_request", False)
+            and "role" in validated_token
+        )
+        if not stateless:
+            return super().get_user(validated_token)
+
+        user = RoleTokenUser(validated_token)
+        if not active_users.is_active(user.id):
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
@@ -0,0 +1,171 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class BloomFilter:
+    """
+    Bloom filter ساده روی bytearray؛ «نیست» قطعی است و «هست» ممکن است مثبت کاذب باشد.
+    k مکان بیت با double hashing از یک blake2b ساخته می‌شود.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class TokenBlacklist:
+    """
+    جلوی جدول BlacklistedToken برای بررسی پرتکرار refresh token.
+
+    Bloom filter همه jti های blacklist شده منقضی‌نشده را نگه می‌دارد. توکنی که در filter نیست بدون کوئری
+    پذیرفته می‌شود. برای «شاید» ابتدا کش و سپس دیتابیس بررسی می‌شود تا مثبت کاذب رد نشود.
+    filter هر sync_seconds ردیف‌های بعد از آخرین شناسه دیده‌شده را از دیتابیس می‌خواند. پس توکنی که
+    پروسه دیگری blacklist کرده حداکثر همین مدت در این پروسه دیده نمی‌شود. در همین پروسه فوراً دیده می‌شود.
+
+    شناسه‌ها قبل از commit گرفته می‌شوند (sequence در Postgres)، پس ردیفی با pk کوچک‌تر ممکن است بعد از
+    ردیف بزرگ‌تر commit شود. هر sync پنجره sync_overlap شناسه قبل از آخرین شناسه را دوباره می‌خواند و
+    filter هر rebuild_seconds از نو ساخته می‌شود تا ردیف‌های دیرتر از آن پنجره هم دیر یا زود دیده شوند.
+    """
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001, sync_seconds=2, sync_overlap=1000,
+                 rebuild_seconds=600, cache_alias="default"):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self.sync_overlap = sync_overlap
+        self.rebuild_seconds = rebuild_seconds
+        self.cache_alias = cache_alias
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            self._last_id = 0
+            self._synced_at = None
+            self._built_at = None
+            self._added = None
+
+    def _cache_key(self, jti):
+        return f"jwt:blacklisted:{jti}"
+
+    def _rows(self, after):
+        return BlacklistedToken.objects.filter(
+            pk__gt=after, token__expires_at__gt=timezone.now()
+        ).order_by("pk").values_list("pk", "token__jti")
+
+    def sync(self, force=False):
+        now = time.monotonic()
+        if not force and self._synced_at is not None and now - self._synced_at < self.sync_seconds:
+            return
+        # با پر شدن filter نرخ مثبت کاذب بالا می‌رود؛ از نو ساخته می‌شود (ردیف‌های pruned دیگر نمی‌آیند)
+        if self._built_at is None or self.bloom.count >= self.capacity or now - self._built_at >= self.rebuild_seconds:
+            self.rebuild()
+            return
+
+        rows = self._rows(max(0, self._last_id - self.sync_overlap))
+        with self._lock:
+            for pk, jti in rows.iterator(chunk_size=5000):
+                # ردیف‌های پنجره تکراری دوباره شمرده نمی‌شوند
+                if jti not in self.bloom:
+                    self.bloom.add(jti)
+                self._last_id = max(self._last_id, pk)
+            self._synced_at = now
+
+    def rebuild(self):
+        """
+        filter تازه بیرون از قفل ساخته و سپس جایگزین می‌شود تا بررسی‌ها در این مدت filter خالی نبینند؛
+        jti هایی که در این فاصله در همین پروسه blacklist شده‌اند به filter تازه هم اضافه می‌شوند.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._added = []
+        bloom, last_id = BloomFilter(self.capacity, self.error_rate), 0
+        for pk, jti in self._rows(0).iterator(chunk_size=5000):
+            bloom.add(jti)
+            last_id = pk
+        with self._lock:
+            for jti in self._added:
+                bloom.add(jti)
+            self.bloom, self._last_id, self._added = bloom, last_id, None
+            self._synced_at = self._built_at = now
+
+    def is_blacklisted(self, jti):
+        self.sync()
+        if jti not in self.bloom:
+            return False
+
+        # فقط نتیجه مثبت کش می‌شود؛ «نیست» ممکن است بعداً در پروسه دیگری عوض شود
+        if caches[self.cache_alias].get(self._cache_key(jti)):
+            return True
+        found = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if found:
+            self._remember(jti)
+        return found
+
+    def add(self, jti):
+        with self._lock:
+            self.bloom.add(jti)
+            if self._added is not None:
+                self._added.append(jti)
+        self._remember(jti)
+
+    def _remember(self, jti):
+        timeout = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+        caches[self.cache_alias].set(self._cache_key(jti), True, timeout)
+
+
+token_blacklist = TokenBlacklist(
+    capacity=getattr(settings, "JWT_BLACKLIST_BLOOM_CAPACITY", 1_000_000),
+    sync_seconds=getattr(settings, "JWT_BLACKLIST_SYNC_SECONDS", 2),
+    sync_overlap=getattr(settings, "JWT_BLACKLIST_SYNC_OVERLAP", 1000),
+    rebuild_seconds=getattr(settings, "JWT_BLACKLIST_REBUILD_SECONDS", 600),
+)
+
+
+def prune_expired_tokens(batch_size=5000, pause=0.0, max_batches=None):
+    """
+    توکن‌های منقضی (و ردیف blacklist آن‌ها) را در دسته‌های محدود حذف می‌کند تا هر تراکنش کوتاه بماند
+    و قفل نوشتن برای مدت طولانی گرفته نشود. خروجی: تعداد توکن‌های حذف‌شده.
+    """
+    now = timezone.now()
+    # order_by() ترتیب پیش‌فرض مدل (user) را حذف می‌کند تا ایندکس expires_at استفاده شود
+    expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by()
+    deleted = batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            # ردیف‌های blacklist اول با یک DELETE حذف می‌شوند تا cascade چیزی برای جمع‌آوری نداشته باشد
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            deleted += OutstandingToken.objects.filter(pk__in=ids).delete()[0]
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return deleted
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+# هزینه هر hasher از تنظیمات خوانده می‌شود. اگر هزینه تغییر کند، must_update در ورود بعدی کاربر
+# true می‌شود و check_password رمز را با پارامترهای جدید دوباره hash می‌کند (rehash شفاف).
+# دستور calibrate_hashers زمان هر hasher را روی همین سرور اندازه می‌گیرد.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT["work_factor"]
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT["block_size"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT["parallelism"]
+
+    @property
+    def maxmem(self):
+        # حافظه مورد نیاز scrypt حدود 128 * n * r بایت است؛ سقف پیش‌فرض OpenSSL (32MB) کافی نیست
+        return 2 * 128 * self.work_factor * self.block_size
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """نیازمند argon2-cffi؛ بدون آن فقط زمانی خطا می‌دهد که این hasher واقعا استفاده شود."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2["time_cost"]
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2["memory_cost"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2["parallelism"]
+
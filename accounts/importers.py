@@ -0,0 +1,31 @@
+from django.contrib.auth.hashers import make_password
+
+from api.bulk import BulkImporter
+from .models import User
+
+
+class UserImporter(BulkImporter):
+    """
+    ستون‌ها: username, email, role, student_id, professor_id, first_name, last_name, password (اختیاری).
+
+    بدون ستون password حساب با رمز غیرقابل‌استفاده ساخته می‌شود؛ هش کردن رمز برای هر ردیف گران است.
+    رمز کاربران موجود در به‌روزرسانی تغییر نمی‌کند.
+    """
+    model = User
+    key_field = "username"
+    update_fields = ["email", "first_name", "last_name", "role", "student_id", "professor_id"]
+
+    def build(self, row):
+        def value(name):
+            return (row.get(name) or "").strip()
+
+        return User(
+            username=value("username"),
+            email=value("email"),
+            first_name=value("first_name"),
+            last_name=value("last_name"),
+            role=value("role"),
+            student_id=value("student_id") or None,
+            professor_id=value("professor_id") or None,
+            password=make_password(row.get("password") or None),
+        )
@@ -0,0 +1,45 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from accounts.models import User
+from accounts.revocation import active_users
+from accounts.tokens import RoleRefreshToken
+
+
+class Command(BaseCommand):
+    help = "Queries and latency per authenticated read request, with and without JWT_STATELESS_READS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username=f"bench-{uuid.uuid4().hex[:8]}", role="admin")
+        access = RoleRefreshToken.for_user(user).access_token
+        client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Bearer {access}")
+        count = options["requests"]
+
+        try:
+            for url in ("/api/accounts/me/", "/api/departments/departments/", "/api/courses/units_choices/"):
+                for stateless in (False, True):
+                    active_users.clear()
+                    with override_settings(JWT_STATELESS_READS=stateless):
+                        client.get(url)     # warm-up
+                        with CaptureQueriesContext(connection) as ctx:
+                            started = time.perf_counter()
+                            for _ in range(count):
+                                response = client.get(url)
+                            elapsed = time.perf_counter() - started
+                    assert response.status_code == 200, response.status_code
+
+                    mode = "stateless" if stateless else "db user"
+                    self.stdout.write(
+                        f"{url:<32} {mode:<10} {len(ctx.captured_queries) / count:.2f} queries/request, "
+                        f"{elapsed / count * 1000:.2f} ms/request"
+                    )
+        finally:
+            user.delete()
@@ -0,0 +1,115 @@
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+
+from accounts.models import User
+
+
+HASHERS = {
+    "pbkdf2": "accounts.hashers.PBKDF2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent login throughput per password hasher, and how a credential-stuffing burst "
+        "is cut off by the login throttles before hashing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--hashers", default="pbkdf2,scrypt,argon2")
+        parser.add_argument("--burst", type=int, default=200, help="Wrong-password attempts in the burst test.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}", role="student", student_id=f"{tag}{i}", password="!")
+            for i in range(options["users"])
+        )
+        users = User.objects.filter(username__startswith=f"bench-{tag}-")
+        try:
+            for name in options["hashers"].split(","):
+                preferred = HASHERS[name]
+                with override_settings(PASSWORD_HASHERS=[preferred] + [p for p in HASHERS.values() if p != preferred]):
+                    try:
+                        users.update(password=make_password("bench-password"))
+                    except ValueError as e:
+                        self.stdout.write(f"{name:<7} unavailable ({e})")
+                        continue
+                    self.run_logins(name, list(users.values_list("username", flat=True)), options["threads"])
+
+            self.run_burst(users.first().username, options["burst"])
+        finally:
+            users.delete()
+
+    def run_logins(self, name, usernames, threads):
+        cache.clear()
+        pending = iter(enumerate(usernames))
+        lock = threading.Lock()
+        latencies, failures = [], []
+
+        def worker():
+            client = Client(SERVER_NAME="localhost")
+            while True:
+                with lock:
+                    job = next(pending, None)
+                if job is None:
+                    return
+                i, username = job
+                started = time.perf_counter()
+                # هر ورود از IP جدا تا throttle آی‌پی در اندازه‌گیری ظرفیت دخالت نکند
+                response = client.post(
+                    "/api/accounts/login/", {"username": username, "password": "bench-password"},
+                    content_type="application/json", REMOTE_ADDR=f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                )
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+
+        started = time.perf_counter()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        self.stdout.write(
+            f"{name:<7} {len(latencies) / elapsed:6.1f} logins/s with {threads} threads, "
+            f"p50={statistics.median(latencies):.0f} ms p95={latencies[int(len(latencies) * 0.95) - 1]:.0f} ms, "
+            f"failures={len(failures)}"
+        )
+
+    def run_burst(self, username, attempts):
+        cache.clear()
+        client = Client(SERVER_NAME="localhost", REMOTE_ADDR="10.255.255.1")
+        statuses = {}
+        started = time.perf_counter()
+        rejected_ms = []
+        for _ in range(attempts):
+            t = time.perf_counter()
+            response = client.post(
+                "/api/accounts/login/", {"username": username, "password": "wrong"}, content_type="application/json"
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 429:
+                rejected_ms.append((time.perf_counter() - t) * 1000)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"burst: {attempts} wrong-password attempts in {elapsed:.2f}s; statuses={statuses}; "
+            f"hashed only {statuses.get(400, 0)}, throttled ones took "
+            f"{statistics.median(rejected_ms) if rejected_ms else 0:.2f} ms each"
+        )
@@ -0,0 +1,95 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.blacklist import prune_expired_tokens, token_blacklist
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh-token latency against a large token history, with the DB blacklist check and the "
+        "Bloom-filter front, before and after pruning. Use a scratch database (DB_NAME=...) for large runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tokens", type=int, default=10_000_000)
+        parser.add_argument("--live-ratio", type=float, default=0.02, help="Share of history not yet expired.")
+        parser.add_argument("--requests", type=int, default=300)
+        parser.add_argument("--batch-size", type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(username=f"bench-{tag}", role="student", student_id=tag)
+        try:
+            self.seed(user, tag, options)
+            self.measure("db blacklist", user, options["requests"], bloom=False)
+            self.measure("bloom front", user, options["requests"], bloom=True)
+
+            started = time.perf_counter()
+            deleted = prune_expired_tokens(batch_size=options["batch_size"])
+            self.stdout.write(f"prune: {deleted} expired tokens in {time.perf_counter() - started:.1f}s")
+
+            self.measure("db blacklist (pruned)", user, options["requests"], bloom=False)
+            self.measure("bloom front (pruned)", user, options["requests"], bloom=True)
+        finally:
+            OutstandingToken.objects.filter(jti__startswith=f"{tag}-").delete()
+            OutstandingToken.objects.filter(user=user).delete()
+            user.delete()
+
+    def seed(self, user, tag, options):
+        now = timezone.now()
+        total, live = options["tokens"], int(options["tokens"] * options["live_ratio"])
+        started = time.perf_counter()
+        for offset in range(0, total, options["batch_size"]):
+            count = min(options["batch_size"], total - offset)
+            tokens = OutstandingToken.objects.bulk_create(
+                OutstandingToken(
+                    user=user, jti=f"{tag}-{i}", token="x", created_at=now,
+                    # بیشتر تاریخچه منقضی شده است؛ هر توکن چرخیده‌شده blacklist هم شده
+                    expires_at=now + timedelta(days=1) if i < live else now - timedelta(days=1 + i % 30),
+                )
+                for i in range(offset, offset + count)
+            )
+            if not tokens[0].pk:
+                tokens = OutstandingToken.objects.filter(jti__in=[t.jti for t in tokens[::2]]).only("pk")
+            else:
+                tokens = tokens[::2]
+            BlacklistedToken.objects.bulk_create(BlacklistedToken(token_id=t.pk) for t in tokens)
+        self.stdout.write(
+            f"seeded {OutstandingToken.objects.count():,} outstanding / {BlacklistedToken.objects.count():,} "
+            f"blacklisted tokens in {time.perf_counter() - started:.0f}s"
+        )
+
+    def measure(self, label, user, count, bloom):
+        cache.clear()
+        token_blacklist.reset()
+        client = Client(SERVER_NAME="localhost")
+        refresh = str(RoleRefreshToken.for_user(user))
+        timings = []
+        with override_settings(JWT_BLACKLIST_BLOOM=bloom):
+            if bloom:
+                started = time.perf_counter()
+                token_blacklist.sync(force=True)
+                self.stdout.write(f"  bloom sync: {time.perf_counter() - started:.2f}s")
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.post("/api/accounts/refresh/", {"refresh": refresh}, content_type="application/json")
+                timings.append((time.perf_counter() - started) * 1000)
+                assert response.status_code == 200, response.content
+                refresh = response.data["refresh"]
+
+        timings.sort()
+        self.stdout.write(
+            f"{label:<24} refresh p50={statistics.median(timings):.2f} ms "
+            f"p95={timings[int(len(timings) * 0.95) - 1]:.2f} ms"
+        )
@@ -0,0 +1,43 @@
+import os
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Time each configured password hasher on this machine and suggest a PBKDF2 iteration count."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--target-ms", type=float, default=250, help="Desired cost of one hash.")
+
+    def handle(self, *args, **options):
+        cores = os.cpu_count() or 1
+        self.stdout.write(f"preferred hasher: {settings.PASSWORD_HASHER}, {cores} core(s)")
+
+        for algorithm in ("pbkdf2_sha256", "scrypt", "argon2"):
+            hasher = get_hasher(algorithm)
+            try:
+                timings = []
+                for _ in range(options["rounds"]):
+                    started = time.perf_counter()
+                    hasher.encode("calibration-password", hasher.salt())
+                    timings.append((time.perf_counter() - started) * 1000)
+            except (ValueError, ImportError) as e:
+                self.stdout.write(f"{algorithm:<14} unavailable ({e})")
+                continue
+
+            ms = statistics.median(timings)
+            self.stdout.write(
+                f"{algorithm:<14} {ms:8.1f} ms/hash  ~{cores * 1000 / ms:,.0f} logins/s ceiling  {self.params(hasher)}"
+            )
+            if algorithm == "pbkdf2_sha256":
+                suggested = int(hasher.iterations * options["target_ms"] / ms) // 10_000 * 10_000
+                self.stdout.write(f"{'':<14} PASSWORD_PBKDF2_ITERATIONS={suggested} for ~{options['target_ms']:.0f} ms")
+
+    def params(self, hasher):
+        names = ("iterations", "work_factor", "block_size", "time_cost", "memory_cost", "parallelism")
+        return ", ".join(f"{name}={getattr(hasher, name)}" for name in names if hasattr(hasher, name))
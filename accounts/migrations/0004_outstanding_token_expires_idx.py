@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    ایندکس expires_at روی جدول توکن‌های simplejwt تا prune_tokens ردیف‌های منقضی را بدون
+    اسکن کامل جدول پیدا کند (مدل متعلق به پکیج است و Meta آن قابل تغییر نیست).
+    """
+
+    dependencies = [
+        ("accounts", "0003_alter_user_role"),
+        ("token_blacklist", "0013_alter_blacklistedtoken_options_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS outstandingtoken_expires_idx "
+            "ON token_blacklist_outstandingtoken (expires_at)",
+            "DROP INDEX IF EXISTS outstandingtoken_expires_idx",
+        ),
+    ]
@@ -0,0 +1,60 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+
+
+class ActiveUserLRU:
+    """
+    LRU کوچک وضعیت فعال بودن کاربران برای مسیر بدون کوئری JWT.
+
+    با ذخیره یا حذف کاربر در همین پروسه فوراً پاک می‌شود؛ پروسه‌های دیگر حداکثر بعد از ttl
+    تغییر را می‌بینند.
+    """
+
+    def __init__(self, maxsize=10_000, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()   # user_id -> (is_active, expires_at)
+        self._lock = threading.Lock()
+
+    def is_active(self, user_id):
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+
+        active = User.objects.filter(pk=user_id, is_active=True).exists()
+        with self._lock:
+            self._entries[user_id] = (active, now + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return active
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+active_users = ActiveUserLRU(
+    maxsize=getattr(settings, "JWT_ACTIVE_USER_CACHE_SIZE", 10_000),
+    ttl=getattr(settings, "JWT_ACTIVE_USER_CACHE_TTL", 60),
+)
+
+
+@receiver([post_save, post_delete], sender=User)
+def _user_changed(sender, instance, **kwargs):
+    active_users.invalidate(instance.pk)
@@ -1,3 +1,268 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .blacklist import BloomFilter, prune_expired_tokens, token_blacklist
+from .models import User
+from .revocation import active_users
+from .tokens import RoleRefreshToken
+
+
+def bearer(token):
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+class LoginTests(TestCase):
+    url = "/api/accounts/login/"
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self, username, password, **extra):
+        return self.client.post(
+            self.url, {"username": username, "password": password}, content_type="application/json", **extra
+        )
+
+    def test_login_embeds_role_claims(self):
+        User.objects.create_user(username="s1", password="secret-pass", role="student", student_id="4001")
+        response = self.client.post(
+            "/api/accounts/login/", {"username": "s1", "password": "secret-pass"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        token = AccessToken(response.data["access"])
+        self.assertEqual((token["role"], token["student_id"]), ("student", "4001"))
+
+    def test_wrong_password_is_bad_request(self):
+        User.objects.create_user(username="s1", password="secret-pass", role="student")
+        self.assertEqual(self.login("s1", "nope").status_code, 400)
+
+    def test_old_hash_is_upgraded_on_login(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            user = User.objects.create(username="s1", role="student", password=make_password("secret-pass"))
+        self.assertIn("$1000$", user.password)
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login("s1", "secret-pass").status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+    @override_settings(PASSWORD_HASHERS=[
+        "accounts.hashers.ScryptPasswordHasher", "accounts.hashers.PBKDF2PasswordHasher",
+    ])
+    def test_switching_hasher_rehashes_on_login(self):
+        with override_settings(PASSWORD_HASHERS=["accounts.hashers.PBKDF2PasswordHasher"]):
+            User.objects.create(username="s1", role="student", password=make_password("secret-pass"))
+        with override_settings(PASSWORD_SCRYPT={"work_factor": 2 ** 10, "block_size": 8, "parallelism": 1}):
+            self.assertEqual(self.login("s1", "secret-pass").status_code, 200)
+        self.assertTrue(User.objects.get(username="s1").password.startswith("scrypt$"))
+
+    def test_username_throttle_rejects_before_hashing(self):
+        User.objects.create_user(username="s1", password="secret-pass", role="student")
+        rates = {"login_ip": None, "login_username": "3/min"}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+            for i in range(3):
+                self.assertEqual(self.login("s1", "nope", REMOTE_ADDR=f"10.0.0.{i}").status_code, 400)
+            with mock.patch("accounts.serializers.authenticate") as authenticate:
+                response = self.login("S1", "secret-pass", REMOTE_ADDR="10.0.0.9")
+            self.assertEqual(response.status_code, 429)
+            self.assertIn("Retry-After", response)
+            authenticate.assert_not_called()
+
+            self.assertEqual(self.login("s2", "nope").status_code, 400)
+
+    def test_ip_throttle(self):
+        rates = {"login_ip": "2/min", "login_username": None}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+            self.login("a", "x")
+            self.login("b", "x")
+            self.assertEqual(self.login("c", "x").status_code, 429)
+            self.assertEqual(self.login("c", "x", REMOTE_ADDR="10.0.0.2").status_code, 400)
+
+    def test_ip_throttle_ignores_spoofed_forwarded_for(self):
+        rates = {"login_ip": "2/min", "login_username": None}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}):
+            for i in range(2):
+                self.login("a", "x", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}")
+            self.assertEqual(self.login("a", "x", HTTP_X_FORWARDED_FOR="203.0.113.9").status_code, 429)
+
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates, "NUM_PROXIES": 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            # پشت یک proxy فقط آخرین آدرس X-Forwarded-For (که proxy اضافه کرده) IP کلاینت است
+            self.assertEqual(self.login("a", "x", HTTP_X_FORWARDED_FOR="1.1.1.1, 198.51.100.7").status_code, 400)
+
+
+@override_settings(JWT_STATELESS_READS=True)
+class StatelessAuthTests(TestCase):
+    def setUp(self):
+        active_users.clear()
+        self.user = User.objects.create_user(username="s1", role="student", student_id="4001", email="s1@example.com")
+        self.access = RoleRefreshToken.for_user(self.user).access_token
+
+    def test_me_skips_user_query(self):
+        self.client.get("/api/accounts/me/", **bearer(self.access))
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/accounts/me/", **bearer(self.access))
+        self.assertEqual(response.data, {
+            "id": self.user.pk, "username": "s1", "email": "s1@example.com",
+            "role": "student", "student_id": "4001", "professor_id": None,
+        })
+
+    def test_me_sparse_fields(self):
+        response = self.client.get("/api/accounts/me/", {"fields": "id,role"}, **bearer(self.access))
+        self.assertEqual(response.data, {"id": self.user.pk, "role": "student"})
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get("/api/accounts/me/", **bearer(self.access))
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/accounts/me/", **bearer(self.access))
+        self.assertEqual(response.status_code, 401)
+
+    async def test_async_me_matches_sync_view(self):
+        client = AsyncClient(AUTHORIZATION=f"Bearer {self.access}")
+        response = await client.get("/api/async/accounts/me/")
+        expected = await sync_to_async(self.client.get)("/api/accounts/me/", **bearer(self.access))
+        self.assertEqual(response.json(), expected.json())
+
+        self.user.is_active = False
+        await self.user.asave()
+        self.assertEqual((await client.get("/api/async/accounts/me/")).status_code, 401)
+
+    def test_role_permission_from_claims(self):
+        admin = User.objects.create_user(username="admin", role="admin")
+        access = RoleRefreshToken.for_user(admin).access_token
+        self.client.get("/api/courses/", **bearer(access))
+        response = self.client.get("/api/courses/", **bearer(self.access))
+        self.assertEqual(response.status_code, 403)
+
+    def test_writes_and_old_tokens_load_the_user(self):
+        # توکن بدون claim نقش
+        with self.assertNumQueries(1):
+            self.client.get("/api/accounts/me/", **bearer(AccessToken.for_user(self.user)))
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                "/api/accounts/logout/", {}, content_type="application/json", **bearer(self.access)
+            )
+        self.assertEqual(response.status_code, 400)
+
+
+class UserExportTests(TestCase):
+    url = "/api/accounts/export/"
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        User.objects.create_user(username="s1", role="student", student_id="401")
+        self.client.defaults.update(bearer(AccessToken.for_user(self.admin)))
+
+    def test_export_filtered_by_role(self):
+        response = self.client.get(self.url, {"role": "student"})
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("s1,", lines[1])
+
+    def test_invalid_role(self):
+        self.assertEqual(self.client.get(self.url, {"role": "nobody"}).status_code, 400)
+
+    def test_requires_admin(self):
+        student = User.objects.get(username="s1")
+        self.client.defaults.update(bearer(AccessToken.for_user(student)))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class RefreshTokenTests(TestCase):
+    url = "/api/accounts/refresh/"
+
+    def setUp(self):
+        cache.clear()
+        token_blacklist.reset()
+        self.user = User.objects.create_user(username="s1", role="student", student_id="4001")
+
+    def refresh(self, token):
+        return self.client.post(self.url, {"refresh": str(token)}, content_type="application/json")
+
+    def check_rotation(self):
+        token = RoleRefreshToken.for_user(self.user)
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(AccessToken(response.data["access"])["role"], "student")
+
+        # توکن قبلی بعد از چرخش blacklist شده است
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(response.data["refresh"]).status_code, 200)
+
+    def test_rotation_blacklists_old_token(self):
+        self.check_rotation()
+
+    @override_settings(JWT_BLACKLIST_BLOOM=True)
+    def test_rotation_with_bloom_blacklist(self):
+        self.check_rotation()
+
+    @override_settings(JWT_BLACKLIST_BLOOM=True, JWT_BLACKLIST_SYNC_SECONDS=60)
+    def test_bloom_skips_blacklist_query(self):
+        token = RoleRefreshToken.for_user(self.user)
+        token_blacklist.sync(force=True)
+        with self.assertNumQueries(0):
+            token.check_blacklist()
+
+        # blacklist شدن در پروسه دیگر (مستقیم در دیتابیس) بعد از sync دیده می‌شود
+        RefreshToken(str(token)).blacklist()
+        token_blacklist.sync(force=True)
+        with self.assertRaises(TokenError):
+            RoleRefreshToken(str(token))
+
+    def test_sync_sees_rows_committed_out_of_pk_order(self):
+        def blacklist(jti, pk):
+            outstanding = OutstandingToken.objects.create(
+                user=self.user, jti=jti, token="x", expires_at=timezone.now() + timedelta(days=1)
+            )
+            BlacklistedToken.objects.create(pk=pk, token=outstanding)
+
+        blacklist("late-0", 100)
+        token_blacklist.sync(force=True)
+        # شناسه کوچک‌تر که بعد از شناسه ۱۰۰ commit شده است
+        blacklist("late-1", 50)
+        token_blacklist.sync(force=True)
+        self.assertIn("late-1", token_blacklist.bloom)
+
+        # بیرون از پنجره overlap فقط ساخت دوباره دوره‌ای آن را می‌بیند
+        blacklist("late-2", 1)
+        with mock.patch.object(token_blacklist, "sync_overlap", 10):
+            token_blacklist.sync(force=True)
+            self.assertNotIn("late-2", token_blacklist.bloom)
+            with mock.patch.object(token_blacklist, "rebuild_seconds", 0):
+                token_blacklist.sync(force=True)
+        self.assertIn("late-2", token_blacklist.bloom)
+        self.assertEqual(token_blacklist.bloom.count, 3)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+        self.assertLess(false_positives, 300)
+
+    def test_prune_removes_only_expired_tokens(self):
+        now = timezone.now()
+        for i in range(5):
+            outstanding = OutstandingToken.objects.create(
+                user=self.user, jti=f"old-{i}", token="x", expires_at=now - timedelta(days=1)
+            )
+            if i % 2:
+                BlacklistedToken.objects.create(token=outstanding)
+        RoleRefreshToken.for_user(self.user)
+
+        self.assertEqual(prune_expired_tokens(batch_size=2), 5)
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertFalse(BlacklistedToken.objects.exists())
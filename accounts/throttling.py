@@ -0,0 +1,38 @@
+import hashlib
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """
+    محدودیت ورود روی کش محلی. throttle ها در initial() و قبل از post اجرا می‌شوند،
+    پس درخواست رد‌شده هیچ hash رمزی انجام نمی‌دهد.
+    """
+
+    def get_rate(self):
+        # نرخ هنگام ساخت throttle خوانده می‌شود تا تغییر تنظیمات (override_settings) اثر کند
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+
+class LoginIPThrottle(LoginRateThrottle):
+    """
+    جلوی burst از یک IP (credential stuffing روی حساب‌های مختلف) را می‌گیرد. IP با NUM_PROXIES
+    خوانده می‌شود، نه از X-Forwarded-For دلخواه کلاینت.
+    """
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginUsernameThrottle(LoginRateThrottle):
+    """جلوی حدس رمز یک حساب از IP های مختلف را می‌گیرد."""
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        ident = hashlib.sha256(username.strip().lower().encode()).hexdigest()[:32]
+        return self.cache_format % {"scope": self.scope, "ident": ident}
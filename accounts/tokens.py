@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .blacklist import token_blacklist
+
+
+# claim هایی که مسیر احراز هویت بدون کوئری (accounts.authentication) از آن‌ها کاربر را می‌سازد
+USER_CLAIMS = ("username", "email", "role", "student_id", "professor_id")
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    RefreshToken همراه با اطلاعات نقش کاربر؛ access token ساخته‌شده از آن هم همین claim ها را دارد.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+    def check_blacklist(self):
+        # با JWT_BLACKLIST_BLOOM بررسی از جلوی Bloom filter می‌گذرد و اغلب بدون کوئری است
+        if not settings.JWT_BLACKLIST_BLOOM:
+            return super().check_blacklist()
+        if token_blacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        if settings.JWT_BLACKLIST_BLOOM:
+            token_blacklist.add(self.payload[api_settings.JTI_CLAIM])
+        return result
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
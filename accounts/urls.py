@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import LoginView, MeView, LogoutView, login_page
+from .views import LoginView, MeView, LogoutView, RefreshView, UserExportView
 
 urlpatterns = [
     path("login/", LoginView.as_view()),
+    path("refresh/", RefreshView.as_view()),
     path("me/", MeView.as_view()),
     path("logout/", LogoutView.as_view()),
+    path("export/", UserExportView.as_view()),
 
 ]
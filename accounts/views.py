@@ -3,13 +3,18 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.tokens import TokenError
+from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
 from django.shortcuts import render
 
 
+from api.export import export_response, requested_format
 from .models import User
+from .permissions import IsAdmin
 from .serializers import LoginSerializer, UserSerializer
+from .throttling import LoginIPThrottle, LoginUsernameThrottle
+from .tokens import RoleRefreshToken, RoleTokenRefreshSerializer
 
 
 def login_page(request):
@@ -29,14 +34,17 @@ def admin_courses(request):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
+
     def post(self, request):
-        try:
-            serializer = LoginSerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
+        serializer = LoginSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
             user = serializer.validated_data["user"]
 
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
 
             return Response({
                 "user": UserSerializer(user).data,
@@ -51,12 +59,17 @@ class LoginView(APIView):
             )
 
 
+class RefreshView(TokenRefreshView):
+    """چرخش refresh token؛ توکن قبلی blacklist می‌شود (ROTATE_REFRESH_TOKENS, BLACKLIST_AFTER_ROTATION)."""
+    serializer_class = RoleTokenRefreshSerializer
+
+
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         try:
-            return Response(UserSerializer(request.user).data, status=status.HTTP_200_OK)
+            return Response(UserSerializer(request.user, context={"request": request}).data, status=status.HTTP_200_OK)
 
         except Exception:
             return Response(
@@ -79,7 +92,7 @@ class LogoutView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            token = RefreshToken(refresh_token)
+            token = RoleRefreshToken(refresh_token)
             token.blacklist()
 
             return Response({"detail": "You have successfully logged out"}, status=status.HTTP_200_OK)
@@ -95,3 +108,25 @@ class LogoutView(APIView):
                 {"detail": "There was a problem processing the logout request"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class UserExportView(APIView):
+    """خروجی جریانی کاربران (اختیاری بر اساس نقش) با حافظه ثابت."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    fields = ["id", "username", "email", "role", "student_id", "professor_id", "first_name", "last_name"]
+
+    def get(self, request):
+        fmt = requested_format(request)
+        if fmt is None:
+            return Response({"detail": "Unsupported file_format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        users = User.objects.order_by("id")
+        role = request.query_params.get("role")
+        if role:
+            if role not in dict(User.ROLE_CHOICES):
+                return Response({"detail": "Invalid role"}, status=status.HTTP_400_BAD_REQUEST)
+            users = users.filter(role=role)
+
+        rows = users.values_list(*self.fields).iterator(chunk_size=2000)
+        return export_response(f"users-{role or 'all'}", self.fields, rows, fmt)
@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import IdempotencyKey
 
-# Register your models here.
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("user", "key", "status_code", "created_at", "expires_at")
+    raw_id_fields = ("user",)
+    exclude = ("body",)
@@ -0,0 +1,16 @@
+"""
+نسخه async endpoint های خواندنی پرترافیک؛ زیر ASGI (مثلا uvicorn config.asgi:application) بدون
+یک thread به ازای هر درخواست اجرا می‌شوند. نوشتن‌ها همان endpoint های DRF باقی می‌مانند.
+"""
+from django.urls import path
+
+from accounts.async_views import me
+from courses.async_views import course_detail, course_list
+from departments.async_views import department_list
+
+urlpatterns = [
+    path("courses/", course_list),
+    path("courses/<int:pk>/", course_detail),
+    path("departments/", department_list),
+    path("accounts/me/", me),
+]
@@ -0,0 +1,45 @@
+from functools import wraps
+
+from django.http import JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import RoleJWTAuthentication
+
+
+def error_response(detail, status):
+    return JsonResponse(detail if isinstance(detail, dict) else {"detail": detail}, status=status)
+
+
+def async_api_view(*roles, allow_anonymous=False):
+    """
+    view خواندنی async (برای اجرا زیر ASGI) با همان احراز هویت JWT و پاسخ‌های خطای DRF.
+
+    DRF از view های async پشتیبانی نمی‌کند، پس این view ها Django خالص هستند و فقط GET می‌پذیرند.
+    roles: نقش‌های مجاز؛ خالی یعنی هر کاربر وارد شده.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return error_response(f'Method "{request.method}" not allowed.', 405)
+
+            try:
+                result = await RoleJWTAuthentication().aauthenticate(request)
+            except AuthenticationFailed as e:
+                response = error_response(e.detail, 401)
+                response["WWW-Authenticate"] = 'Bearer realm="api"'
+                return response
+
+            if result is None:
+                if not allow_anonymous:
+                    response = error_response("Authentication credentials were not provided.", 401)
+                    response["WWW-Authenticate"] = 'Bearer realm="api"'
+                    return response
+            else:
+                request.user = result[0]
+                if roles and request.user.role not in roles:
+                    return error_response("You do not have permission to perform this action.", 403)
+
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
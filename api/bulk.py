@@ -0,0 +1,194 @@
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils.module_loading import import_string
+
+from . import cache
+
+
+IMPORTERS = {
+    "departments": "departments.importers.DepartmentImporter",
+    "courses": "courses.importers.CourseImporter",
+    "users": "accounts.importers.UserImporter",
+}
+
+FORMATS = ("csv", "json", "jsonl")
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def get_importer(kind):
+    try:
+        return import_string(IMPORTERS[kind])()
+    except KeyError:
+        raise ValueError(f"Unknown import kind '{kind}'. Choices: {', '.join(IMPORTERS)}")
+
+
+def guess_format(filename):
+    ext = filename.rsplit(".", 1)[-1].lower()
+    if ext == "ndjson":
+        return "jsonl"
+    return ext if ext in FORMATS else "csv"
+
+
+def read_rows(lines, fmt):
+    """
+    ردیف‌ها را به صورت جریانی از یک فایل باینری (یا هر iterable از خطوط bytes) می‌خواند.
+    خروجی: (شماره ردیف، dict) — ردیف خراب به شکل ValidationError برگردانده می‌شود تا کل فایل متوقف نشود.
+    """
+    text = codecs.iterdecode(lines, "utf-8-sig")
+
+    if fmt == "csv":
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+
+    elif fmt == "jsonl":
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, ValidationError(f"Invalid JSON: {e}")
+
+    elif fmt == "json":
+        # JSON آرایه‌ای را نمی‌توان جریانی خواند؛ برای فایل‌های بزرگ jsonl پیشنهاد می‌شود
+        for number, row in enumerate(json.loads("".join(text)), start=1):
+            yield number, row
+
+    else:
+        raise ValueError(f"Unsupported format '{fmt}'. Choices: {', '.join(FORMATS)}")
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def error_messages(error):
+    if hasattr(error, "error_dict"):
+        return {field: [str(m) for m in messages] for field, messages in error.message_dict.items()}
+    return {"non_field_errors": error.messages}
+
+
+class ImportReport:
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, number, messages):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": number, "errors": messages})
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+class BulkImporter:
+    """
+    پایه واردکننده‌های گروهی.
+
+    هر chunk جداگانه اعتبارسنجی می‌شود (یک کوئری برای کلیدهای موجود و یک کوئری برای هر قید یکتایی)
+    و با bulk_create/bulk_update در یک تراکنش نوشته می‌شود. خطای هر ردیف فقط همان ردیف را رد می‌کند.
+    """
+    model = None
+    key_field = None
+    update_fields = []
+    clean_exclude = []
+    # bulk_create سیگنال post_save نمی‌فرستد؛ کش داده مرجع بعد از ورود دستی بی‌اعتبار می‌شود
+    cache_namespaces = ()
+
+    def build(self, row):
+        """یک نمونه ذخیره‌نشده از ردیف ورودی می‌سازد؛ در صورت خطا ValidationError."""
+        raise NotImplementedError
+
+    def check_chunk(self, items, report):
+        """بررسی‌های گروهی (یکتایی و ...) روی ردیف‌های معتبر؛ ردیف‌های قابل‌نوشتن را برمی‌گرداند."""
+        return items
+
+    def after_write(self, items):
+        """نوشتن روابط وابسته (مثلا M2M) پس از مشخص شدن pk ها."""
+
+    def run(self, rows, chunk_size=1000):
+        report = ImportReport()
+        try:
+            for chunk in chunked(rows, chunk_size):
+                self.import_chunk(chunk, report)
+        finally:
+            if self.cache_namespaces and (report.created or report.updated):
+                cache.bump(*self.cache_namespaces)
+        return report
+
+    def import_chunk(self, chunk, report):
+        report.processed += len(chunk)
+        items = []
+        seen = set()
+        for number, row in chunk:
+            try:
+                if isinstance(row, ValidationError):
+                    raise row
+                if not isinstance(row, dict):
+                    raise ValidationError("Each row must be an object.")
+                instance = self.build(row)
+                instance.full_clean(
+                    exclude=self.clean_exclude, validate_unique=False, validate_constraints=False
+                )
+            except ValidationError as e:
+                report.add_error(number, error_messages(e))
+                continue
+
+            key = getattr(instance, self.key_field)
+            if key in seen:
+                report.add_error(number, {self.key_field: ["Duplicate value in this file."]})
+                continue
+            seen.add(key)
+            items.append((number, instance))
+
+        items = self.check_chunk(items, report)
+        if not items:
+            return
+
+        existing = dict(
+            self.model._default_manager.filter(
+                **{f"{self.key_field}__in": [getattr(i, self.key_field) for _, i in items]}
+            ).values_list(self.key_field, "pk")
+        )
+        to_create, to_update = [], []
+        for _, instance in items:
+            pk = existing.get(getattr(instance, self.key_field))
+            if pk is None:
+                to_create.append(instance)
+            else:
+                instance.pk = pk
+                instance._state.adding = False
+                to_update.append(instance)
+
+        try:
+            with transaction.atomic():
+                self.model._default_manager.bulk_create(to_create)
+                if to_update:
+                    self.model._default_manager.bulk_update(to_update, self.update_fields)
+                self.after_write(items)
+        except DatabaseError as e:
+            for number, _ in items:
+                report.add_error(number, {"non_field_errors": [f"Chunk write failed: {e}"]})
+            return
+
+        report.created += len(to_create)
+        report.updated += len(to_update)
@@ -0,0 +1,130 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+CACHE_ALIAS = "reference"
+
+# فضای نام هر دسته از داده‌های مرجع؛ با هر تغییر نسخه فضای نام عوض می‌شود
+DEPARTMENTS = "departments"
+COURSES = "courses"
+TERMS = "terms"
+
+
+def reference_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_version(namespace):
+    """(نسخه، زمان آخرین تغییر) فضای نام؛ اگر در کش نباشد مقدار تازه ساخته می‌شود."""
+    return reference_cache().get_or_set(f"refcache:{namespace}:version", _new_version, None)
+
+
+def _new_version():
+    now = time.time_ns()
+    return (now, now // 1_000_000_000)
+
+
+def bump(*namespaces):
+    """کلیدهای قبلی را بی‌اعتبار می‌کند؛ ورودی‌های قدیمی با TTL از کش خارج می‌شوند."""
+    cache = reference_cache()
+    for namespace in namespaces:
+        cache.set(f"refcache:{namespace}:version", _new_version(), None)
+
+
+def bump_on_commit(*namespaces):
+    """
+    bump بعد از commit تراکنش جاری (بیرون از تراکنش فورا). اگر نسخه قبل از commit عوض شود، خواننده
+    هم‌زمان ردیف‌های قدیمی را زیر نسخه جدید ذخیره می‌کند و کش تا تغییر بعدی کهنه می‌ماند.
+    """
+    transaction.on_commit(lambda: bump(*namespaces))
+
+
+def cached_reference(namespace, key, builder, timeout=DEFAULT_TIMEOUT):
+    """read-through: نتیجه builder با کلید نسخه‌دار فضای نام ذخیره می‌شود."""
+    version, _ = get_version(namespace)
+    cache_key = f"refcache:{namespace}:{version}:{key}"
+    value = reference_cache().get(cache_key)
+    if value is None:
+        value = builder()
+        reference_cache().set(cache_key, value, timeout)
+    return value
+
+
+def _validators(request, namespace, version, last_modified):
+    """
+    هدرهای ETag/Last-Modified و اینکه نسخه مرورگر هنوز معتبر است یا نه. کلید از آدرس کامل (scheme و
+    host هم) ساخته می‌شود، چون لینک next صفحه‌بندی با build_absolute_uri درخواست اول ساخته و کش می‌شود.
+    """
+    path_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    etag = quote_etag(f"{namespace}-{version}-{path_hash[:12]}")
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("If-None-Match")
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    not_modified = bool(
+        (if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]) or (
+            not if_none_match and if_modified_since and if_modified_since >= last_modified
+        )
+    )
+    return path_hash, headers, not_modified
+
+
+def cached_response(request, namespace, builder):
+    """
+    پاسخ GET کش‌شده با ETag و Last-Modified؛ اگر نسخه مرورگر هنوز معتبر باشد 304 برمی‌گرداند.
+    builder باید داده قابل سریال‌سازی (response.data) را برگرداند.
+    """
+    version, last_modified = get_version(namespace)
+    path_hash, headers, not_modified = _validators(request, namespace, version, last_modified)
+    if not_modified:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    data = cached_reference(namespace, path_hash, builder)
+    return Response(data, headers=headers)
+
+
+async def acached_response(request, namespace, builder):
+    """
+    نسخه async برای view های ASGI؛ builder یک coroutine function است و پاسخ JsonResponse است.
+    نسخه فضای نام با cached_response مشترک است، پس bump هر دو مسیر را بی‌اعتبار می‌کند.
+    """
+    cache = reference_cache()
+    version, last_modified = await cache.aget_or_set(f"refcache:{namespace}:version", _new_version, None)
+    path_hash, headers, not_modified = _validators(request, namespace, version, last_modified)
+    if not_modified:
+        response = HttpResponseNotModified()
+    else:
+        cache_key = f"refcache:{namespace}:{version}:{path_hash}"
+        data = await cache.aget(cache_key)
+        if data is None:
+            data = await builder()
+            await cache.aset(cache_key, data)
+        response = JsonResponse(data, safe=False)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+class ReferenceCacheMixin:
+    """
+    برای ViewSet هایی که لیست داده مرجع برمی‌گردانند: list از کش خوانده می‌شود.
+    """
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request, self.cache_namespace, lambda: super(ReferenceCacheMixin, self).list(request, *args, **kwargs).data
+        )
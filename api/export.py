@@ -0,0 +1,84 @@
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+# هر تکه پاسخ چند صد ردیف است تا سربار yield برای هر ردیف جداگانه نباشد
+ROWS_PER_CHUNK = 500
+
+
+class Echo:
+    """بافر ساختگی برای csv.writer؛ به‌جای نگه‌داشتن متن، همان را برمی‌گرداند."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(header, rows):
+    writer = csv.writer(Echo())
+    yield "\ufeff" + writer.writerow(header)    # BOM تا Excel متن فارسی را درست باز کند
+    buffer = []
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def export_response(filename, header, rows, fmt="csv"):
+    """
+    پاسخ خروجی با حافظه ثابت؛ rows باید یک iterator (مثلا values_list(...).iterator()) باشد.
+
+    CSV مستقیم جریان داده می‌شود. XLSX (نیازمند openpyxl) در حالت write_only روی یک فایل موقت
+    نوشته و سپس ارسال می‌شود.
+    """
+    if fmt == "xlsx":
+        return _xlsx_response(filename, header, rows)
+
+    response = StreamingHttpResponse(csv_chunks(header, rows), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def _xlsx_response(filename, header, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+
+
+def xlsx_available():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def requested_format(request):
+    """
+    فرمت از ?file_format= (پارامتر format را DRF برای انتخاب renderer استفاده می‌کند)؛
+    اگر نامعتبر یا در دسترس نباشد None.
+    """
+    fmt = request.query_params.get("file_format", "csv")
+    if fmt not in EXPORT_FORMATS or (fmt == "xlsx" and not xlsx_available()):
+        return None
+    return fmt
@@ -0,0 +1,183 @@
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import Throttled, ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+
+
+def key_ttl():
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+
+def lock_timeout():
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_LOCK_TIMEOUT", 60))
+
+
+def fingerprint(request):
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.get_full_path().encode(), request.body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def claim(user, key, request_fingerprint):
+    """
+    رزرو کلید برای این درخواست: (ردیف رزروشده، None) یعنی منطق اجرا شود؛ (None, پاسخ) یعنی نه.
+
+    رزرو یک INSERT با autocommit روی قید یکتای (user, key) است، پس از بین تکرارهای هم‌زمان دقیقا
+    یکی اجرا می‌شود؛ بقیه پاسخ ذخیره‌شده، یا تا پایان درخواست اول ۴۰۹ با Retry-After می‌گیرند.
+    رزروی که بیش از IDEMPOTENCY_LOCK_TIMEOUT بدون پاسخ مانده (پروسه وسط کار از بین رفته) آزاد حساب می‌شود.
+    """
+    for _ in range(3):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user, key=key, fingerprint=request_fingerprint, expires_at=now + key_ttl()
+                )
+            return record, None
+        except IntegrityError:
+            pass
+
+        existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if existing is None:
+            # درخواست اول با خطای سرور تمام شد و کلید را آزاد کرد
+            continue
+        abandoned_before = now - lock_timeout()
+        if existing.expires_at <= now or (existing.status_code is None and existing.created_at <= abandoned_before):
+            # کلید منقضی یا رهاشده با UPDATE شرطی دوباره رزرو می‌شود؛ از تکرارهای هم‌زمان فقط یکی موفق است
+            fields = {
+                "fingerprint": request_fingerprint, "status_code": None, "content_type": "", "body": b"",
+                "created_at": now, "expires_at": now + key_ttl(),
+            }
+            stale = Q(expires_at__lte=now) | Q(status_code__isnull=True, created_at__lte=abandoned_before)
+            if IdempotencyKey.objects.filter(stale, pk=existing.pk).update(**fields):
+                for name, value in fields.items():
+                    setattr(existing, name, value)
+                return existing, None
+            continue
+        if existing.fingerprint != request_fingerprint:
+            return None, Response(
+                {"detail": "This Idempotency-Key was used with a different request.", "code": "key_reused"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if existing.status_code is None:
+            break
+        return None, replay(existing)
+
+    return None, Response(
+        {"detail": "A request with this Idempotency-Key is still in progress.", "code": "in_progress"},
+        status=status.HTTP_409_CONFLICT, headers={"Retry-After": "1"},
+    )
+
+
+def replay(record):
+    response = HttpResponse(bytes(record.body), status=record.status_code, content_type=record.content_type or None)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def complete(record, response):
+    """ذخیره پاسخ نهایی؛ خطای سرور و پاسخ جریانی ذخیره نمی‌شوند و کلید برای تلاش دوباره آزاد می‌شود."""
+    if response.status_code >= 500 or response.streaming:
+        release(record)
+        return
+    if hasattr(response, "render"):
+        response.render()
+    record.status_code = response.status_code
+    record.content_type = response.get("Content-Type", "")
+    record.body = response.content
+    record.save(update_fields=["status_code", "content_type", "body"])
+
+
+def release(record):
+    IdempotencyKey.objects.filter(pk=record.pk).delete()
+
+
+class _Replay(Exception):
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class IdempotentMixin:
+    """
+    سرآیند Idempotency-Key برای متدهای تغییردهنده یک APIView/ViewSet.
+
+    کلید بعد از احراز هویت و بررسی دسترسی رزرو می‌شود؛ تکرار همان درخواست (همان کاربر، کلید، متد،
+    مسیر و بدنه) تا IDEMPOTENCY_KEY_TTL پاسخ ذخیره‌شده را بدون اجرای دوباره منطق برمی‌گرداند.
+    درخواست بدون سرآیند مثل قبل اجرا می‌شود.
+    """
+    idempotency_record = None
+    idempotency_fingerprint = None
+
+    def initial(self, request, *args, **kwargs):
+        key = request.META.get(HEADER)
+        if key is not None and request.method in MUTATING_METHODS:
+            # بدنه پیش از آن خوانده می‌شود که parser (مثلا در بررسی دسترسی) جریان درخواست را مصرف کند
+            self.idempotency_fingerprint = fingerprint(request)
+        super().initial(request, *args, **kwargs)
+
+    def check_throttles(self, request):
+        # کلید بعد از بررسی دسترسی و پیش از throttle ها رزرو می‌شود: تکرار درخواستی که انجام شده پاسخ
+        # ذخیره‌شده را می‌گیرد و سهمی از محدودیت نرخ مصرف نمی‌کند
+        if self.idempotency_fingerprint is not None and request.user.is_authenticated:
+            key = request.META[HEADER]
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise ValidationError({"Idempotency-Key": f"Must be 1 to {MAX_KEY_LENGTH} characters."})
+            self.idempotency_record, response = claim(request.user, key, self.idempotency_fingerprint)
+            if response is not None:
+                raise _Replay(response)
+        try:
+            super().check_throttles(request)
+        except Throttled:
+            # پاسخ ۴۲۹ ذخیره نمی‌شود تا تلاش دوباره با همان کلید واقعا اجرا شود
+            if self.idempotency_record is not None:
+                release(self.idempotency_record)
+                self.idempotency_record = None
+            raise
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def dispatch(self, request, *args, **kwargs):
+        self.idempotency_record = self.idempotency_fingerprint = None
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        except BaseException:
+            if self.idempotency_record is not None:
+                release(self.idempotency_record)
+            raise
+        if self.idempotency_record is not None:
+            complete(self.idempotency_record, response)
+        return response
+
+
+def prune_expired_keys(batch_size=5000, pause=0.0):
+    """کلیدهای منقضی را در دسته‌های محدود حذف می‌کند؛ خروجی تعداد ردیف‌های حذف‌شده."""
+    expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).order_by()
+    deleted = 0
+    while True:
+        ids = list(expired.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,183 @@
+import json
+import platform
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from api import cache
+from courses.models import Course
+from departments.models import Department
+from terms.models import Term
+
+
+# (نام، متد، مسیر، نقش توکن، فضای نام کشی که قبل از هر درخواست بی‌اعتبار می‌شود)
+SCENARIOS = [
+    ("login", "post", "/api/accounts/login/", None, None),
+    ("me", "get", "/api/accounts/me/", "student", None),
+    ("courses", "get", "/api/courses/", "admin", None),
+    ("courses_uncached", "get", "/api/courses/", "admin", cache.COURSES),
+    ("departments", "get", "/api/departments/departments/", "admin", None),
+    ("departments_uncached", "get", "/api/departments/departments/", "admin", cache.DEPARTMENTS),
+]
+PERCENTILES = (50, 90, 95, 99)
+
+
+def summarize(latencies, queries, errors):
+    """خلاصه یک سناریو؛ درصدک‌ها به روش inclusive (برای نمونه کوچک هم تعریف‌شده)."""
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    result = {"requests": len(latencies), "errors": errors}
+    result.update({f"p{p}_ms": round(cuts[p - 1], 3) for p in PERCENTILES})
+    result.update({
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+        "queries": max(queries),
+        "queries_min": min(queries),
+    })
+    return result
+
+
+def compare(baseline, current, tolerance, slack_ms=0):
+    """
+    مقایسه با baseline: [(سناریو، معیار، قبلی، فعلی، پسرفت؟)].
+    تعداد کوئری قطعی است و هر افزایشی پسرفت است؛ تاخیر p50/p95 وقتی پسرفت است که هم نسبی بیش از
+    tolerance و هم مطلق بیش از slack_ms کندتر شده باشد (نوسان چند میلی‌ثانیه‌ای endpointهای سریع).
+    """
+    rows = []
+    for name, new in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        rows.append((name, "queries", old["queries"], new["queries"], new["queries"] > old["queries"]))
+        rows.append((name, "errors", old["errors"], new["errors"], new["errors"] > old["errors"]))
+        for metric in ("p50_ms", "p95_ms"):
+            failed = regressed(old[metric], new[metric], tolerance, slack_ms)
+            rows.append((name, metric, old[metric], new[metric], failed))
+    return rows
+
+
+def regressed(old, new, tolerance, slack_ms):
+    return new > old * (1 + tolerance) and new - old > slack_ms
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the API benchmark suite in-process against the current database (seed it with seed_data first) "
+        "and report latency percentiles and query counts. --output writes a JSON baseline; --compare diffs "
+        "against one and exits non-zero on a regression."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--login-iterations", type=int, default=20, help="Login is dominated by hashing.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--password", default="seed-password", help="Password of the seeded students.")
+        parser.add_argument("--scenario", action="append", help="Run only these scenarios.")
+        parser.add_argument("--output", help="Write the results as a JSON baseline to this path.")
+        parser.add_argument("--compare", help="Baseline JSON to compare against.")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p50/p95 slowdown.")
+        parser.add_argument("--slack-ms", type=float, default=2.0, help="Allowed absolute p50/p95 slowdown.")
+
+    def handle(self, *args, **options):
+        admin = User.objects.filter(role="admin").order_by("pk").first()
+        students = list(User.objects.filter(role="student").order_by("pk").values_list("username", flat=True)[:1000])
+        if admin is None or not students:
+            raise CommandError("No admin or student users; run seed_data first.")
+        student = User.objects.get(username=students[0])
+        tokens = {"admin": str(AccessToken.for_user(admin)), "student": str(AccessToken.for_user(student))}
+
+        selected = options["scenario"] or [name for name, *_ in SCENARIOS]
+        unknown = set(selected) - {name for name, *_ in SCENARIOS}
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        # localhost در حالت DEBUG بدون تغییر ALLOWED_HOSTS مجاز است؛ test runner خودش testserver را اضافه می‌کند
+        host = "testserver" if "testserver" in settings.ALLOWED_HOSTS else "localhost"
+        results = {}
+        for name, method, path, role, namespace in SCENARIOS:
+            if name not in selected:
+                continue
+            iterations = options["login_iterations"] if name == "login" else options["iterations"]
+            headers = {"HTTP_HOST": host}
+            if role:
+                headers["HTTP_AUTHORIZATION"] = f"Bearer {tokens[role]}"
+            client = Client(**headers)
+            results[name] = self.run(
+                client, method, path, iterations, options["warmup"], namespace,
+                body=(lambda i: {"username": students[i % len(students)], "password": options["password"]})
+                if name == "login" else None,
+            )
+            self.report(name, results[name])
+
+        current = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "rows": {
+                    "users": User.objects.count(), "courses": Course.objects.count(),
+                    "departments": Department.objects.count(), "terms": Term.objects.count(),
+                },
+            },
+            "scenarios": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(current, f, indent=2, sort_keys=True)
+            self.stdout.write(f"baseline written to {options['output']}")
+        if options["compare"]:
+            self.compare(options["compare"], current, options["tolerance"], options["slack_ms"])
+
+    def run(self, client, method, path, iterations, warmup, namespace, body=None):
+        latencies, queries, errors = [], [], 0
+        for i in range(-warmup, iterations):
+            if namespace:
+                cache.bump(namespace)
+            kwargs = {}
+            if body is not None:
+                # IP جدا برای هر درخواست تا throttle ورود (به ازای IP) اندازه‌گیری را خراب نکند
+                kwargs = {"data": body(i), "content_type": "application/json", "REMOTE_ADDR": f"10.{i % 256}.0.1"}
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, **kwargs)
+                elapsed = (time.perf_counter() - started) * 1000
+            if i < 0:
+                continue
+            latencies.append(elapsed)
+            queries.append(len(captured))
+            errors += response.status_code >= 400
+        return summarize(latencies, queries, errors)
+
+    def report(self, name, result):
+        percentiles = " ".join(f"p{p}={result[f'p{p}_ms']:.2f}" for p in PERCENTILES)
+        self.stdout.write(
+            f"{name:<22} n={result['requests']:<4} {percentiles} ms  queries={result['queries']} "
+            f"errors={result['errors']}"
+        )
+
+    def compare(self, path, current, tolerance, slack_ms):
+        with open(path) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("rows") != current["meta"]["rows"]:
+            self.stdout.write(self.style.WARNING("Row counts differ from the baseline; latencies may not be comparable."))
+
+        regressions = 0
+        for name, metric, old, new, failed in compare(baseline, current, tolerance, slack_ms):
+            line = f"{name:<22} {metric:<8} {old:>10} -> {new:<10}"
+            if failed:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(f"{line} REGRESSION"))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"{regressions} regression(s) against {path}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {path}"))
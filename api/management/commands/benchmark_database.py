@@ -0,0 +1,118 @@
+import logging
+import statistics
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from courses.models import Course
+from offerings.models import Offering
+from registration.models import Enrollment, StudentTermLoad
+from terms.models import Term
+
+
+class Command(BaseCommand):
+    help = (
+        "Concurrent mixed load (enroll + offering list + my enrollments) through the API against the "
+        "configured database profile. Run once per profile, e.g. DB_SQLITE_TUNED=0, DB_SQLITE_TUNED=1, "
+        "DB_ENGINE=postgres, DB_ENGINE=postgres DB_POOL=1, and compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=400)
+        parser.add_argument("--sections", type=int, default=10)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--reads-per-write", type=int, default=3)
+
+    def handle(self, *args, **options):
+        settings_dict = connection.settings_dict
+        self.stdout.write(
+            f"profile: {connection.vendor} CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']} "
+            f"OPTIONS={ {k: v for k, v in settings_dict['OPTIONS'].items() if k != 'init_command'} }"
+        )
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                self.stdout.write(f"journal_mode={cursor.fetchone()[0]}")
+
+        tag = uuid.uuid4().hex[:8]
+        term = Term.objects.create(
+            name=f"bench-{tag}", start_date=date(2000, 1, 1), end_date=date(2000, 6, 1), status=Term.ADD_DROP
+        )
+        offerings = []
+        for i in range(options["sections"]):
+            course = Course.objects.create(code=f"B{tag}{i}", title=f"Bench {tag} {i}", units=1)
+            offerings.append(Offering.objects.create(course=course, term=term, capacity=options["students"]))
+        User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}", role="student", student_id=f"{tag}{i}", password="!")
+            for i in range(options["students"])
+        )
+        students = list(User.objects.filter(username__startswith=f"bench-{tag}-"))
+
+        jobs = iter([(s, o) for s in students for o in offerings])
+        lock = threading.Lock()
+        latencies = {"write": [], "read": []}
+        errors = {"write": 0, "read": 0}
+        tokens = {s.pk: str(RoleRefreshToken.for_user(s).access_token) for s in students}
+
+        def request(kind, call):
+            started = time.perf_counter()
+            response = call()
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                latencies[kind].append(elapsed)
+                if response.status_code >= 500:
+                    errors[kind] += 1
+
+        def worker():
+            client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+            try:
+                while True:
+                    with lock:
+                        job = next(jobs, None)
+                    if job is None:
+                        return
+                    student, offering = job
+                    auth = {"HTTP_AUTHORIZATION": f"Bearer {tokens[student.pk]}"}
+                    request("write", lambda: client.post(
+                        "/api/registration/enrollments/", {"offering": offering.pk},
+                        content_type="application/json", **auth,
+                    ))
+                    for i in range(options["reads_per_write"]):
+                        url = "/api/registration/enrollments/" if i % 2 else f"/api/offerings/?term={term.pk}"
+                        request("read", lambda: client.get(url, **auth))
+            finally:
+                connection.close()
+
+        # خطاهای قفل به صورت 500 شمرده می‌شوند؛ traceback هر کدام چاپ نشود
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            total = sum(len(v) for v in latencies.values())
+            self.stdout.write(f"{total} requests in {elapsed:.2f}s with {options['threads']} threads ({total / elapsed:.0f} req/s)")
+            for kind, values in latencies.items():
+                values.sort()
+                self.stdout.write(
+                    f"  {kind:<5} n={len(values)} p50={statistics.median(values):.1f} ms "
+                    f"p95={values[int(len(values) * 0.95) - 1]:.1f} ms errors={errors[kind]}"
+                )
+        finally:
+            Enrollment.objects.filter(offering__term=term).delete()
+            StudentTermLoad.objects.filter(term=term).delete()
+            Offering.objects.filter(term=term).delete()
+            Course.objects.filter(code__startswith=f"B{tag}").delete()
+            term.delete()
+            User.objects.filter(username__startswith=f"bench-{tag}-").delete()
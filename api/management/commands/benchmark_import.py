@@ -0,0 +1,58 @@
+import csv
+import os
+import tempfile
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from api.bulk import get_importer, read_rows
+from courses.models import Course
+from departments.models import Department
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic course CSV (default 100k rows) and time the bulk import pipeline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--departments", type=int, default=20)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--keep", action="store_true", help="Keep the imported rows.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:6].upper()
+        departments = [f"{tag}{i}" for i in range(options["departments"])]
+        rows = options["rows"]
+
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+                dept_writer = csv.writer(f)
+                dept_writer.writerow(["code", "name"])
+                dept_writer.writerows([code, f"Bench department {code}"] for code in departments)
+
+            with open(path, "rb") as f:
+                get_importer("departments").run(read_rows(f, "csv"))
+
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["code", "title", "units", "departments"])
+                for i in range(rows):
+                    linked = "|".join({departments[i % len(departments)], departments[(i * 7) % len(departments)]})
+                    writer.writerow([f"{tag}{i:07d}", f"Bench course {tag} {i}", i % 4 + 1, linked])
+
+            started = time.perf_counter()
+            with open(path, "rb") as f:
+                report = get_importer("courses").run(read_rows(f, "csv"), options["chunk_size"])
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"Imported {report.created} course rows (+{report.updated} updated, {report.failed} failed) "
+                f"in {elapsed:.2f}s — {rows / elapsed:.0f} rows/s, chunk size {options['chunk_size']}"
+            )
+        finally:
+            os.remove(path)
+            if not options["keep"]:
+                Course.objects.filter(code__startswith=tag).delete()
+                Department.objects.filter(code__startswith=tag).delete()
@@ -0,0 +1,74 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from api import cache
+from courses.models import Course
+from departments.models import Department
+
+
+class Command(BaseCommand):
+    help = "Compare cold, warm and 304-revalidated latency of the cached reference-data list endpoints."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=5000, help="Synthetic courses to add before measuring.")
+        parser.add_argument("--rounds", type=int, default=30)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:6].upper()
+        admin = User.objects.create_user(username=f"bench-{tag}", role="admin")
+        departments = Department.objects.bulk_create(
+            Department(code=f"{tag}{i}", name=f"Bench {tag} {i}") for i in range(10)
+        )
+        courses = Course.objects.bulk_create(
+            Course(code=f"{tag}{i:06d}", title=f"Bench {tag} {i}", units=i % 4 + 1)
+            for i in range(options["courses"])
+        )
+        through = Course.departments.through
+        through.objects.bulk_create(
+            through(course_id=c.pk, department_id=departments[i % len(departments)].pk)
+            for i, c in enumerate(courses)
+        )
+        cache.bump(cache.COURSES, cache.DEPARTMENTS)
+
+        client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}")
+        try:
+            for namespace, url in [
+                (cache.COURSES, "/api/courses/?page_size=200"),
+                (cache.DEPARTMENTS, "/api/departments/departments/"),
+                (cache.COURSES, "/api/courses/units_choices/"),
+            ]:
+                cold, warm, revalidated = [], [], []
+                for _ in range(options["rounds"]):
+                    cache.bump(namespace)
+                    cold.append(self.timed(client, url))
+                    warm.append(self.timed(client, url))
+                    etag = client.get(url)["ETag"]
+                    revalidated.append(self.timed(client, url, HTTP_IF_NONE_MATCH=etag))
+
+                self.stdout.write(
+                    f"{url}\n  cold {self.summary(cold)}\n  warm {self.summary(warm)}\n  304  {self.summary(revalidated)}"
+                )
+        finally:
+            Course.objects.filter(code__startswith=tag).delete()
+            Department.objects.filter(code__startswith=tag).delete()
+            admin.delete()
+
+    @staticmethod
+    def timed(client, url, **extra):
+        started = time.perf_counter()
+        response = client.get(url, **extra)
+        elapsed = (time.perf_counter() - started) * 1000
+        assert response.status_code in (200, 304), response.status_code
+        return elapsed
+
+    @staticmethod
+    def summary(samples):
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return f"median {statistics.median(samples):.2f} ms, p95 {p95:.2f} ms"
@@ -0,0 +1,70 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+
+from api.serializers import values_columns, values_data
+from courses.models import Course
+from courses.serializers import CourseSerializer
+from departments.models import Department
+
+
+class Command(BaseCommand):
+    help = (
+        "Serialize the same courses with CourseSerializer(many=True) over prefetched instances and "
+        "with the values_data fast path, with and without ?expand=departments."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=10_000)
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:6].upper()
+        departments = Department.objects.bulk_create(
+            Department(code=f"{tag}{i}", name=f"Bench {tag} {i}") for i in range(10)
+        )
+        courses = Course.objects.bulk_create(
+            Course(code=f"{tag}{i:06d}", title=f"Bench {tag} {i}", units=i % 4 + 1)
+            for i in range(options["courses"])
+        )
+        through = Course.departments.through
+        through.objects.bulk_create(
+            through(course_id=c.pk, department_id=departments[j].pk)
+            for i, c in enumerate(courses) for j in {i % 10, (i * 7) % 10}
+        )
+
+        queryset = Course.objects.filter(code__startswith=tag).order_by("code")
+        try:
+            for params in ({}, {"expand": "departments"}, {"fields": "id,code,title"}):
+                context = {"request": Request(RequestFactory().get("/api/courses/", params))}
+
+                def model_serializer():
+                    return CourseSerializer(queryset.prefetch_related("departments"), many=True, context=context).data
+
+                def fast_path():
+                    serializer = CourseSerializer(context=context)
+                    return values_data(serializer, list(queryset.values(*values_columns(serializer))))
+
+                assert model_serializer() == fast_path()
+                label = "&".join(f"{k}={v}" for k, v in params.items()) or "default"
+                self.stdout.write(f"{options['courses']} courses, {label}:")
+                self.measure("ModelSerializer", model_serializer, options["rounds"])
+                self.measure("values_data", fast_path, options["rounds"])
+        finally:
+            queryset.delete()
+            Department.objects.filter(code__startswith=tag).delete()
+
+    def measure(self, label, build, rounds):
+        timings = []
+        for _ in range(rounds):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                build()
+                timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(f"  {label:<16} median={statistics.median(timings):.0f} ms queries={len(queries)}")
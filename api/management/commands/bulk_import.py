@@ -0,0 +1,27 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.bulk import FORMATS, IMPORTERS, get_importer, guess_format, read_rows
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV/JSON file of departments, courses or users into the database in batched transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or guess_format(options["path"])
+        try:
+            with open(options["path"], "rb") as f:
+                report = get_importer(options["kind"]).run(read_rows(f, fmt), options["chunk_size"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(json.dumps(report.as_dict(), indent=2, ensure_ascii=False))
+        if report.failed:
+            self.stderr.write(self.style.WARNING(f"{report.failed} row(s) were rejected."))
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import random
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from api import cache
+from courses.models import Course
+from departments.models import Department
+
+
+SERVERS = {
+    # (فرمان پیش‌فرض، پیشوند endpoint ها)
+    "wsgi": (
+        "gunicorn config.wsgi:application --bind 127.0.0.1:{port} --workers {workers} --threads {threads} "
+        "--log-level warning",
+        {"courses": "/api/courses/", "departments": "/api/departments/departments/", "me": "/api/accounts/me/"},
+    ),
+    "asgi": (
+        "uvicorn config.asgi:application --port {port} --workers {workers} --no-access-log --log-level warning",
+        {"courses": "/api/async/courses/", "departments": "/api/async/departments/", "me": "/api/async/accounts/me/"},
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test of the read endpoints: WSGI (gunicorn + sync DRF views) against ASGI (uvicorn + "
+        "/api/async/ views). Starts each server as a subprocess on the configured database and drives "
+        "it with keep-alive connections. gunicorn and uvicorn must be installed; override the commands "
+        "with --wsgi-command/--asgi-command."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+        parser.add_argument("--connections", type=int, default=64)
+        parser.add_argument("--duration", type=float, default=10)
+        parser.add_argument("--courses", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--wsgi-command", default=SERVERS["wsgi"][0])
+        parser.add_argument("--asgi-command", default=SERVERS["asgi"][0])
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        admin = User.objects.create_user(username=f"loadtest-{tag}", role="admin")
+        department = Department.objects.create(name=f"Loadtest {tag}", code=f"L{tag}")
+        Course.objects.bulk_create(
+            Course(code=f"L{tag}{i:05d}", title=f"Loadtest {tag} {i}", units=(i % 4) + 1)
+            for i in range(options["courses"])
+        )
+        course_ids = list(Course.objects.filter(code__startswith=f"L{tag}").values_list("pk", flat=True))
+        Course.departments.through.objects.bulk_create(
+            Course.departments.through(course_id=pk, department_id=department.pk) for pk in course_ids
+        )
+        cache.bump(cache.COURSES, cache.DEPARTMENTS)
+        token = str(RoleRefreshToken.for_user(admin).access_token)
+
+        try:
+            for server in options["servers"]:
+                command = options[f"{server}_command"].format(
+                    port=options["port"], workers=options["workers"], threads=options["threads"]
+                )
+                results = self.run_server(command, SERVERS[server][1], token, course_ids, options)
+                self.report(server, command, results, options["duration"])
+        finally:
+            Course.objects.filter(code__startswith=f"L{tag}").delete()
+            department.delete()
+            admin.delete()
+            cache.bump(cache.COURSES, cache.DEPARTMENTS)
+
+    def run_server(self, command, endpoints, token, course_ids, options):
+        process = subprocess.Popen(
+            shlex.split(command), env={**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings"},
+            stdout=subprocess.DEVNULL, stderr=sys.stderr,
+        )
+        try:
+            self.wait_for_port(options["port"], process)
+            return asyncio.run(self.drive(options["port"], endpoints, token, course_ids, options))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_for_port(self, port, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with code {process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"Server did not start listening on port {port}")
+
+    async def drive(self, port, endpoints, token, course_ids, options):
+        results = {name: [] for name in ("list", "detail", "departments", "me")}
+        errors = {name: 0 for name in results}
+
+        def pick():
+            # ترکیب ترافیک: لیست صفحه‌بندی‌شده کاتالوگ بیشترین سهم را دارد
+            name = random.choices(list(results), weights=(5, 3, 1, 1))[0]
+            if name == "list":
+                return name, f"{endpoints['courses']}?page_size=50"
+            if name == "detail":
+                return name, f"{endpoints['courses']}{random.choice(course_ids)}/"
+            return name, endpoints[name]
+
+        async def connection(deadline):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            try:
+                while time.perf_counter() < deadline:
+                    name, path = pick()
+                    started = time.perf_counter()
+                    writer.write(
+                        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Bearer {token}\r\n\r\n".encode()
+                    )
+                    status = await read_response(reader)
+                    results[name].append((time.perf_counter() - started) * 1000)
+                    if status != 200:
+                        errors[name] += 1
+            finally:
+                writer.close()
+
+        deadline = time.perf_counter() + options["duration"]
+        await asyncio.gather(*(connection(deadline) for _ in range(options["connections"])))
+        return results, errors
+
+    def report(self, server, command, results, duration):
+        latencies, errors = results
+        total = sum(len(values) for values in latencies.values())
+        everything = sorted(value for values in latencies.values() for value in values)
+        self.stdout.write(f"{server}: {command}")
+        self.stdout.write(
+            f"  {total} requests in {duration:.0f}s ({total / duration:.0f} req/s) "
+            f"p50={statistics.median(everything):.1f} ms p99={percentile(everything, 0.99):.1f} ms "
+            f"errors={sum(errors.values())}"
+        )
+        for name, values in latencies.items():
+            if values:
+                values.sort()
+                self.stdout.write(
+                    f"    {name:<12} n={len(values)} p50={statistics.median(values):.1f} ms "
+                    f"p99={percentile(values, 0.99):.1f} ms errors={errors[name]}"
+                )
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def read_response(reader):
+    """یک پاسخ HTTP/1.1 با Content-Length را می‌خواند و کد وضعیت را برمی‌گرداند."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin1").split("\r\n")
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length:
+        await reader.readexactly(length)
+    return int(lines[0].split()[1])
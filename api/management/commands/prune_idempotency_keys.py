@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.idempotency import prune_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete expired Idempotency-Key responses in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Keep running as a background worker, pruning every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            deleted = prune_expired_keys(options["batch_size"], options["pause"])
+            self.stdout.write(f"Pruned {deleted} expired key(s) in {time.perf_counter() - started:.2f}s")
+            if not options["interval"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
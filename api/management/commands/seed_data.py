@@ -0,0 +1,161 @@
+import random
+import time
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from api import cache
+from api.bulk import chunked
+from courses.models import Course
+from departments.models import Department
+from terms.models import Term
+
+
+SUBJECTS = [
+    ("CS", "Computer Science"), ("MATH", "Mathematics"), ("PHYS", "Physics"), ("CHEM", "Chemistry"),
+    ("EE", "Electrical Engineering"), ("ME", "Mechanical Engineering"), ("CE", "Civil Engineering"),
+    ("BIO", "Biology"), ("ECON", "Economics"), ("HIST", "History"), ("LIT", "Literature"), ("STAT", "Statistics"),
+]
+TOPICS = [
+    "Introduction", "Foundations", "Principles", "Methods", "Theory", "Analysis", "Design", "Systems",
+    "Applications", "Modelling", "Topics", "Laboratory", "Seminar", "Workshop", "Advanced", "Applied",
+]
+SUBJECT_WORDS = [
+    "Algorithms", "Data Structures", "Calculus", "Linear Algebra", "Mechanics", "Thermodynamics", "Circuits",
+    "Signals", "Networks", "Databases", "Compilers", "Genetics", "Microeconomics", "Probability", "Optics",
+    "Materials", "Control", "Security", "Learning", "Optimization", "Ecology", "Poetry", "Statics", "Quantum",
+]
+FIRST_NAMES = [
+    "Ali", "Sara", "Reza", "Maryam", "Hossein", "Fatemeh", "Mohammad", "Zahra", "Amir", "Narges",
+    "Mehdi", "Leila", "Hamid", "Niloofar", "Saeed", "Parisa", "Omid", "Shirin", "Kaveh", "Roya",
+]
+LAST_NAMES = [
+    "Ahmadi", "Hosseini", "Karimi", "Rezaei", "Moradi", "Jafari", "Kazemi", "Mohammadi", "Rahimi", "Sadeghi",
+    "Ebrahimi", "Hashemi", "Nazari", "Ghasemi", "Salehi", "Rostami", "Mousavi", "Yazdani", "Bagheri", "Amini",
+]
+UNITS = [1, 2, 2, 3, 3, 3, 3, 4]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed departments, courses (with departments), terms and users with bulk_create. The same --seed "
+        "always produces the same rows, and each model has its own random stream, so changing one count "
+        "does not change the other tables. All seeded users share one password hash (--password)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--departments", type=int, default=40)
+        parser.add_argument("--courses", type=int, default=20_000)
+        parser.add_argument("--terms", type=int, default=20)
+        parser.add_argument("--students", type=int, default=100_000)
+        parser.add_argument("--professors", type=int, default=2_000)
+        parser.add_argument("--admins", type=int, default=5)
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__in=["admin0000", "prof000000", "std0000000"]).exists():
+            raise CommandError("This database is already seeded; seed a fresh one (e.g. DB_NAME=... migrate).")
+
+        self.seed = options["seed"]
+        self.batch_size = options["batch_size"]
+        departments = self.step("departments", lambda: self.departments(options["departments"]))
+        self.step("courses", lambda: self.courses(options["courses"], departments))
+        self.step("terms", lambda: self.terms(options["terms"]))
+        self.step("users", lambda: self.users(options))
+        # کش داده‌های مرجع روی نسخه قبل از seed نماند
+        cache.bump(cache.DEPARTMENTS, cache.COURSES, cache.TERMS)
+
+    def step(self, label, run):
+        started = time.perf_counter()
+        result = run()
+        count = len(result) if isinstance(result, list) else result
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+        return result
+
+    def random(self, name):
+        return random.Random(f"{self.seed}-{name}")
+
+    def insert(self, model, objects):
+        """درج دسته‌ای از یک generator؛ هر دسته در تراکنش خودش تا حافظه و طول تراکنش ثابت بماند."""
+        total = 0
+        for batch in chunked(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def departments(self, count):
+        objects = []
+        for i in range(count):
+            code, name = SUBJECTS[i % len(SUBJECTS)]
+            if i >= len(SUBJECTS):
+                code, name = f"{code}{i // len(SUBJECTS)}", f"{name} {i // len(SUBJECTS) + 1}"
+            objects.append(Department(code=code, name=name))
+        return Department.objects.bulk_create(objects)
+
+    def courses(self, count, departments):
+        rng = self.random("courses")
+        through = Course.departments.through
+
+        def generate():
+            for i in range(count):
+                primary = departments[i % len(departments)]
+                # کد یکتا با شماره درس در هر دانشکده؛ عنوان یکتا با شماره سراسری
+                number = i // len(departments) + 100
+                title = f"{rng.choice(TOPICS)} {rng.choice(SUBJECT_WORDS)} {i + 1}"
+                others = rng.sample(departments, k=rng.choice([0, 0, 0, 1, 2]))
+                yield Course(code=f"{primary.code}-{number}", title=title, units=rng.choice(UNITS)), \
+                    {primary.pk} | {d.pk for d in others}
+
+        total = 0
+        for batch in chunked(generate(), self.batch_size):
+            with transaction.atomic():
+                courses = Course.objects.bulk_create([course for course, _ in batch])
+                through.objects.bulk_create(
+                    through(course_id=course.pk, department_id=department_id)
+                    for course, (_, department_ids) in zip(courses, batch)
+                    for department_id in sorted(department_ids)
+                )
+            total += len(batch)
+        return total
+
+    def terms(self, count):
+        objects = []
+        for i in range(count):
+            year, half = 1390 + i // 2, i % 2
+            start = date(2011 + i // 2, 9, 23) if half == 0 else date(2012 + i // 2, 2, 4)
+            end = date(start.year + (half == 0), 1 if half == 0 else 6, 20)
+            objects.append(Term(name=f"{year}-{half + 1}", start_date=start, end_date=end))
+        now = timezone.now()
+        for term in objects:
+            term.status = term.status_at(now)
+        return Term.objects.bulk_create(objects)
+
+    def users(self, options):
+        rng = self.random("users")
+        password = make_password(options["password"])
+
+        def person(username, role, **ids):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            return User(
+                username=username, role=role, password=password, first_name=first, last_name=last,
+                email=f"{username}@example.edu", **ids,
+            )
+
+        def generate():
+            for i in range(options["admins"]):
+                yield person(f"admin{i:04d}", "admin", is_staff=True)
+            for i in range(options["professors"]):
+                yield person(f"prof{i:06d}", "professor", professor_id=f"P{i:06d}")
+            for i in range(options["students"]):
+                # شماره دانشجویی: سال ورود + شماره
+                yield person(f"std{i:07d}", "student", student_id=f"{1395 + i % 10}{i:07d}")
+
+        return self.insert(User, generate())
@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("api.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)    # آخرین خانه: +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    هیستوگرام‌های درون‌پروسه‌ای به ازای (view, route, method).
+    هر worker آمار خودش را دارد؛ Prometheus هر پروسه را جداگانه scrape و جمع می‌کند.
+    """
+
+    HISTOGRAMS = {
+        "http_request_duration_seconds": ("Request latency.", LATENCY_BUCKETS),
+        "http_request_queries": ("Database queries per request.", QUERY_COUNT_BUCKETS),
+        "http_request_query_duration_seconds": ("Total database time per request.", QUERY_TIME_BUCKETS),
+    }
+    COUNTERS = {
+        "http_requests_total": "Requests by status code.",
+        "http_request_duplicate_queries_total": "Repeated identical SQL statements (N+1 candidates).",
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.histograms = {name: {} for name in self.HISTOGRAMS}
+            self.counters = {name: Counter() for name in self.COUNTERS}
+
+    def observe(self, labels, status, duration, queries, query_time, duplicates):
+        with self.lock:
+            for name, value in (
+                ("http_request_duration_seconds", duration),
+                ("http_request_queries", queries),
+                ("http_request_query_duration_seconds", query_time),
+            ):
+                series = self.histograms[name]
+                if labels not in series:
+                    series[labels] = Histogram(self.HISTOGRAMS[name][1])
+                series[labels].observe(value)
+            self.counters["http_requests_total"][labels + (("status", str(status)),)] += 1
+            if duplicates:
+                self.counters["http_request_duplicate_queries_total"][labels] += duplicates
+
+    def render(self):
+        """خروجی در قالب متنی Prometheus (text exposition format 0.0.4)."""
+        lines = []
+        with self.lock:
+            for name, (help_text, buckets) in self.HISTOGRAMS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for labels, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(buckets + ("+Inf",), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum:.6g}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+            for name, help_text in self.COUNTERS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for labels, value in sorted(self.counters[name].items()):
+                    lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    def escape(value):
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+
+registry = MetricsRegistry()
+
+
+class QueryTracker:
+    """execute_wrapper که تعداد، زمان و SQL تکراری کوئری‌های یک درخواست را می‌شمارد."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.count += 1
+            # SQL با placeholder ها؛ همان کوئری با پارامترهای متفاوت تکراری حساب می‌شود
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def repeated(self, threshold):
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+def view_path(func):
+    """مسیر کامل view (کلید METRICS_QUERY_BUDGETS)؛ برای as_view() کلاس view و نه تابع بسته‌بندی."""
+    func = getattr(func, "view_class", func)
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def query_budget(view):
+    budgets = settings.METRICS_QUERY_BUDGETS
+    return budgets.get(view, budgets.get("default"))
+
+
+class MetricsMiddleware:
+    """
+    زمان پاسخ، تعداد و زمان کوئری‌ها و کوئری‌های تکراری هر endpoint را ثبت می‌کند.
+
+    با METRICS_QUERY_BUDGET_STRICT (برای تست‌ها) درخواستی که از بودجه کوئری view خود بیشتر
+    کوئری بزند QueryBudgetExceeded می‌دهد.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        tracker = QueryTracker()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self._track_queries(stack, tracker)
+            response = self.get_response(request)
+        self._record(request, response, tracker, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        # کوئری‌های ORM async در thread همگام اجرا می‌شوند و اتصال‌ها thread-local هستند؛
+        # پس wrapper ها هم در همان thread (sync_to_async با thread_sensitive) نصب می‌شوند
+        tracker = QueryTracker()
+        started = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(self._track_queries)(stack, tracker)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self._record(request, response, tracker, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _track_queries(stack, tracker):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(tracker))
+
+    def _record(self, request, response, tracker, duration):
+        match = request.resolver_match
+        view = view_path(match.func) if match else "unmatched"
+        route = match.route if match else ""
+        labels = (("view", view), ("route", route), ("method", request.method))
+        duplicates = tracker.duplicates
+        registry.observe(labels, response.status_code, duration, tracker.count, tracker.time, duplicates)
+
+        threshold = settings.METRICS_N_PLUS_ONE_THRESHOLD
+        if duplicates and threshold:
+            for sql, n in tracker.repeated(threshold):
+                logger.warning("Possible N+1 in %s %s: %d x %s", request.method, route, n, sql)
+
+        budget = query_budget(view)
+        if settings.METRICS_QUERY_BUDGET_STRICT and budget is not None and tracker.count > budget:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ({view}) ran {tracker.count} queries; budget is {budget}"
+            )
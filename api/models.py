@@ -1,3 +1,38 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class IdempotencyKey(models.Model):
+    """
+    پاسخ ذخیره‌شده یک درخواست تغییردهنده به ازای (کاربر، سرآیند Idempotency-Key).
+
+    status_code خالی یعنی درخواست اول هنوز در حال اجراست. ردیف‌های منقضی با دستور
+    prune_idempotency_keys حذف می‌شوند و تا آن زمان در اولین استفاده دوباره از کلید جایگزین می‌شوند.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+
+    key = models.CharField(max_length=255)
+    # sha256 متد، مسیر و بدنه؛ همان کلید با درخواست متفاوت پذیرفته نمی‌شود
+    fingerprint = models.CharField(max_length=64)
+
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.BinaryField(blank=True, default=b"")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key"),
+        ]
+        indexes = [
+            models.Index(fields=["expires_at"], name="idempotency_expires_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key} ({self.status_code or 'in progress'})"
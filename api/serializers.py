@@ -0,0 +1,143 @@
+import copy
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from .bulk import chunked
+
+
+# فیلدهایی که مقدار خام .values() همان خروجی to_representation آن‌هاست
+NATIVE_FIELDS = (
+    serializers.IntegerField, serializers.FloatField, serializers.CharField,
+    serializers.BooleanField, serializers.ChoiceField,
+)
+
+
+def query_param_set(request, name):
+    """مقدار جداشده با کاما از query string؛ اگر پارامتر نیامده باشد None."""
+    if request is None:
+        return None
+    params = getattr(request, "query_params", request.GET)
+    if name not in params:
+        return None
+    return {item.strip() for item in params[name].split(",") if item.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    برای ModelSerializer ها در درخواست‌های خواندنی:
+    ?fields=id,code فقط همین فیلدها را برمی‌گرداند و ?expand=departments رابطه را به جای شناسه‌ها
+    با سریالایزر خلاصه (expandable_fields) باز می‌کند. درخواست‌های نوشتنی دست نمی‌خورند.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        for name in query_param_set(request, "expand") or ():
+            if name in self.expandable_fields and name in self.fields:
+                source = self.fields[name].source
+                self.fields[name] = self.expandable_fields[name](
+                    many=True, read_only=True, **({"source": source} if source != name else {})
+                )
+
+        fields = query_param_set(request, "fields")
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
+# ---------- fast read-only path ----------
+
+def _split_fields(serializer):
+    scalar, relations = [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, (serializers.ManyRelatedField, serializers.ListSerializer)):
+            relations.append((name, field))
+        else:
+            scalar.append((name, field))
+    return scalar, relations
+
+
+def values_columns(serializer):
+    """ستون‌های لازم برای values_data؛ queryset.values(*values_columns(s)) ورودی آن است."""
+    scalar, _ = _split_fields(serializer)
+    return ["pk", *dict.fromkeys(field.source for _, field in scalar)]
+
+
+def values_data(serializer, rows):
+    """
+    مسیر سریع فقط‌خواندنی لیست‌ها: خروجی serializer(many=True).data را مستقیم از ردیف‌های
+    .values() می‌سازد، بدون ساختن نمونه مدل و اجرای فیلدها برای هر ردیف.
+
+    فقط فیلدهای ساده و روابط many-to-many (شناسه یا سریالایزر تو در توی ساده) پشتیبانی می‌شوند؛
+    هر رابطه با یک کوئری روی جدول واسط (به ازای هر ۱۰۰۰ ردیف) خوانده می‌شود.
+    """
+    scalar, relations = _split_fields(serializer)
+    converters = {name: _converter(field) for name, field in scalar if not isinstance(field, NATIVE_FIELDS)}
+
+    data = []
+    for row in rows:
+        item = {}
+        for name, field in scalar:
+            value = row[field.source]
+            if value is not None and name in converters:
+                value = converters[name](value)
+            item[name] = value
+        data.append(item)
+
+    if relations:
+        pks = [row["pk"] for row in rows]
+        model = serializer.Meta.model
+        for name, field in relations:
+            related = _many_to_many_values(model, field, pks)
+            for row, item in zip(rows, data):
+                item[name] = related.get(row["pk"], [])
+    return data
+
+
+def _converter(field):
+    if isinstance(field, serializers.DateTimeField) and not hasattr(field, "timezone"):
+        # DateTimeField منطقه زمانی جاری را برای هر مقدار دوباره از asgiref Local می‌خواند؛
+        # یک کپی با منطقه زمانی ثابت همان خروجی را بدون آن هزینه می‌دهد
+        field = copy.copy(field)
+        field.timezone = field.default_timezone()
+    return field.to_representation
+
+
+def _many_to_many_values(model, field, pks):
+    m2m = model._meta.get_field(field.source)
+    through = m2m.remote_field.through
+    source, target = m2m.m2m_field_name(), m2m.m2m_reverse_field_name()
+    target_model = m2m.related_model
+    # ترتیب همان ترتیب پیش‌فرض مدل مقصد است، مثل course.departments.all()
+    ordering = [
+        f"-{target}__{column[1:]}" if column.startswith("-") else f"{target}__{column}"
+        for column in target_model._meta.ordering
+    ]
+
+    links = []
+    for chunk in chunked(pks, 1000):
+        links += through.objects.filter(**{f"{source}_id__in": chunk}).order_by(*ordering).values_list(
+            f"{source}_id", f"{target}_id"
+        )
+
+    if isinstance(field, serializers.ListSerializer):
+        child = field.child
+        target_ids = list({target_id for _, target_id in links})
+        targets = {}
+        for chunk in chunked(target_ids, 1000):
+            rows = list(target_model._default_manager.filter(pk__in=chunk).values(*values_columns(child)))
+            targets.update((row["pk"], item) for row, item in zip(rows, values_data(child, rows)))
+    else:
+        targets = None
+
+    related = {}
+    for source_id, target_id in links:
+        related.setdefault(source_id, []).append(target_id if targets is None else targets[target_id])
+    return related
@@ -0,0 +1,29 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from courses.models import Course
+from departments.models import Department
+from terms.models import Term
+from . import cache
+
+
+@receiver([post_save, post_delete], sender=Department)
+def department_changed(sender, **kwargs):
+    # حذف دانشکده لینک‌های درس را هم پاک می‌کند (بدون m2m_changed)
+    cache.bump_on_commit(cache.DEPARTMENTS, cache.COURSES)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def course_changed(sender, **kwargs):
+    cache.bump_on_commit(cache.COURSES)
+
+
+@receiver(m2m_changed, sender=Course.departments.through)
+def course_departments_changed(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        cache.bump_on_commit(cache.COURSES)
+
+
+@receiver([post_save, post_delete], sender=Term)
+def term_changed(sender, **kwargs):
+    cache.bump_on_commit(cache.TERMS)
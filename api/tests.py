@@ -1,3 +1,538 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection
+from django.test import AsyncClient, Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from courses.models import Course
+from courses.views import CourseViewSet
+from departments.models import Department
+from terms.models import Term
+from .bulk import get_importer, read_rows
+from .cache import COURSES, get_version, reference_cache
+from .export import csv_chunks
+from .idempotency import claim
+from .management.commands.benchmark_api import compare
+from .metrics import QueryBudgetExceeded, QueryTracker, registry
+from .models import IdempotencyKey
+
+
+def csv_rows(text):
+    return read_rows(io.BytesIO(text.encode()), "csv")
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        Department.objects.create(code="MATH", name="Mathematics")
+        Department.objects.create(code="CS", name="Computer Science")
+
+    def test_courses_are_created_and_linked(self):
+        report = get_importer("courses").run(csv_rows(
+            "code,title,units,departments\n"
+            "CS101,Programming,3,CS\n"
+            "MA101,Calculus,4,MATH|CS\n"
+        ))
+        self.assertEqual(report.as_dict()["created"], 2)
+        self.assertEqual(
+            sorted(Course.objects.get(code="MA101").departments.values_list("code", flat=True)),
+            ["CS", "MATH"],
+        )
+
+    def test_row_errors_do_not_abort_the_file(self):
+        report = get_importer("courses").run(csv_rows(
+            "code,title,units,departments\n"
+            "CS101,Programming,3,CS\n"
+            "CS102,Bad units,9,CS\n"
+            "CS103,Unknown dept,2,PHYS\n"
+            "CS101,Duplicate code,2,\n"
+            "CS104,Programming,2,\n"
+            "CS105,Databases,3,CS\n"
+        ), chunk_size=4)
+        data = report.as_dict()
+        self.assertEqual((data["created"], data["failed"]), (2, 4))
+        self.assertEqual([e["row"] for e in data["errors"]], [2, 3, 4, 5])
+        self.assertIn("units", data["errors"][0]["errors"])
+
+    def test_existing_rows_are_updated_in_place(self):
+        course = Course.objects.create(code="CS101", title="Old", units=2)
+        course.departments.set(Department.objects.filter(code="MATH"))
+
+        report = get_importer("courses").run(csv_rows(
+            "code,title,units,departments\nCS101,Programming,3,CS\n"
+        ))
+        self.assertEqual(report.updated, 1)
+        course.refresh_from_db()
+        self.assertEqual((course.title, course.units), ("Programming", 3))
+        self.assertEqual(list(course.departments.values_list("code", flat=True)), ["CS"])
+
+    def test_chunk_query_count_does_not_depend_on_rows(self):
+        def import_queries(start, count):
+            rows = "code,title,units,departments\n" + "".join(
+                f"C{i},Course {i},3,CS|MATH\n" for i in range(start, start + count)
+            )
+            importer = get_importer("courses")
+            with CaptureQueriesContext(connection) as ctx:
+                importer.run(csv_rows(rows), chunk_size=500)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(import_queries(0, 5), import_queries(100, 100))
+
+    def test_departments_are_unique_regardless_of_case(self):
+        report = get_importer("departments").run(csv_rows(
+            "code,name\n"
+            "math,Algebra\n"
+            "PHYS,computer science\n"
+            "MATH,Pure Mathematics\n"
+        ))
+        self.assertEqual((report.updated, report.failed), (1, 2))
+        self.assertEqual(Department.objects.get(code="MATH").name, "Pure Mathematics")
+
+    def test_users_jsonl(self):
+        lines = "\n".join(json.dumps(row) for row in [
+            {"username": "s1", "role": "student", "student_id": "4001"},
+            {"username": "p1", "role": "professor"},
+            "not a row",
+        ]) + "\n{broken"
+        report = get_importer("users").run(read_rows(io.BytesIO(lines.encode()), "jsonl"))
+        self.assertEqual((report.created, report.failed), (1, 3))
+        self.assertFalse(User.objects.get(username="s1").has_usable_password())
+
+
+class BulkImportApiTests(TestCase):
+    def test_admin_can_upload_departments(self):
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+        upload = SimpleUploadedFile("departments.csv", b"code,name\nMATH,Mathematics\nCS,\n")
+
+        response = self.client.post("/api/import/departments/", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertTrue(Department.objects.filter(code="MATH").exists())
+
+        response = self.client.post("/api/import/nothing/", {"file": upload})
+        self.assertEqual(response.status_code, 404)
+
+
+class ReferenceCacheTests(TestCase):
+    url = "/api/courses/"
+
+    def setUp(self):
+        reference_cache().clear()
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+        self.math = Department.objects.create(code="MATH", name="Mathematics")
+        self.course = Course.objects.create(code="MA101", title="Calculus", units=4)
+
+    def test_warm_list_skips_course_queries(self):
+        self.client.get(self.url)
+        # فقط کوئری کاربر JWT
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["results"][0]["code"], "MA101")
+
+    def test_etag_revalidation(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # کوئری‌استرینگ متفاوت ETag متفاوت دارد
+        response = self.client.get(self.url, {"units": 4}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com"])
+    def test_next_link_follows_the_request_host(self):
+        Course.objects.create(code="MA102", title="Calculus II", units=4)
+        links = [
+            self.client.get(self.url, {"page_size": 1}, **extra).data["next"]
+            for extra in ({}, {"HTTP_HOST": "api.example.com"}, {"HTTP_HOST": "api.example.com", "secure": True})
+        ]
+        self.assertEqual(
+            [link.split("/api/")[0] for link in links],
+            ["http://testserver", "http://api.example.com", "https://api.example.com"],
+        )
+
+    def test_signals_invalidate(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.course.departments.add(self.math)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["departments"], [self.math.id])
+
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data["results"][0]["departments"], [])
+
+    def test_bulk_import_invalidates(self):
+        self.client.get("/api/departments/departments/")
+        get_importer("departments").run(csv_rows("code,name\nCS,Computer Science\n"))
+        response = self.client.get("/api/departments/departments/")
+        self.assertEqual([d["code"] for d in response.data], ["CS", "MATH"])
+
+    def test_bulk_post_invalidates(self):
+        url = "/api/departments/departments/"
+        self.client.get(url)
+        payload = [{"code": "CS", "name": "Computer Science"}, {"code": "PHY", "name": "Physics"}]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        response = self.client.get(url)
+        self.assertEqual([d["code"] for d in response.data], ["CS", "MATH", "PHY"])
+
+    def test_signal_bump_waits_for_commit(self):
+        version = get_version(COURSES)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.course.save()
+            self.assertEqual(get_version(COURSES), version)
+        self.assertEqual(len(callbacks), 1)
+
+
+class ExportTests(TestCase):
+    def test_csv_chunks_batches_rows(self):
+        chunks = list(csv_chunks(["a", "b"], ((i, f"row {i}") for i in range(1200))))
+        self.assertTrue(chunks[0].startswith("\ufeffa,b"))
+        # header + 500 + 500 + 200
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(c.count("\n") for c in chunks), 1201)
+
+    def test_csv_memory_is_constant(self):
+        rows = ((i, f"user{i}", f"user{i}@example.com", "student") for i in range(500_000))
+        tracemalloc.start()
+        try:
+            total = sum(len(chunk) for chunk in csv_chunks(["id", "username", "email", "role"], rows))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(total, 10_000_000)
+        self.assertLess(peak, 2_000_000)
+
+
+class UserExportStreamingTests(TestCase):
+    rows = 20_000
+
+    def setUp(self):
+        User.objects.bulk_create(
+            User(username=f"user{i}", email=f"user{i}@example.com", role="student", student_id=str(i), password="!")
+            for i in range(self.rows)
+        )
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+
+    def test_endpoint_streams_rows_in_chunks_with_one_query(self):
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get("/api/accounts/export/")
+                chunks = [len(chunk) for chunk in response.streaming_content]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertTrue(response.streaming)
+        # header + ceil((rows + admin) / ROWS_PER_CHUNK)
+        self.assertEqual(len(chunks), 1 + -(-(self.rows + 1) // 500))
+        # کاربر JWT + یک SELECT که با iterator تکه‌تکه خوانده می‌شود
+        self.assertEqual(len(ctx), 2)
+        # خواندن همه ردیف‌ها در حافظه (list به‌جای iterator) حدود ۸ مگابایت است؛ جریانی حدود یک تکه ۲۰۰۰ ردیفی
+        self.assertGreater(sum(chunks), 1_000_000)
+        self.assertLess(peak, 4_000_000)
+
+
+class DatabaseProfileTests(TestCase):
+    def test_sqlite_connection_init_pragmas(self):
+        if connection.vendor != "sqlite" or not connection.settings_dict["OPTIONS"]:
+            self.skipTest("tuned SQLite profile is not active")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_BUSY_TIMEOUT_MS)
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)   # NORMAL
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+
+class MetricsTests(TestCase):
+    url = "/api/metrics/"
+
+    def setUp(self):
+        registry.clear()
+        reference_cache().clear()
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.admin)}"
+
+    def test_requests_are_exported_in_prometheus_format(self):
+        self.client.get("/api/departments/departments/")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+        body = response.content.decode()
+        labels = 'view="departments.views.DepartmentViewSet",route="api/departments/departments/$",method="GET"'
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body)
+        self.assertIn(f"http_request_queries_count{{{labels}}} 1", body)
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 1', body)
+        # view های as_view() با کلاسشان برچسب می‌خورند، نه تابع بسته‌بندی
+        self.assertIn('view="api.views.MetricsView"', self.client.get(self.url).content.decode())
+
+    async def test_async_views_are_measured(self):
+        await AsyncClient().get("/api/async/departments/")
+        body = registry.render()
+        labels = 'view="departments.async_views.department_list",route="api/async/departments/",method="GET"'
+        self.assertIn(f"http_request_queries_count{{{labels}}} 1", body)
+        self.assertIn(f'http_requests_total{{{labels},status="200"}} 1', body)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_access(self):
+        self.client.defaults.pop("HTTP_AUTHORIZATION")
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.client.get(self.url, HTTP_X_METRICS_TOKEN="wrong").status_code, 401)
+        self.assertEqual(self.client.get(self.url, HTTP_X_METRICS_TOKEN="scrape-secret").status_code, 200)
+
+        student = User.objects.create_user(username="s1", role="student")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(student)}"
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_duplicate_queries_are_counted(self):
+        tracker = QueryTracker()
+        with connection.execute_wrapper(tracker):
+            for department_id in range(4):
+                Department.objects.filter(pk=department_id).exists()
+            User.objects.exists()
+        self.assertEqual(tracker.count, 5)
+        self.assertEqual(tracker.duplicates, 3)
+        self.assertEqual(len(tracker.repeated(4)), 1)
+
+    @override_settings(METRICS_QUERY_BUDGET_STRICT=True, METRICS_QUERY_BUDGETS={"default": 1})
+    def test_strict_mode_fails_over_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/api/departments/departments/")
+
+
+class BenchmarkToolingTests(TestCase):
+    counts = {"departments": 3, "courses": 12, "terms": 2, "students": 6, "professors": 2, "admins": 1}
+
+    def seed(self, **options):
+        call_command("seed_data", stdout=io.StringIO(), **{**self.counts, **options})
+        return list(Course.objects.order_by("pk").values_list("code", "title", "units"))
+
+    def test_seed_is_deterministic_per_seed(self):
+        first = self.seed(seed=7)
+        self.assertEqual(len(first), 12)
+        self.assertEqual(User.objects.filter(role="student").count(), 6)
+        self.assertEqual(Course.departments.through.objects.values("course").distinct().count(), 12)
+        with self.assertRaises(CommandError):
+            self.seed(seed=7)
+
+        Course.objects.all().delete()
+        User.objects.all().delete()
+        Department.objects.all().delete()
+        Term.objects.all().delete()
+        self.assertEqual(self.seed(seed=7), first)
+
+    def test_compare_flags_regressions(self):
+        old = {"scenarios": {"me": {"queries": 1, "errors": 0, "p50_ms": 2.0, "p95_ms": 3.0}}}
+        new = {"scenarios": {"me": {"queries": 2, "errors": 0, "p50_ms": 2.2, "p95_ms": 9.0}}}
+        regressions = {metric for _, metric, *_, failed in compare(old, new, 0.25, slack_ms=2) if failed}
+        self.assertEqual(regressions, {"queries", "p95_ms"})
+        # کندی نسبی بزرگ ولی کمتر از slack مطلق نوسان است
+        new["scenarios"]["me"].update(queries=1, p95_ms=4.5)
+        self.assertFalse(any(failed for *_, failed in compare(old, new, 0.25, slack_ms=2)))
+
+    def test_benchmark_writes_and_compares_baseline(self):
+        self.seed()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            options = {"iterations": 3, "login_iterations": 1, "warmup": 1, "stdout": io.StringIO()}
+            call_command("benchmark_api", output=path, **options)
+            with open(path) as f:
+                baseline = json.load(f)
+            self.assertEqual(baseline["meta"]["rows"]["courses"], 12)
+            for name, result in baseline["scenarios"].items():
+                self.assertEqual(result["errors"], 0, name)
+
+            call_command("benchmark_api", compare=path, scenario=["courses"], tolerance=100, **options)
+            baseline["scenarios"]["courses"]["queries"] = 0
+            with open(path, "w") as f:
+                json.dump(baseline, f)
+            with self.assertRaises(CommandError):
+                call_command("benchmark_api", compare=path, scenario=["courses"], tolerance=100, **options)
+
+
+class IdempotencyTests(TestCase):
+    url = "/api/courses/"
+
+    def setUp(self):
+        reference_cache().clear()
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.admin)}"
+
+    def post(self, data, key="key-1", **extra):
+        return self.client.post(self.url, data, content_type="application/json", HTTP_IDEMPOTENCY_KEY=key, **extra)
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.post({"code": "CS101", "title": "Intro", "units": 3})
+        self.assertEqual(first.status_code, 201)
+        with CaptureQueriesContext(connection) as captured:
+            second = self.post({"code": "CS101", "title": "Intro", "units": 3})
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Course.objects.count(), 1)
+        # بدون اجرای منطق: احراز هویت، INSERT ناموفق و خواندن کلید
+        self.assertFalse(any("courses_course" in q["sql"] for q in captured.captured_queries))
+
+    def test_key_reuse_with_another_request_is_rejected(self):
+        self.post({"code": "CS101", "title": "Intro", "units": 3})
+        response = self.post({"code": "CS102", "title": "Other", "units": 3})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["code"], "key_reused")
+
+    def test_client_errors_are_replayed_and_server_errors_release_the_key(self):
+        invalid = self.post({"code": "CS101"}, key="bad")
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(self.post({"code": "CS101"}, key="bad")["Idempotent-Replayed"], "true")
+
+        with mock.patch.object(CourseViewSet, "perform_create", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.post({"code": "CS101", "title": "Intro", "units": 3}, key="crash")
+        self.assertFalse(IdempotencyKey.objects.filter(key="crash").exists())
+        self.assertEqual(self.post({"code": "CS101", "title": "Intro", "units": 3}, key="crash").status_code, 201)
+
+    def test_keys_are_scoped_per_user_and_expire(self):
+        self.post({"code": "CS101", "title": "Intro", "units": 3})
+        other = User.objects.create_user(username="admin2", role="admin")
+        response = self.post(
+            {"code": "CS101", "title": "Intro", "units": 3}, HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}"
+        )
+        # کلید کاربر دیگر پاسخ او را برنمی‌گرداند؛ درخواست واقعا اجرا و به‌خاطر کد تکراری رد می‌شود
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+
+        IdempotencyKey.objects.filter(user=self.admin).update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post({"code": "CS101", "title": "Intro", "units": 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = io.StringIO()
+        call_command("prune_idempotency_keys", stdout=out)
+        self.assertIn("Pruned 2", out.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_in_progress_duplicate_gets_retry_after(self):
+        record, response = claim(self.admin, "slow", "f" * 64)
+        self.assertIsNotNone(record)
+        self.assertIsNone(response)
+        record, response = claim(self.admin, "slow", "f" * 64)
+        self.assertIsNone(record)
+        self.assertEqual((response.status_code, response["Retry-After"]), (409, "1"))
+
+        # پروسه‌ای که وسط کار از بین رفته کلید را برای همیشه قفل نمی‌کند
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        record, response = claim(self.admin, "slow", "f" * 64)
+        self.assertIsNotNone(record)
+
+    def test_requests_without_a_key_and_safe_methods_are_untouched(self):
+        self.client.post(self.url, {"code": "CS101", "title": "Intro", "units": 3}, content_type="application/json")
+        self.client.get(self.url, HTTP_IDEMPOTENCY_KEY="key-1")
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post({"code": "CS1", "title": "T", "units": 3}, key="x" * 256).status_code, 400)
+
+    def test_registration_endpoints_are_idempotent(self):
+        from registration.admission import admission
+        from registration.tests import make_offering, make_student
+
+        admission.reset()
+        student = make_student("s1")
+        offering = make_offering(capacity=5)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(student)}"
+        responses = [
+            self.client.post(
+                "/api/registration/enrollments/", {"offering": offering.pk},
+                content_type="application/json", HTTP_IDEMPOTENCY_KEY="enroll-1",
+            )
+            for _ in range(2)
+        ]
+        self.assertEqual([r.status_code for r in responses], [201, 201])
+        self.assertEqual(responses[0].json(), responses[1].json())
+        offering.refresh_from_db()
+        self.assertEqual(offering.enrolled_count, 1)
+
+
+class ConcurrentIdempotencyTests(TransactionTestCase):
+    """تکرارهای هم‌زمان یک درخواست با یک کلید: منطق دقیقا یک بار اجرا می‌شود."""
+
+    def test_concurrent_duplicates_run_once(self):
+        reference_cache().clear()
+        admin = User.objects.create_user(username="admin", role="admin")
+        token = f"Bearer {AccessToken.for_user(admin)}"
+        barrier = threading.Barrier(8)
+        outcomes = []
+        lock = threading.Lock()
+        perform_create = CourseViewSet.perform_create
+
+        def slow_create(view, serializer):
+            # پنجره‌ای که در آن درخواست اول هنوز در حال اجراست
+            time.sleep(0.2)
+            perform_create(view, serializer)
+
+        def worker():
+            client = Client(HTTP_AUTHORIZATION=token, HTTP_IDEMPOTENCY_KEY="storm")
+            try:
+                barrier.wait()
+                while True:
+                    try:
+                        response = client.post(
+                            "/api/courses/", {"code": "CS101", "title": "Intro", "units": 3},
+                            content_type="application/json",
+                        )
+                        break
+                    except OperationalError:
+                        # SQLite قفل را به‌جای انتظار برمی‌گرداند؛ تلاش دوباره مثل یک کلاینت واقعی
+                        time.sleep(0.005)
+                replayed = response.has_header("Idempotent-Replayed")
+                with lock:
+                    outcomes.append((response.status_code, replayed))
+            finally:
+                connection.close()
+
+        with mock.patch.object(CourseViewSet, "perform_create", slow_create):
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(outcomes), 8)
+        self.assertTrue(set(outcomes) <= {(201, False), (201, True), (409, False)}, outcomes)
+        # اگر درخواست اول بعد از ذخیره پاسخ خطای قفل گرفته و تکرار شده باشد، پاسخش replay است
+        self.assertLessEqual(outcomes.count((201, False)), 1)
+        self.assertGreaterEqual(outcomes.count((201, False)) + outcomes.count((201, True)), 1)
+        self.assertEqual(Course.objects.count(), 1)
+
+        # بعد از پایان درخواست اول، تلاش دوباره همان پاسخ را می‌گیرد
+        response = Client(HTTP_AUTHORIZATION=token, HTTP_IDEMPOTENCY_KEY="storm").post(
+            "/api/courses/", {"code": "CS101", "title": "Intro", "units": 3}, content_type="application/json"
+        )
+        self.assertEqual((response.status_code, response["Idempotent-Replayed"]), (201, "true"))
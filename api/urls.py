@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import BulkImportView, MetricsView
+
+urlpatterns = [
+    path("import/<str:kind>/", BulkImportView.as_view()),
+    path("metrics/", MetricsView.as_view()),
+]
@@ -1,3 +1,56 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import BasePermission
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser
+from rest_framework import status
 
-# Create your views here.
+from accounts.permissions import IsAdmin
+from .bulk import FORMATS, get_importer, guess_format, read_rows
+from .metrics import registry
+
+
+class BulkImportView(APIView):
+    """
+    بارگذاری فایل CSV/JSON برای ورود گروهی. خطاهای هر ردیف در گزارش برگردانده می‌شود.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "file is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get("format") or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response({"detail": f"format must be one of {', '.join(FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            importer = get_importer(kind)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            report = importer.run(read_rows(upload, fmt))
+        except ValueError as e:
+            return Response({"detail": f"Could not parse file: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
+
+
+class HasMetricsToken(BasePermission):
+    def has_permission(self, request, view):
+        token = request.headers.get("X-Metrics-Token")
+        return bool(settings.METRICS_TOKEN and token and constant_time_compare(token, settings.METRICS_TOKEN))
+
+
+class MetricsView(APIView):
+    """هیستوگرام‌های این پروسه در قالب متنی Prometheus؛ برای ادمین یا scraper با توکن."""
+    permission_classes = [HasMetricsToken | (IsAuthenticated & IsAdmin)]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
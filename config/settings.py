@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -36,6 +37,7 @@ INSTALLED_APPS = [
     "departments",
     "courses",
     "terms",
+    "offerings",
     "registration",
     "grading",
     "requests",
@@ -46,6 +48,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # باید اول باشد (بعد از SecurityMiddleware)
+    'api.metrics.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,11 +82,90 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# پروفایل پایگاه داده از متغیرهای محیطی خوانده می‌شود:
+#   DB_ENGINE=sqlite (پیش‌فرض) یا postgres
+#   Postgres: DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+#     DB_POOL=1 از connection pool داخلی Django 5.1+ استفاده می‌کند (نیازمند psycopg[pool])؛
+#     در غیر این صورت اتصال‌ها با DB_CONN_MAX_AGE ثانیه باز و با health check نگه داشته می‌شوند.
+#   SQLite: DB_SQLITE_TUNED=1 حالت WAL، synchronous=NORMAL و busy_timeout را روی هر اتصال
+#     تنظیم می‌کند و تراکنش‌ها را IMMEDIATE باز می‌کند تا نویسنده‌ها به‌جای خطای قفل صف بکشند.
+#     پیش‌فرض خاموش است: WAL در خود فایل ذخیره می‌شود و هر دستور manage.py فایل db.sqlite3 داخل
+#     مخزن را تغییر می‌داد؛ برای اجرای چند worker یا benchmark روی یک کپی از پایگاه داده روشن شود.
+
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    # lookup های trigram برای جستجوی درس (courses.search)
+    INSTALLED_APPS.append("django.contrib.postgres")
+    DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DB_NAME", "university"),
+            "USER": os.environ.get("DB_USER", "postgres"),
+            "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+            "HOST": os.environ.get("DB_HOST", "localhost"),
+            "PORT": os.environ.get("DB_PORT", "5432"),
+            # pool و اتصال پایدار با هم سازگار نیستند؛ با pool اتصال به pool برمی‌گردد
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+                    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "20")),
+                    "timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+                },
+            } if DB_POOL else {},
+        }
     }
+else:
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("DB_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("DB_NAME", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                "init_command": (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};"
+                ),
+                "transaction_mode": "IMMEDIATE",
+                "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+            } if os.environ.get("DB_SQLITE_TUNED", "0") == "1" else {},
+        }
+    }
+
+
+# Caches
+# کش داده‌های مرجع (دانشکده، درس، ترم): locmem برای هر پروسه جداست؛
+# وقتی چند worker داریم file یا db باعث می‌شود بی‌اعتبارسازی بین پروسه‌ها مشترک باشد.
+# برای db ابتدا دستور createcachetable اجرا شود.
+
+REFERENCE_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "reference",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("REFERENCE_CACHE_LOCATION", BASE_DIR / ".cache" / "reference"),
+    },
+    "db": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "reference_cache",
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "reference": {
+        **REFERENCE_CACHE_BACKENDS[os.environ.get("REFERENCE_CACHE_BACKEND", "locmem")],
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
 }
 
 
@@ -106,6 +188,31 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER=pbkdf2 (پیش‌فرض) | scrypt | argon2 (نیازمند argon2-cffi). hasher انتخاب‌شده برای
+# رمزهای جدید است و بقیه فقط برای بررسی hash های قدیمی؛ با اولین ورود موفق rehash می‌شوند.
+# هزینه‌ها با دستور calibrate_hashers روی سرور اندازه‌گیری شوند. مقادیر پیش‌فرض حداقل توصیه OWASP:
+# PBKDF2-SHA256 با 600k تکرار (در برابر 1M پیش‌فرض Django)،
+# scrypt با N=2^14, r=8, p=5 و Argon2id با 19MiB حافظه، t=2 و p=1.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+_PASSWORD_HASHERS = {
+    "pbkdf2": "accounts.hashers.PBKDF2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+}
+# هر algorithm فقط یک بار؛ Django برای هر algorithm آخرین hasher لیست را برمی‌دارد
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get("PASSWORD_PBKDF2_ITERATIONS", "600000"))
+PASSWORD_SCRYPT = {"work_factor": 2 ** 14, "block_size": 8, "parallelism": 5}
+PASSWORD_ARGON2 = {"time_cost": 2, "memory_cost": 19 * 1024, "parallelism": 1}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -136,11 +243,19 @@ AUTH_USER_MODEL = 'accounts.User'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.RoleJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # محدودیت ورود قبل از هر hash رمز بررسی می‌شود (accounts.throttling)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "30/min",
+        "login_username": "10/min",
+    },
+    # تعداد proxy های مورد اعتماد جلوی برنامه؛ throttle ها IP را از REMOTE_ADDR (۰) یا از همین تعداد
+    # از انتهای X-Forwarded-For می‌خوانند. None کل سرآیند را که کلاینت می‌تواند عوض کند معتبر می‌داند.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "0")),
 }
 # JWT settings
 
@@ -151,3 +266,91 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
     }
+
+# درخواست‌های خواندنی کاربر را از claim های توکن می‌سازند (بدون کوئری جدول کاربران)
+JWT_STATELESS_READS = os.environ.get("JWT_STATELESS_READS", "0") == "1"
+JWT_ACTIVE_USER_CACHE_SIZE = 10_000
+JWT_ACTIVE_USER_CACHE_TTL = 60
+
+# نسخه درون‌پروسه‌ای ترم‌ها (terms.resolver)؛ تغییر وضعیت در پروسه‌های دیگر حداکثر بعد از این مدت دیده می‌شود
+TERM_RESOLVER_TTL = int(os.environ.get("TERM_RESOLVER_TTL", "30"))
+# گراف کامپایل‌شده پیش‌نیازها (courses.prerequisites)؛ همان رفتار برای پروسه‌های دیگر
+PREREQUISITE_GRAPH_TTL = int(os.environ.get("PREREQUISITE_GRAPH_TTL", "60"))
+
+# ایندکس برنامه هفتگی دانشجو برای ماتریس تداخل (offerings.timetable)؛ ثبت‌نام از آن استفاده نمی‌کند
+TIMETABLE_CACHE_TTL = int(os.environ.get("TIMETABLE_CACHE_TTL", "60"))
+
+# بررسی blacklist refresh token از جلوی Bloom filter درون‌پروسه (accounts.blacklist)؛
+# blacklist شدن در پروسه دیگر حداکثر بعد از JWT_BLACKLIST_SYNC_SECONDS دیده می‌شود.
+# جدول‌های توکن با دستور prune_tokens کوچک نگه داشته می‌شوند.
+JWT_BLACKLIST_BLOOM = os.environ.get("JWT_BLACKLIST_BLOOM", "0") == "1"
+JWT_BLACKLIST_BLOOM_CAPACITY = 1_000_000
+JWT_BLACKLIST_SYNC_SECONDS = 2
+# هر sync این تعداد شناسه قبل از آخرین شناسه را دوباره می‌خواند (ردیف‌هایی که دیرتر commit شده‌اند)
+# و filter هر JWT_BLACKLIST_REBUILD_SECONDS ثانیه کامل از نو ساخته می‌شود
+JWT_BLACKLIST_SYNC_OVERLAP = 1000
+JWT_BLACKLIST_REBUILD_SECONDS = 600
+
+# Registration settings
+
+REGISTRATION_MAX_UNITS = 20
+# بیشترین سقفی که با درخواست اضافه واحد می‌توان گرفت
+REGISTRATION_OVERLOAD_MAX_UNITS = 24
+# حداکثر طول صف انتظار هر ارائه؛ صندلی‌های آزاد را دستور promote_waitlists پر می‌کند
+REGISTRATION_WAITLIST_LIMIT = 50
+# کنترل ورود (registration.admission): در بازه ثبت‌نام اولیه هر ورودی نوبت خودش را دارد
+# (قدیمی‌ترها زودتر، هر نوبت SLOT_MINUTES دقیقه) و نوشتن‌های هر دانشجو و هر ورودی با token bucket های
+# درون‌پروسه محدود می‌شود؛ درخواست اضافه فورا ۴۲۹ با Retry-After می‌گیرد
+REGISTRATION_SLOT_COUNT = 4
+REGISTRATION_SLOT_MINUTES = 30
+REGISTRATION_SLOT_SPREAD_SECONDS = 60
+REGISTRATION_COHORT_BURST = 20
+REGISTRATION_COHORT_RATE = 10.0
+REGISTRATION_USER_BURST = 5
+REGISTRATION_USER_RATE = 1.0
+
+# Idempotency settings
+# پاسخ درخواست‌های با سرآیند Idempotency-Key تا این مدت (ثانیه) برای تکرارها نگه داشته می‌شود
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+# رزرو بدون پاسخ قدیمی‌تر از این (ثانیه) رها شده حساب می‌شود و تکرار بعدی دوباره اجرا می‌شود
+IDEMPOTENCY_LOCK_TIMEOUT = 60
+
+# Notification settings
+# هر کانال یک backend تحویل دارد؛ دستور process_outbox پیام‌ها را دسته‌ای به آن‌ها می‌دهد
+
+NOTIFICATION_BACKENDS = {
+    "inbox": "notifications.backends.InboxBackend",
+    "email": "notifications.backends.EmailBackend",
+}
+NOTIFICATION_DEFAULT_CHANNELS = ["inbox"]
+NOTIFICATION_EMAIL_BACKEND = os.environ.get(
+    "NOTIFICATION_EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+
+# Reports settings
+# refresh_reports تغییرات این چند ثانیه قبل از watermark را هم دوباره می‌خواند؛ زمان ردیف‌ها موقع نوشتن
+# (نه commit) ثبت می‌شود، پس باید از طولانی‌ترین تراکنش نوشتن (مثلا ثبت یک برگه نمره) بیشتر باشد
+REPORTS_REFRESH_OVERLAP = int(os.environ.get("REPORTS_REFRESH_OVERLAP", "300"))
+
+# Metrics settings
+# آمار درخواست‌ها در /api/metrics/ (قالب Prometheus)؛ برای scrape بدون JWT هدر X-Metrics-Token
+
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_N_PLUS_ONE_THRESHOLD = 5
+# بودجه کوئری هر view (مسیر کامل کلاس)؛ None یعنی بدون محدودیت.
+# با METRICS_QUERY_BUDGET_STRICT=1 (مثلا هنگام اجرای تست‌ها) عبور از بودجه خطا می‌دهد.
+METRICS_QUERY_BUDGETS = {
+    "default": 10,
+    "api.views.BulkImportView": None,
+    # با Idempotency-Key دو کوئری بیشتر: INSERT رزرو کلید (با savepoint) و ذخیره پاسخ
+    "courses.views.CourseViewSet": 12,
+    "registration.views.EnrollmentListCreateView": 20,
+    # پیوستن به صف: بررسی صندلی و تکراری، UPDATE و خواندن شمارنده، insert با savepoint
+    "registration.views.WaitlistListCreateView": 12,
+    "grading.views.GradeSheetView": 12,
+    # تصمیم دسته‌ای: قفل و bulk_update درخواست‌ها، حذف دسته‌ای، upsert سقف واحد و یک notify برای هر گروه
+    "requests.views.PetitionDecisionView": 20,
+    # rotation: outstanding + blacklist get_or_create و توکن جدید، هر کدام با savepoint
+    "accounts.views.RefreshView": 14,
+}
+METRICS_QUERY_BUDGET_STRICT = os.environ.get("METRICS_QUERY_BUDGET_STRICT", "0") == "1"
@@ -9,7 +9,16 @@ urlpatterns = [
     path("admin/departments/", admin_departments, name="admin_departments"),
     path("admin/courses/", admin_courses, name="admin_courses"),
     
+    path("api/", include("api.urls")),
     path("api/accounts/", include("accounts.urls")),
     path("api/departments/", include("departments.urls")),
     path("api/courses/", include("courses.urls")),
+    path("api/terms/", include("terms.urls")),
+    path("api/offerings/", include("offerings.urls")),
+    path("api/registration/", include("registration.urls")),
+    path("api/grading/", include("grading.urls")),
+    path("api/requests/", include("requests.urls")),
+    path("api/reports/", include("reports.urls")),
+    path("api/notifications/", include("notifications.urls")),
+    path("api/async/", include("api.async_urls")),
 ]
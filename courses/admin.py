@@ -1,3 +1,17 @@
 from django.contrib import admin
+from .models import Course, Prerequisite
 
-# Register your models here.
+
+class PrerequisiteInline(admin.TabularInline):
+    model = Prerequisite
+    fk_name = "course"
+    extra = 0
+    raw_id_fields = ("required",)
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ("code", "title", "units")
+    search_fields = ("code", "title")
+    filter_horizontal = ("departments",)
+    inlines = [PrerequisiteInline]
@@ -0,0 +1,75 @@
+from base64 import b64decode, b64encode
+from urllib.parse import parse_qs, urlencode
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.utils.urls import replace_query_param
+
+from api.asynchronous import async_api_view, error_response
+from api.cache import COURSES, acached_response
+from api.serializers import values_columns, values_data
+from .filters import filter_courses
+from .models import Course
+from .pagination import CourseCursorPagination
+from .serializers import CourseSerializer
+
+
+# cursor همان قالب CourseCursorPagination است (base64 از "p=<code>")، پس لینک next هر دو مسیر
+# در دیگری هم معتبر است. این مسیر فقط رو به جلو صفحه‌بندی می‌کند (previous همیشه null).
+
+def decode_cursor(value):
+    try:
+        tokens = parse_qs(b64decode(value.encode("ascii")).decode("ascii"), keep_blank_values=True)
+    except (TypeError, ValueError):
+        return None
+    if "r" in tokens or "o" in tokens or "p" not in tokens:
+        return None
+    return tokens["p"][0]
+
+
+def encode_cursor(position):
+    return b64encode(urlencode({"p": position}).encode("ascii")).decode("ascii")
+
+
+def page_size(params):
+    pagination = CourseCursorPagination
+    value = params.get(pagination.page_size_query_param, "")
+    if value.isdigit() and int(value) > 0:
+        return min(int(value), pagination.max_page_size)
+    return pagination.page_size
+
+
+@async_api_view("admin")
+async def course_list(request):
+    position = None
+    if "cursor" in request.GET:
+        position = decode_cursor(request.GET["cursor"])
+        if position is None:
+            return error_response("Invalid cursor", 404)
+
+    async def build():
+        size = page_size(request.GET)
+        serializer = CourseSerializer(context={"request": request})
+        courses = filter_courses(Course.objects.order_by("code"), request.GET)
+        if position is not None:
+            courses = courses.filter(code__gt=position)
+
+        rows = courses.values(*values_columns(serializer), "code")[:size + 1]
+        page = [row async for row in rows.aiterator(chunk_size=size + 1)]
+        next_link = None
+        if len(page) > size:
+            page = page[:size]
+            next_link = replace_query_param(request.build_absolute_uri(), "cursor", encode_cursor(page[-1]["code"]))
+        results = await sync_to_async(values_data)(serializer, page)
+        return {"next": next_link, "previous": None, "results": results}
+
+    return await acached_response(request, COURSES, build)
+
+
+@async_api_view("admin")
+async def course_detail(request, pk):
+    try:
+        course = await Course.objects.prefetch_related("departments").aget(pk=pk)
+    except Course.DoesNotExist:
+        return error_response("No Course matches the given query.", 404)
+    return JsonResponse(CourseSerializer(course, context={"request": request}).data)
@@ -0,0 +1,23 @@
+from .search import code_prefix, title_contains
+
+
+def filter_courses(queryset, params):
+    """فیلترهای لیست درس (department, units, code, search)؛ مشترک بین view همگام و async."""
+    department = params.get("department")
+    if department and department.isdigit():
+        queryset = queryset.filter(departments__id=department)
+
+    units = params.get("units")
+    if units and units.isdigit():
+        queryset = queryset.filter(units=units)
+
+    # پیشوند کد بدون حساسیت به حروف روی ایندکس UPPER(code) اجرا می‌شود
+    code = params.get("code")
+    if code and code.strip():
+        queryset = code_prefix(queryset, code)
+
+    search = params.get("search")
+    if search and search.strip():
+        queryset = title_contains(queryset, search.strip())
+
+    return queryset
@@ -0,0 +1,68 @@
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from api import cache
+from api.bulk import BulkImporter
+from departments.models import Department
+from .models import Course
+
+
+class CourseImporter(BulkImporter):
+    """
+    ستون‌ها: code, title, units, departments — departments کدهای دانشکده جداشده با «|»
+    (یا آرایه در JSON). لینک‌های M2M هر chunk با یک DELETE و یک bulk_create روی جدول واسط نوشته می‌شوند.
+    """
+    model = Course
+    key_field = "code"
+    update_fields = ["title", "units", "updated_at"]
+    cache_namespaces = (cache.COURSES,)
+
+    def __init__(self):
+        self.department_ids = dict(Department.objects.values_list("code", "id"))
+
+    def build(self, row):
+        try:
+            units = int(row.get("units") or 0)
+        except (TypeError, ValueError):
+            raise ValidationError({"units": ["A valid integer is required."]})
+
+        codes = row.get("departments") or []
+        if isinstance(codes, str):
+            codes = [c.strip() for c in codes.split("|") if c.strip()]
+        unknown = [c for c in codes if c not in self.department_ids]
+        if unknown:
+            raise ValidationError({"departments": [f"Unknown department code(s): {', '.join(unknown)}"]})
+
+        course = Course(
+            code=(row.get("code") or "").strip(),
+            title=(row.get("title") or "").strip(),
+            units=units,
+            updated_at=timezone.now(),
+        )
+        course.department_ids = [self.department_ids[c] for c in codes]
+        return course
+
+    def check_chunk(self, items, report):
+        taken = dict(
+            Course.objects.filter(
+                title__in=[c.title for _, c in items]
+            ).values_list("title", "code")
+        )
+        valid, titles = [], set()
+        for number, course in items:
+            owner = taken.get(course.title)
+            if (owner is not None and owner != course.code) or course.title in titles:
+                report.add_error(number, {"title": ["A course with this title already exists."]})
+                continue
+            titles.add(course.title)
+            valid.append((number, course))
+        return valid
+
+    def after_write(self, items):
+        through = Course.departments.through
+        through.objects.filter(course_id__in=[c.pk for _, c in items]).delete()
+        through.objects.bulk_create(
+            through(course_id=course.pk, department_id=department_id)
+            for _, course in items
+            for department_id in course.department_ids
+        )
@@ -0,0 +1,82 @@
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from courses.models import Course
+from courses.search import search_courses, title_contains
+
+
+WORDS = [
+    "introduction", "advanced", "data", "structures", "algorithms", "systems", "calculus", "linear",
+    "algebra", "physics", "chemistry", "networks", "security", "databases", "compilers", "theory",
+    "statistics", "probability", "design", "analysis", "machine", "learning", "signals", "control",
+    "economics", "history", "literature", "organic", "quantum", "mechanics", "software", "engineering",
+]
+
+
+class Command(BaseCommand):
+    help = "Compare icontains scans with the course search index (FTS5 on SQLite, pg_trgm on Postgres)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=100_000)
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:4].upper()
+        rng = random.Random(42)
+        started = time.perf_counter()
+        Course.objects.bulk_create(
+            (Course(code=f"{tag}{i:06d}", title=f"{' '.join(rng.sample(WORDS, 3)).title()} {i}", units=i % 4 + 1)
+             for i in range(options["courses"])),
+            batch_size=5000,
+        )
+        self.stdout.write(
+            f"inserted {options['courses']} courses (index maintained by triggers) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+        courses = Course.objects.filter(code__startswith=tag)
+        try:
+            # (متن، توضیح): عبارت کم‌تکرار، کلمه پرتکرار، غلط املایی و پیشوند کد
+            for text, label in [
+                ("quantum mechanics", "rare phrase"), ("learn", "common word"),
+                ("algoritms", "typo"), (f"{tag}0012", "code prefix"),
+            ]:
+                matching = courses.filter(Q(code__icontains=text) | Q(title__icontains=text))
+                self.stdout.write(f"{text!r} ({label}):")
+                # رتبه‌بندی به همه ردیف‌های منطبق نیاز دارد؛ اولین ۲۰ ردیف به ترتیب کد فقط برای مقایسه
+                self.measure(
+                    "icontains all", options["rounds"], lambda: list(matching.values_list("pk", "code", "title")),
+                )
+                self.measure(
+                    "icontains first", options["rounds"],
+                    lambda: list(matching.order_by("code").values_list("pk", flat=True)[:20]),
+                )
+                self.measure("search_courses", options["rounds"], lambda: search_courses(text, 20))
+
+            # عبارت پرتکرار (صفحه اول زود پر می‌شود) و عنوان یکتا (icontains کل جدول را می‌خواند)
+            unique = courses.order_by("code").values_list("title", flat=True)[options["courses"] // 2]
+            for text in ("quantum mechanics", unique):
+                self.stdout.write(f"list filter ?search={text!r}, first page:")
+                self.measure(
+                    "title__icontains", options["rounds"],
+                    lambda: list(courses.filter(title__icontains=text).order_by("code").values_list("pk", flat=True)[:20]),
+                )
+                self.measure(
+                    "title_contains", options["rounds"],
+                    lambda: list(title_contains(courses, text).order_by("code").values_list("pk", flat=True)[:20]),
+                )
+        finally:
+            courses.delete()
+
+    def measure(self, label, rounds, run):
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            results = run()
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(f"  {label:<16} median={statistics.median(timings):7.1f} ms results={len(results)}")
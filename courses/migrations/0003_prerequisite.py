@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_units_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Prerequisite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('prerequisite', 'Prerequisite'), ('corequisite', 'Corequisite')], default='prerequisite', max_length=12)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='requirements', to='courses.course')),
+                ('required', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='required_by', to='courses.course')),
+            ],
+            options={
+                'ordering': ['course', 'required'],
+                'constraints': [models.UniqueConstraint(fields=('course', 'required'), name='unique_course_requirement'), models.CheckConstraint(condition=models.Q(('course', models.F('required')), _negated=True), name='requirement_not_self')],
+            },
+        ),
+    ]
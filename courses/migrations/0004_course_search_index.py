@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from courses.search import install_index
+
+    install_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from courses.search import drop_index
+
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    ایندکس جستجوی درس: جدول FTS5 (trigram) و triggerها روی SQLite، ایندکس GIN با pg_trgm روی Postgres
+    (اگر افزونه در دسترس باشد). تعریف SQL در courses.search است تا بعد از هر migrate هم بررسی شود.
+    """
+
+    dependencies = [
+        ("courses", "0003_prerequisite"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
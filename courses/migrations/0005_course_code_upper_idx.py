@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:52
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_search_index'),
+        ('departments', '0002_department_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(django.db.models.functions.text.Upper('code'), name='course_code_upper_idx'),
+        ),
+    ]
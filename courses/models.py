@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.exceptions import ValidationError
 
 
@@ -34,6 +35,11 @@ class Course(models.Model):
                 name="unique_course_title"
             )
         ]
+        indexes = [
+            models.Index(fields=["units"], name="course_units_idx"),
+            # جستجوی پیشوند کد بدون حساسیت به حروف (courses.search.code_prefix)
+            models.Index(Upper("code"), name="course_code_upper_idx"),
+        ]
 
     def clean(self):
         if not (1 <= self.units <= 4):
@@ -41,3 +47,42 @@ class Course(models.Model):
 
     def __str__(self):
         return f"{self.code} - {self.title}"
+
+
+class Prerequisite(models.Model):
+    """
+    یال گراف پیش‌نیاز: برای گرفتن course باید required قبلا گذرانده شده باشد (prerequisite)
+    یا قبلا/هم‌زمان گرفته شود (corequisite). گراف کامپایل‌شده در courses.prerequisites است.
+    """
+    PREREQUISITE = "prerequisite"
+    COREQUISITE = "corequisite"
+    KIND_CHOICES = [
+        (PREREQUISITE, "Prerequisite"),
+        (COREQUISITE, "Corequisite"),
+    ]
+
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="requirements")
+    required = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="required_by")
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES, default=PREREQUISITE)
+
+    class Meta:
+        ordering = ["course", "required"]
+        constraints = [
+            models.UniqueConstraint(fields=["course", "required"], name="unique_course_requirement"),
+            models.CheckConstraint(
+                condition=~models.Q(course=models.F("required")),
+                name="requirement_not_self",
+            ),
+        ]
+
+    def clean(self):
+        # برای فرم‌های ادمین؛ API از courses.prerequisites.add_requirement استفاده می‌کند
+        from .prerequisites import PrerequisiteGraph
+
+        if self.course_id and self.required_id and PrerequisiteGraph.load(exclude=self.pk).creates_cycle(
+            self.course_id, self.required_id, self.kind
+        ):
+            raise ValidationError("This requirement would create a prerequisite cycle.")
+
+    def __str__(self):
+        return f"{self.course} <- {self.required} ({self.kind})"
@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CourseCursorPagination(CursorPagination):
+    """
+    صفحه‌بندی cursor روی ستون یکتای code؛ هزینه هر صفحه مستقل از اندازه جدول است.
+    """
+    ordering = "code"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
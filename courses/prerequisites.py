@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Course, Prerequisite
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrerequisiteGraph:
+    """
+    گراف کامپایل‌شده پیش‌نیازها.
+
+    هر درس یک بیت دارد و برای هر درس سه mask (عدد صحیح پایتون) نگه داشته می‌شود: پیش‌نیازهای
+    مستقیم، هم‌نیازها و بستار متعدی پیش‌نیازها. بررسی یک درس در برابر مجموعه دروس گذرانده
+    دانشجو فقط چند عمل AND/NOT روی همین mask هاست.
+    """
+
+    def __init__(self, edges):
+        prerequisites = defaultdict(set)
+        corequisites = defaultdict(set)
+        for course_id, required_id, kind in edges:
+            (prerequisites if kind == Prerequisite.PREREQUISITE else corequisites)[course_id].add(required_id)
+
+        self.ids = sorted({i for e in (prerequisites, corequisites) for c, r in e.items() for i in (c, *r)})
+        self.bits = {course_id: 1 << i for i, course_id in enumerate(self.ids)}
+        self.prerequisites = {c: self.mask(r) for c, r in prerequisites.items()}
+        self.corequisites = {c: self.mask(r) for c, r in corequisites.items()}
+        self.cycles = []
+        self.closure = self._closure(prerequisites)
+
+    @classmethod
+    def load(cls, exclude=None):
+        edges = Prerequisite.objects.exclude(pk=exclude) if exclude else Prerequisite.objects.all()
+        return cls(edges.values_list("course_id", "required_id", "kind").order_by())
+
+    def _closure(self, prerequisites):
+        """بستار متعدی با DFS تکراری و memo؛ یال برگشتی (چرخه) ثبت و نادیده گرفته می‌شود."""
+        closure = {}
+        visiting = set()
+        for root in prerequisites:
+            if root in closure:
+                continue
+            stack = [(root, iter(prerequisites.get(root, ())))]
+            visiting.add(root)
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    visiting.discard(node)
+                    mask = 0
+                    for required in prerequisites.get(node, ()):
+                        if required not in visiting:
+                            mask |= self.bits[required] | closure.get(required, 0)
+                    closure[node] = mask
+                elif child in visiting:
+                    self.cycles.append((node, child))
+                elif child not in closure:
+                    visiting.add(child)
+                    stack.append((child, iter(prerequisites.get(child, ()))))
+        return closure
+
+    def mask(self, course_ids):
+        bits = self.bits
+        mask = 0
+        for course_id in course_ids:
+            mask |= bits.get(course_id, 0)
+        return mask
+
+    def course_ids(self, mask):
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(self.ids[low.bit_length() - 1])
+            mask ^= low
+        return ids
+
+    def requires(self, course_id, required_id):
+        """آیا required_id (مستقیم یا غیرمستقیم) پیش‌نیاز course_id است."""
+        return bool(self.closure.get(course_id, 0) & self.bits.get(required_id, 0))
+
+    def creates_cycle(self, course_id, required_id, kind):
+        """
+        آیا یال جدید course -> required گرفتن course را ناممکن می‌کند: required (غیرمستقیم) به course
+        نیاز دارد، یا برای پیش‌نیاز، course هم‌نیاز درسی است که باید قبل از آن گذرانده شود.
+        """
+        if course_id == required_id or self.requires(required_id, course_id):
+            return True
+        if kind == Prerequisite.PREREQUISITE:
+            bit = self.bits.get(course_id, 0)
+            before = self.bits.get(required_id, 0) | self.closure.get(required_id, 0)
+            return any(self.corequisites.get(other, 0) & bit for other in self.course_ids(before))
+        return False
+
+    def check(self, course_ids, passed_ids, concurrent_ids=()):
+        """
+        شرایط گرفتن چند درس در یک فراخوانی.
+
+        passed_ids: دروس گذرانده؛ concurrent_ids: دروسی که هم‌زمان گرفته شده‌اند (هم‌نیازها با آن‌ها
+        یا با دروس همین درخواست برآورده می‌شوند). خروجی برای هر درس: eligible، پیش‌نیازها و
+        هم‌نیازهای مستقیم ناقص و remaining (همه پیش‌نیازهای متعدی گذرانده‌نشده).
+        """
+        course_ids = list(course_ids)
+        passed = self.mask(passed_ids)
+        available = passed | self.mask(concurrent_ids) | self.mask(course_ids)
+
+        results = []
+        for course_id in course_ids:
+            missing = self.prerequisites.get(course_id, 0) & ~passed
+            missing_co = self.corequisites.get(course_id, 0) & ~available
+            remaining = self.closure.get(course_id, 0) & ~passed
+            results.append({
+                "course": course_id,
+                "eligible": not (missing or missing_co),
+                "missing_prerequisites": self.course_ids(missing),
+                "missing_corequisites": self.course_ids(missing_co),
+                "remaining": self.course_ids(remaining),
+            })
+        return results
+
+
+class CompiledGraph:
+    """
+    گراف کامپایل‌شده درون‌پروسه؛ با تغییر یال‌ها در همین پروسه بی‌اعتبار می‌شود و پروسه‌های دیگر
+    حداکثر بعد از ttl ثانیه آن را دوباره می‌سازند.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._graph = None
+        self._expires_at = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._graph is not None and self._expires_at > now:
+                return self._graph
+            generation = self._generation
+
+        graph = PrerequisiteGraph.load()
+        if graph.cycles:
+            logger.error("Prerequisite cycles ignored: %s", graph.cycles)
+        with self._lock:
+            if generation == self._generation:
+                self._graph, self._expires_at = graph, now + self.ttl
+        return graph
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._graph = None
+
+
+prerequisite_graph = CompiledGraph(ttl=getattr(settings, "PREREQUISITE_GRAPH_TTL", 60))
+
+
+@receiver([post_save, post_delete], sender=Prerequisite)
+def _prerequisites_changed(sender, **kwargs):
+    prerequisite_graph.invalidate()
+    transaction.on_commit(prerequisite_graph.invalidate)
+
+
+def add_requirement(course, required, kind=Prerequisite.PREREQUISITE):
+    """
+    یال جدید با بررسی چرخه روی گراف تازه (نه نسخه کش‌شده)؛ در صورت چرخه ValidationError.
+    ردیف دو درس قفل می‌شوند تا دو درخواست هم‌زمان روی همین جفت چرخه نسازند.
+    """
+    with transaction.atomic():
+        list(Course.objects.select_for_update().filter(pk__in=[course.pk, required.pk]))
+        graph = PrerequisiteGraph.load()
+        if graph.creates_cycle(course.pk, required.pk, kind):
+            raise ValidationError(f"{required.code} already requires {course.code}; this would create a cycle.")
+        if Prerequisite.objects.filter(course=course, required=required).exists():
+            raise ValidationError(f"{course.code} already has a requirement on {required.code}.")
+        return Prerequisite.objects.create(course=course, required=required, kind=kind)
+
+
+def course_history(student_id):
+    """(دروس گذرانده، دروس در حال گذراندن) دانشجو با یک کوئری."""
+    from grading.models import PASSING_GRADE
+    from registration.models import Enrollment
+
+    passed, current = set(), set()
+    for course_id, grade in Enrollment.objects.filter(
+        student_id=student_id, status=Enrollment.ENROLLED
+    ).values_list("offering__course_id", "grade__value"):
+        if grade is None:
+            current.add(course_id)
+        elif grade >= PASSING_GRADE:
+            passed.add(course_id)
+    return passed, current
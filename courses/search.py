@@ -0,0 +1,248 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Upper
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .models import Course
+
+
+# ایندکس جستجو: روی SQLite جدول مجازی FTS5 با tokenizer سه‌حرفی که triggerها آن را با جدول درس
+# هم‌گام نگه می‌دارند (bulk_create و update() هم پوشش داده می‌شوند)؛ روی Postgres ایندکس GIN با pg_trgm.
+FTS_TABLE = "courses_course_fts"
+INDEX_MIGRATION = "0004_course_search_index"
+MIN_SUBSTRING = 3     # کوتاه‌تر از یک trigram فقط با پیشوند کد جستجو می‌شود
+MIN_SIMILARITY = 0.3  # مثل آستانه پیش‌فرض pg_trgm
+WORD = re.compile(r"\w+")
+
+SQLITE_INDEX = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "code, title, content='courses_course', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON courses_course BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, code, title) VALUES (new.id, new.code, new.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON courses_course BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, code, title) VALUES ('delete', old.id, old.code, old.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF code, title ON courses_course BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, code, title) VALUES ('delete', old.id, old.code, old.title); "
+    f"INSERT INTO {FTS_TABLE}(rowid, code, title) VALUES (new.id, new.code, new.title); END",
+]
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_INDEX = [
+    "CREATE INDEX IF NOT EXISTS course_code_trgm_idx ON courses_course USING gin (code gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS course_title_trgm_idx ON courses_course USING gin (title gin_trgm_ops)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS course_code_trgm_idx",
+    "DROP INDEX IF EXISTS course_title_trgm_idx",
+]
+
+
+def install_index(connection):
+    """ساخت ایندکس جستجو (idempotent)؛ در migration و بعد از هر migrate صدا زده می‌شود."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f"{FTS_TABLE}_a_"]
+            )
+            if cursor.fetchone()[0] == 3:
+                return
+            # بازسازی جدول درس در migrationهای SQLite triggerها را حذف می‌کند؛ ایندکس از نو ساخته می‌شود
+            for sql in SQLITE_INDEX:
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == "postgresql":
+            cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            if cursor.fetchone() is None:
+                return
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for sql in POSTGRES_INDEX:
+                cursor.execute(sql)
+
+
+def drop_index(connection):
+    with connection.cursor() as cursor:
+        for sql in {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}.get(connection.vendor, []):
+            cursor.execute(sql)
+
+
+@receiver(post_migrate)
+def _ensure_index(sender, app_config=None, using="default", **kwargs):
+    if app_config is None or app_config.label != "courses":
+        return
+    from django.db.migrations.recorder import MigrationRecorder
+
+    connection = connections[using]
+    if ("courses", INDEX_MIGRATION) in MigrationRecorder(connection).applied_migrations():
+        install_index(connection)
+
+
+_trigram = {}
+
+
+def has_trigram():
+    """آیا pg_trgm روی این پایگاه‌داده نصب است (یک بار برای هر پروسه بررسی می‌شود)."""
+    if connection.vendor != "postgresql":
+        return False
+    if connection.alias not in _trigram:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram[connection.alias] = cursor.fetchone() is not None
+    return _trigram[connection.alias]
+
+
+# ---------- matching ----------
+
+def _phrase(text):
+    """عبارت FTS5؛ با tokenizer سه‌حرفی هر عبارت یعنی «زیررشته»."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def trigrams(text):
+    """مجموعه trigramهای هر کلمه با حاشیه، به روش pg_trgm."""
+    grams = set()
+    for word in WORD.findall(text.lower()):
+        grams.update(_word_trigrams(word))
+    return grams
+
+
+def _word_trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def scorer(text):
+    """
+    تابع امتیاز (code, title) برای متن جستجو: بیشترین شباهت با کد یا با یک دنباله هم‌طول از کلمات
+    عنوان (مثل word_similarity در pg_trgm)؛ عنوان بلند با کلمه درست ولی غلط املایی هم امتیاز می‌گیرد.
+    """
+    query = trigrams(text)
+    size = max(len(WORD.findall(text)), 1)
+
+    def score(code, title):
+        words = [_word_trigrams(w) for w in WORD.findall(title.lower())]
+        best = _jaccard(query, trigrams(code))
+        for i in range(max(len(words) - size + 1, 1)):
+            best = max(best, _jaccard(query, set().union(*words[i:i + size])))
+        return best
+
+    return score
+
+
+def code_prefix(queryset, prefix):
+    """
+    فیلتر پیشوند کد بدون حساسیت به حروف (مثل icontains قبلی برای کدهای ذخیره‌شده با حروف کوچک).
+    LIKE با ESCAPE در SQLite از ایندکس استفاده نمی‌کند، پس آنجا به بازه UPPER(code) >= prefix و
+    < prefix بعدی روی ایندکس course_code_upper_idx تبدیل می‌شود. UPPER در SQLite فقط حروف ASCII را
+    تغییر می‌دهد؛ پیشوند غیر ASCII همان istartswith است.
+    """
+    prefix = prefix.strip()
+    if connection.vendor != "sqlite" or not prefix or not prefix.isascii():
+        return queryset.filter(code__istartswith=prefix)
+    prefix = prefix.upper()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return queryset.alias(code_upper=Upper("code")).filter(code_upper__gte=prefix, code_upper__lt=upper)
+
+
+def title_contains(queryset, text):
+    """
+    معادل title__icontains که روی ایندکس اجرا می‌شود (فیلتر search لیست درس‌ها).
+    متن کوتاه‌تر از یک trigram، یا پایگاه‌داده بدون ایندکس، همان icontains است.
+    """
+    if connection.vendor == "sqlite" and len(text) >= MIN_SUBSTRING:
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", ["title : " + _phrase(text)]
+        ))
+    # روی Postgres همین ILIKE از ایندکس GIN trigram استفاده می‌کند
+    return queryset.filter(title__icontains=text)
+
+
+def _substring_ids(text, limit):
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [_phrase(text), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+    # ILIKE روی ایندکس GIN trigram؛ ترتیب نهایی در search_courses
+    return list(
+        Course.objects.filter(Q(code__icontains=text) | Q(title__icontains=text))
+        .order_by().values_list("pk", flat=True)[:limit]
+    )
+
+
+def _fuzzy_ids(text, limit):
+    """نامزدهای جستجوی تقریبی (غلط املایی)؛ رتبه نهایی با similarity در پایتون."""
+    if connection.vendor == "sqlite":
+        # هر trigram درون کلمات؛ ردیف‌هایی که trigramهای بیشتری دارند رتبه bm25 بهتری می‌گیرند
+        grams = {g for g in trigrams(text) if " " not in g}
+        if not grams:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [" OR ".join(_phrase(g) for g in sorted(grams)), limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+    if has_trigram():
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return list(
+            Course.objects.filter(Q(title__trigram_word_similar=text) | Q(code__trigram_similar=text))
+            .annotate(similarity=TrigramWordSimilarity(text, "title"))
+            .order_by("-similarity").values_list("pk", flat=True)[:limit]
+        )
+    return []
+
+
+def search_courses(text, limit=20):
+    """
+    جستجوی رتبه‌بندی‌شده درس با کد یا عنوان ناقص: [(course_id, rank), ...].
+
+    ترتیب: پیشوند کد (ایندکس یکتای code)، سپس زیررشته کد یا عنوان، سپس تطبیق تقریبی؛ در هر گروه
+    بر اساس شباهت trigram. تطبیق تقریبی فقط وقتی اجرا می‌شود که دو مرحله قبل کمتر از limit نتیجه داده باشند.
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    # ترتیب همان ایندکس UPPER(code)، تا limit ردیف اول بدون مرتب‌سازی همه پیشوندها خوانده شود
+    prefixed = code_prefix(Course.objects.alias(code_upper=Upper("code")), text).order_by("code_upper")
+    tiers = [list(prefixed.values_list("pk", flat=True)[:limit])]
+    if len(text) >= MIN_SUBSTRING:
+        # چند برابر limit نامزد، تا مرتب‌سازی نهایی بر اساس شباهت روی مجموعه بزرگ‌تری انجام شود
+        tiers.append(_substring_ids(text, limit * 5))
+        if len({pk for tier in tiers for pk in tier}) < limit:
+            tiers.append(_fuzzy_ids(text, limit * 5))
+
+    ids = {pk for tier in tiers for pk in tier}
+    rows = {pk: (code, title) for pk, code, title in Course.objects.filter(pk__in=ids).values_list("pk", "code", "title")}
+
+    score = scorer(text)
+    seen, results = set(), []
+    for level, tier in enumerate(tiers):
+        scored = []
+        for pk in tier:
+            if pk in seen or pk not in rows:
+                continue
+            seen.add(pk)
+            code, title = rows[pk]
+            value = score(code, title)
+            if level < 2 or value >= MIN_SIMILARITY:
+                scored.append((pk, code, value))
+        scored.sort(key=lambda row: (-row[2], row[1]))
+        # رتبه گروه اول در [2, 3]، دوم در [1, 2] و سوم در [0, 1]
+        results += [(pk, round(2 - level + value, 4)) for pk, _, value in scored]
+    return results[:limit]
@@ -1,15 +1,54 @@
 # courses/serializers.py
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from .models import Course
+from api.serializers import SparseFieldsetMixin
+from .models import Course, Prerequisite
+from .prerequisites import add_requirement
 from departments.models import Department
+from departments.serializers import DepartmentSerializer
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     departments = serializers.PrimaryKeyRelatedField(
         queryset=Department.objects.all(),
         many=True,
         required=False
     )
 
+    expandable_fields = {"departments": DepartmentSerializer}
+
     class Meta:
         model = Course
         fields = ["id", "code", "title", "units", "departments", "created_at", "updated_at"]
+
+
+class PrerequisiteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Prerequisite
+        fields = ["id", "course", "required", "kind"]
+        # یکتایی و چرخه در add_requirement بررسی می‌شوند
+        validators = []
+
+    def create(self, validated_data):
+        try:
+            return add_requirement(**validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({"non_field_errors": e.messages})
+
+
+class EligibilityQuerySerializer(serializers.Serializer):
+    courses = serializers.CharField()
+    student = serializers.IntegerField(required=False)
+
+    def validate_courses(self, value):
+        try:
+            ids = [int(i) for i in value.split(",") if i.strip()]
+        except ValueError:
+            raise serializers.ValidationError("courses must be a comma separated id list")
+        if not ids or len(ids) > 500:
+            raise serializers.ValidationError("Between 1 and 500 course ids are allowed.")
+        return ids
+
+
+class CourseSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=20)
@@ -1,3 +1,386 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.test import AsyncClient, RequestFactory, TestCase
+from rest_framework.request import Request
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from api.cache import reference_cache
+from api.serializers import values_columns, values_data
+from departments.models import Department
+from .models import Course, Prerequisite
+from .prerequisites import PrerequisiteGraph, add_requirement, prerequisite_graph
+from .search import code_prefix, search_courses
+from .serializers import CourseSerializer
+
+
+class CourseListTests(TestCase):
+    url = "/api/courses/"
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.admin)}"
+        self.math = Department.objects.create(name="Mathematics", code="MATH")
+        self.cs = Department.objects.create(name="Computer Science", code="CS")
+
+    def create_courses(self, count, prefix="C"):
+        for i in range(count):
+            course = Course.objects.create(
+                code=f"{prefix}{i:04d}", title=f"{prefix} Course {i}", units=(i % 4) + 1
+            )
+            course.departments.set([self.math, self.cs] if i % 2 else [self.math])
+
+    def test_list_is_cursor_paginated(self):
+        self.create_courses(5)
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+        codes = [c["code"] for c in response.data["results"]]
+        response = self.client.get(response.data["next"])
+        codes += [c["code"] for c in response.data["results"]]
+        self.assertEqual(codes, ["C0000", "C0001", "C0002", "C0003"])
+
+    def test_list_query_count_is_constant(self):
+        # user lookup + page + prefetched departments
+        self.create_courses(3)
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+
+        self.create_courses(40, prefix="D")
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"page_size": 40})
+        self.assertEqual(len(response.data["results"]), 40)
+
+    def test_filters(self):
+        self.create_courses(6)
+        Course.objects.create(code="PHY101", title="Physics", units=3)
+
+        response = self.client.get(self.url, {"department": self.cs.id})
+        self.assertEqual([c["code"] for c in response.data["results"]], ["C0001", "C0003", "C0005"])
+
+        response = self.client.get(self.url, {"units": 3})
+        self.assertEqual([c["code"] for c in response.data["results"]], ["C0002", "PHY101"])
+
+        response = self.client.get(self.url, {"code": "phy"})
+        self.assertEqual([c["code"] for c in response.data["results"]], ["PHY101"])
+
+        response = self.client.get(self.url, {"search": "course 4"})
+        self.assertEqual([c["code"] for c in response.data["results"]], ["C0004"])
+
+
+    def test_sparse_fields_and_expand(self):
+        self.create_courses(2)
+        response = self.client.get(self.url, {"fields": "code,units"})
+        self.assertEqual(response.data["results"], [{"code": "C0000", "units": 1}, {"code": "C0001", "units": 2}])
+
+        response = self.client.get(self.url, {"fields": "code,departments", "expand": "departments"})
+        self.assertEqual(response.data["results"][1], {"code": "C0001", "departments": [
+            {"id": self.cs.id, "name": "Computer Science", "code": "CS"},
+            {"id": self.math.id, "name": "Mathematics", "code": "MATH"},
+        ]})
+
+        course = Course.objects.get(code="C0001")
+        response = self.client.get(f"{self.url}{course.pk}/", {"fields": "id,departments", "expand": "departments"})
+        self.assertEqual(response.data["departments"][0]["code"], "CS")
+
+    def test_fields_param_does_not_affect_writes(self):
+        response = self.client.post(
+            f"{self.url}?fields=code", {"code": "W1", "title": "Write", "units": 2, "departments": [self.cs.id]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(list(Course.objects.get(code="W1").departments.all()), [self.cs])
+
+    def test_values_path_matches_model_serializer(self):
+        self.create_courses(6)
+        Course.objects.create(code="PHY101", title="Physics", units=3)
+        queryset = Course.objects.order_by("code")
+        for params in ({}, {"expand": "departments"}, {"fields": "id,created_at"}):
+            request = RequestFactory().get(self.url, params)
+            context = {"request": Request(request)}
+            serializer = CourseSerializer(context=context)
+            expected = CourseSerializer(queryset.prefetch_related("departments"), many=True, context=context).data
+            self.assertEqual(values_data(serializer, list(queryset.values(*values_columns(serializer)))), expected)
+
+
+class CourseExportTests(TestCase):
+    url = "/api/courses/export/"
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.admin)}"
+        math = Department.objects.create(name="Mathematics", code="MATH")
+        cs = Department.objects.create(name="Computer Science", code="CS")
+        Course.objects.create(code="CS101", title="Intro", units=3).departments.set([math, cs])
+        Course.objects.create(code="MA101", title="Calculus", units=4)
+
+    def test_csv_export_streams_one_row_per_course(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("courses.csv", response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8-sig")
+        self.assertEqual(body.splitlines(), [
+            "code,title,units,departments",
+            "CS101,Intro,3,CS|MATH",
+            "MA101,Calculus,4,",
+        ])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(self.url, {"file_format": "pdf"})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncCourseReadTests(TestCase):
+    url = "/api/async/courses/"
+
+    def setUp(self):
+        reference_cache().clear()
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        self.student = User.objects.create_user(username="student", role="student")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.admin)}"
+        self.async_client = AsyncClient(AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}")
+        math = Department.objects.create(name="Mathematics", code="MATH")
+        cs = Department.objects.create(name="Computer Science", code="CS")
+        for i in range(5):
+            course = Course.objects.create(code=f"C{i:04d}", title=f"Course {i}", units=(i % 4) + 1)
+            course.departments.set([math, cs] if i % 2 else [math])
+
+    async def test_list_matches_sync_endpoint(self):
+        response = await self.async_client.get(self.url, {"page_size": 2, "units": 2})
+        expected = await sync_to_async(self.client.get)("/api/courses/", {"page_size": 2, "units": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], expected.json()["results"])
+
+    async def test_next_link_walks_all_pages(self):
+        codes = []
+        url = self.url + "?page_size=2"
+        while url:
+            data = (await self.async_client.get(url)).json()
+            codes += [c["code"] for c in data["results"]]
+            url = data["next"]
+            self.assertIsNone(data["previous"])
+        self.assertEqual(codes, [f"C{i:04d}" for i in range(5)])
+
+    async def test_invalid_cursor_is_404(self):
+        response = await self.async_client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    async def test_etag_returns_not_modified(self):
+        response = await self.async_client.get(self.url)
+        again = await self.async_client.get(self.url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+    async def test_detail_and_missing(self):
+        course = await Course.objects.aget(code="C0001")
+        response = await self.async_client.get(f"{self.url}{course.pk}/")
+        expected = await sync_to_async(self.client.get)(f"/api/courses/{course.pk}/")
+        self.assertEqual(response.json(), expected.json())
+        response = await self.async_client.get(f"{self.url}999999/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_auth_role_and_method_errors(self):
+        self.assertEqual((await AsyncClient().get(self.url)).status_code, 401)
+
+        token = await sync_to_async(AccessToken.for_user)(self.student)
+        client = AsyncClient(AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual((await client.get(self.url)).status_code, 403)
+
+        response = await client.post(self.url)
+        self.assertEqual(response.status_code, 405)
+
+
+class CourseSearchTests(TestCase):
+    url = "/api/courses/search/"
+
+    def setUp(self):
+        reference_cache().clear()
+        Course.objects.bulk_create([
+            Course(code="CS101", title="Introduction to Programming", units=3),
+            Course(code="CS201", title="Data Structures", units=3),
+            Course(code="CS301", title="Design of Algorithms", units=3),
+            Course(code="MA101", title="Calculus I", units=3),
+            Course(code="PH101", title="Physics of Computing Systems", units=2),
+        ])
+        student = User.objects.create_user(username="s1", role="student", student_id="s1")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(student)}"
+
+    def codes(self, text, **kwargs):
+        ids = [pk for pk, _ in search_courses(text, **kwargs)]
+        codes = dict(Course.objects.filter(pk__in=ids).values_list("pk", "code"))
+        return [codes[pk] for pk in ids]
+
+    def test_ranking(self):
+        # پیشوند کد، بعد زیررشته عنوان
+        self.assertEqual(self.codes("cs"), ["CS101", "CS201", "CS301"])
+        self.assertEqual(self.codes("comput"), ["PH101"])
+        self.assertEqual(self.codes("101"), ["CS101", "MA101", "PH101"])
+        # غلط املایی
+        self.assertEqual(self.codes("algoritms"), ["CS301"])
+        self.assertEqual(self.codes("zzzz"), [])
+        self.assertEqual(self.codes("cs", limit=2), ["CS101", "CS201"])
+
+    def test_index_follows_every_kind_of_write(self):
+        Course.objects.filter(code="MA101").update(title="Linear Algebra")
+        course = Course.objects.create(code="CS401", title="Compilers", units=3)
+        self.assertEqual(self.codes("algebra"), ["MA101"])
+        self.assertEqual(self.codes("calculus"), [])
+        self.assertEqual(self.codes("compilers"), ["CS401"])
+        course.delete()
+        self.assertEqual(self.codes("compilers"), [])
+
+    def test_list_search_matches_icontains(self):
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+        for text in ("OF", "ign of", "da", "Systems"):
+            response = self.client.get("/api/courses/", {"search": text})
+            expected = list(Course.objects.filter(title__icontains=text).order_by("code").values_list("code", flat=True))
+            self.assertEqual([c["code"] for c in response.data["results"]], expected)
+        response = self.client.get("/api/courses/", {"code": "cs2"})
+        self.assertEqual([c["code"] for c in response.data["results"]], ["CS201"])
+
+    def test_code_prefix_ignores_stored_case(self):
+        Course.objects.create(code="cs250", title="Lowercase Code", units=3)
+        Course.objects.create(code="Cs260", title="Mixed Case Code", units=3)
+        expected = ["CS201", "cs250", "Cs260"]
+        self.assertCountEqual(code_prefix(Course.objects.all(), "cs2").values_list("code", flat=True), expected)
+        self.assertCountEqual(self.codes("CS2"), expected)
+
+    def test_endpoint(self):
+        response = self.client.get(self.url, {"q": "struct", "fields": "id,code"})
+        self.assertEqual(response.status_code, 200)
+        [result] = response.data["results"]
+        self.assertEqual(set(result), {"id", "code", "rank"})
+        self.assertEqual(result["code"], "CS201")
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"q": "cs", "limit": 500}).status_code, 400)
+
+
+class PrerequisiteGraphTests(TestCase):
+    def setUp(self):
+        prerequisite_graph.invalidate()
+        self.a, self.b, self.c, self.d, self.e = (
+            Course.objects.create(code=code, title=code, units=3) for code in ("A1", "B1", "C1", "D1", "E1")
+        )
+        # C <- B <- A و D هم‌نیاز E
+        add_requirement(self.b, self.a)
+        add_requirement(self.c, self.b)
+        add_requirement(self.d, self.e, Prerequisite.COREQUISITE)
+
+    def test_check_uses_transitive_closure(self):
+        graph = PrerequisiteGraph.load()
+        self.assertTrue(graph.requires(self.c.pk, self.a.pk))
+        self.assertFalse(graph.requires(self.a.pk, self.c.pk))
+
+        b, c, d = graph.check([self.b.pk, self.c.pk, self.d.pk], passed_ids=[self.a.pk])
+        self.assertTrue(b["eligible"])
+        self.assertEqual((c["missing_prerequisites"], c["remaining"]), ([self.b.pk], [self.b.pk]))
+        self.assertEqual(d["missing_corequisites"], [self.e.pk])
+
+        # هم‌نیاز با دروس همین درخواست یا دروس در حال گذراندن برآورده می‌شود
+        self.assertTrue(graph.check([self.d.pk, self.e.pk], [])[0]["eligible"])
+        self.assertTrue(graph.check([self.d.pk], [], concurrent_ids=[self.e.pk])[0]["eligible"])
+        self.assertEqual(graph.check([self.c.pk], [])[0]["remaining"], [self.a.pk, self.b.pk])
+
+    def test_cycles_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            add_requirement(self.a, self.c)
+        with self.assertRaises(ValidationError):
+            add_requirement(self.a, self.c, Prerequisite.COREQUISITE)
+        # E پیش‌نیاز D باشد در حالی که هم‌زمان با آن گرفته می‌شود: هیچ‌وقت قابل گرفتن نیست
+        with self.assertRaises(ValidationError):
+            add_requirement(self.e, self.d)
+        with self.assertRaises(ValidationError):
+            add_requirement(self.b, self.a)
+        self.assertEqual(Prerequisite.objects.count(), 3)
+
+    def test_compile_tolerates_existing_cycle(self):
+        Prerequisite.objects.create(course=self.a, required=self.c)
+        graph = PrerequisiteGraph.load()
+        self.assertEqual(len(graph.cycles), 1)
+        # یال برگشتی نادیده گرفته می‌شود ولی پیش‌نیازهای مستقیم همچنان بررسی می‌شوند
+        self.assertTrue(graph.check([self.c.pk], [self.b.pk])[0]["eligible"])
+        self.assertFalse(graph.check([self.a.pk], [])[0]["eligible"])
+
+    def test_cached_graph_follows_edge_changes(self):
+        self.assertTrue(prerequisite_graph.get().check([self.b.pk], [self.a.pk])[0]["eligible"])
+        with self.assertNumQueries(0):
+            prerequisite_graph.get()
+        add_requirement(self.b, self.e)
+        self.assertFalse(prerequisite_graph.get().check([self.b.pk], [self.a.pk])[0]["eligible"])
+        Prerequisite.objects.filter(course=self.b).delete()
+        self.assertTrue(prerequisite_graph.get().check([self.b.pk], [])[0]["eligible"])
+
+
+class EligibilityApiTests(TestCase):
+    def setUp(self):
+        from grading.models import Grade
+        from registration.services import enroll
+        from registration.tests import make_offering, make_student
+
+        prerequisite_graph.invalidate()
+        reference_cache().clear()
+        passed, current = make_offering("A1"), make_offering("E1")
+        self.a, self.e = passed.course, current.course
+        self.b = Course.objects.create(code="B1", title="B1", units=3)
+        self.d = Course.objects.create(code="D1", title="D1", units=3)
+        add_requirement(self.b, self.a)
+        add_requirement(self.d, self.b)
+        add_requirement(self.d, self.e, Prerequisite.COREQUISITE)
+
+        self.student = make_student("s1")
+        Grade.objects.create(enrollment=enroll(self.student, passed), value=Decimal("15"))
+        enroll(self.student, current)
+        self.admin = User.objects.create_user(username="admin", role="admin")
+
+    def login(self, user):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(user)}"
+
+    def test_student_checks_own_eligibility(self):
+        self.login(self.student)
+        response = self.client.get("/api/courses/eligibility/", {"courses": f"{self.b.pk},{self.d.pk}"})
+        self.assertEqual(response.status_code, 200)
+        b, d = response.data["results"]
+        self.assertTrue(b["eligible"])
+        self.assertEqual((d["missing_prerequisites"], d["missing_corequisites"]), ([self.b.pk], []))
+
+        other = User.objects.create_user(username="s2", role="student", student_id="s2")
+        response = self.client.get("/api/courses/eligibility/", {"courses": self.b.pk, "student": other.pk})
+        self.assertEqual(response.status_code, 403)
+
+    def test_admin_must_name_the_student(self):
+        self.login(self.admin)
+        url = "/api/courses/eligibility/"
+        self.assertEqual(self.client.get(url, {"courses": self.b.pk}).status_code, 400)
+        response = self.client.get(url, {"courses": self.b.pk, "student": self.student.pk})
+        self.assertTrue(response.data["results"][0]["eligible"])
+
+        professor = User.objects.create_user(username="p1", role="professor", professor_id="p1")
+        self.login(professor)
+        self.assertEqual(self.client.get(url, {"courses": self.b.pk}).status_code, 403)
+
+    def test_query_count_does_not_depend_on_course_count(self):
+        self.login(self.student)
+        ids = ",".join(str(pk) for pk in Course.objects.values_list("pk", flat=True))
+        prerequisite_graph.get()
+        # کاربر + سابقه دانشجو
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/courses/eligibility/", {"courses": ids})
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_cycle_is_rejected_by_the_api(self):
+        self.login(self.admin)
+        url = "/api/courses/prerequisites/"
+        response = self.client.post(url, {"course": self.a.pk, "required": self.d.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(url, {"course": self.e.pk, "required": self.a.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.client.get(url, {"course": self.e.pk}).data), 1)
+
+        self.login(self.student)
+        response = self.client.post(url, {"course": self.b.pk, "required": self.e.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 403)
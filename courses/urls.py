@@ -1,7 +1,9 @@
 from rest_framework.routers import DefaultRouter
-from .views import CourseViewSet
+from .views import CourseViewSet, PrerequisiteViewSet
 
 router = DefaultRouter()
+# قبل از CourseViewSet تا مسیر جزئیات درس (<pk>/) آن را نگیرد
+router.register("prerequisites", PrerequisiteViewSet, basename="prerequisites")
 router.register("", CourseViewSet, basename="courses")
 
 urlpatterns = router.urls
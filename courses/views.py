@@ -1,21 +1,141 @@
-from rest_framework import viewsets
+from itertools import groupby
+
+from rest_framework import mixins, status, viewsets
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.response import Response
 from accounts.permissions import IsAdmin
-from .models import Course
-from .serializers import CourseSerializer
+from api.cache import COURSES, ReferenceCacheMixin, cached_response
+from api.export import export_response, requested_format
+from api.idempotency import IdempotentMixin
+from api.serializers import values_columns, values_data
+from .filters import filter_courses
+from departments.permissions import IsAdminOrReadOnly
+from .models import Course, Prerequisite
+from .pagination import CourseCursorPagination
+from .prerequisites import course_history, prerequisite_graph
+from .search import search_courses
+from .serializers import (
+    CourseSearchQuerySerializer, CourseSerializer, EligibilityQuerySerializer, PrerequisiteSerializer,
+)
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+class CourseViewSet(IdempotentMixin, ReferenceCacheMixin, viewsets.ModelViewSet):
+    cache_namespace = COURSES
+    queryset = Course.objects.prefetch_related("departments")
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = CourseCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        return filter_courses(queryset, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        """
+        لیست از مسیر سریع values_data ساخته می‌شود (خروجی همان CourseSerializer است، با ?fields= و
+        ?expand=)؛ cursor pagination روی dict ها هم کار می‌کند.
+        """
+        def build():
+            serializer = self.get_serializer()
+            queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+            page = self.paginate_queryset(queryset.values(*values_columns(serializer), "code"))
+            return self.get_paginated_response(values_data(serializer, page)).data
+
+        return cached_response(request, self.cache_namespace, build)
 
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdmin])
     def units_choices(self, request):
         """
         برگرداندن لیست انتخابیِ تعداد واحدها برای استفاده در فرانت‌اند.
         """
-        units_field = Course._meta.get_field("units")
-        choices = [{"value": value, "label": str(label)} for value, label in units_field.choices]
-        return Response({"units": choices})
+        def build():
+            units_field = Course._meta.get_field("units")
+            choices = [{"value": value, "label": str(label)} for value, label in units_field.choices]
+            return {"units": choices}
+
+        return cached_response(request, COURSES, build)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated, IsAdmin])
+    def export(self, request):
+        """
+        خروجی کامل کاتالوگ همراه با کد دانشکده‌ها، به صورت جریانی و با حافظه ثابت.
+        """
+        fmt = requested_format(request)
+        if fmt is None:
+            return Response({"detail": "Unsupported file_format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # یک ردیف به ازای هر (درس، دانشکده)؛ ردیف‌های پشت سر هم هر درس با groupby ادغام می‌شوند
+        rows = Course.objects.order_by("code", "departments__code").values_list(
+            "code", "title", "units", "departments__code"
+        ).iterator(chunk_size=2000)
+
+        def courses():
+            for (code, title, units), group in groupby(rows, key=lambda row: row[:3]):
+                yield code, title, units, "|".join(row[3] for row in group if row[3])
+
+        return export_response("courses", ["code", "title", "units", "departments"], courses(), fmt)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def search(self, request):
+        """
+        جستجوی رتبه‌بندی‌شده با کد یا عنوان ناقص (?q=، ?limit=)، روی ایندکس FTS5/pg_trgm؛
+        خروجی همان فیلدهای CourseSerializer (با ?fields= و ?expand=) به‌علاوه rank.
+        """
+        query = CourseSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        def build():
+            ranked = dict(search_courses(query.validated_data["q"], query.validated_data["limit"]))
+            order = {pk: i for i, pk in enumerate(ranked)}
+            serializer = self.get_serializer()
+            rows = sorted(
+                Course.objects.filter(pk__in=ranked).values(*values_columns(serializer)),
+                key=lambda row: order[row["pk"]],
+            )
+            results = values_data(serializer, rows)
+            for item, row in zip(results, rows):
+                item["rank"] = ranked[row["pk"]]
+            return {"results": results}
+
+        return cached_response(request, self.cache_namespace, build)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def eligibility(self, request):
+        """
+        شرایط گرفتن چند درس (?courses=1,2,3) برای دانشجوی جاری، یا برای ?student= توسط ادمین.
+        یک کوئری سابقه دانشجو؛ بقیه روی گراف کامپایل‌شده درون‌پروسه انجام می‌شود.
+        """
+        query = EligibilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        student_id = query.validated_data.get("student")
+        if request.user.role == "admin":
+            if student_id is None:
+                return Response({"detail": "student is required"}, status=status.HTTP_400_BAD_REQUEST)
+        elif request.user.role == "student" and student_id in (None, request.user.pk):
+            student_id = request.user.pk
+        else:
+            return Response(
+                {"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        passed, current = course_history(student_id)
+        results = prerequisite_graph.get().check(query.validated_data["courses"], passed, current)
+        return Response({"student": student_id, "results": results})
+
+
+class PrerequisiteViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.DestroyModelMixin,
+                          viewsets.GenericViewSet):
+    queryset = Prerequisite.objects.select_related("course", "required")
+    serializer_class = PrerequisiteSerializer
+    permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        course = self.request.query_params.get("course")
+        if course and course.isdigit():
+            queryset = queryset.filter(course_id=course)
+        return queryset
@@ -0,0 +1,13 @@
+from api.asynchronous import async_api_view
+from api.cache import DEPARTMENTS, acached_response
+from .models import Department
+from .serializers import DepartmentSerializer
+
+
+@async_api_view(allow_anonymous=True)
+async def department_list(request):
+    async def build():
+        departments = [department async for department in Department.objects.aiterator(chunk_size=500)]
+        return DepartmentSerializer(departments, many=True).data
+
+    return await acached_response(request, DEPARTMENTS, build)
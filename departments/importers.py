@@ -0,0 +1,45 @@
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from api import cache
+from api.bulk import BulkImporter
+from .models import Department
+from .serializers import CODE_TAKEN, NAME_TAKEN
+
+
+class DepartmentImporter(BulkImporter):
+    """ستون‌ها: code, name — ردیف با code موجود به‌روزرسانی می‌شود."""
+    model = Department
+    key_field = "code"
+    update_fields = ["name"]
+    cache_namespaces = (cache.DEPARTMENTS,)
+
+    def build(self, row):
+        return Department(
+            code=(row.get("code") or "").strip(),
+            name=(row.get("name") or "").strip(),
+        )
+
+    def check_chunk(self, items, report):
+        # یکتایی بدون حساسیت به حروف، با یک کوئری برای کل chunk
+        taken = Department.objects.annotate(
+            lower_name=Lower("name"), lower_code=Lower("code")
+        ).filter(
+            Q(lower_name__in=[d.name.lower() for _, d in items])
+            | Q(lower_code__in=[d.code.lower() for _, d in items])
+        ).values_list("lower_name", "lower_code", "code")
+        name_owner = {name: code for name, _, code in taken}
+        code_owner = {lower_code: code for _, lower_code, code in taken}
+
+        valid = []
+        for number, department in items:
+            name, code = department.name.lower(), department.code.lower()
+            if code_owner.get(code, department.code) != department.code:
+                report.add_error(number, {"code": [CODE_TAKEN]})
+                continue
+            if name_owner.get(name, department.code) != department.code:
+                report.add_error(number, {"name": [NAME_TAKEN]})
+                continue
+            code_owner[code] = name_owner[name] = department.code
+            valid.append((number, department))
+        return valid
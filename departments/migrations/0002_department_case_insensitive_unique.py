@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='department',
+            name='code',
+            field=models.CharField(max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='department_name_ci_unique', violation_error_message='A department with this name already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='department',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('code'), name='department_code_ci_unique', violation_error_message='A department with this code already exists.'),
+        ),
+    ]
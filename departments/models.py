@@ -1,21 +1,33 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Department(models.Model):
     name = models.CharField(
         max_length=100,
-        unique=True,              
     )
     
     code = models.CharField(
         max_length=10,
-        unique=True,              
     )
     
 
 
     class Meta:
         ordering = ["code"]       
+        constraints = [
+            # یکتایی بدون حساسیت به حروف بزرگ و کوچک با ایندکس تابعی؛ بدون کوئری exists در سریالایزر
+            models.UniqueConstraint(
+                Lower("name"),
+                name="department_name_ci_unique",
+                violation_error_message="A department with this name already exists.",
+            ),
+            models.UniqueConstraint(
+                Lower("code"),
+                name="department_code_ci_unique",
+                violation_error_message="A department with this code already exists.",
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.code} - {self.name}"   # display friendly in admin panel
\ No newline at end of file
+        return f"{self.code} - {self.name}"   # display friendly in admin panel
@@ -1,18 +1,83 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from rest_framework import serializers
+
+from api import cache
 from .models import Department
 
 
+NAME_TAKEN = "A department with this name already exists."
+CODE_TAKEN = "A department with this code already exists."
+
+
+def integrity_error_detail(error):
+    """خطای قید یکتایی پایگاه‌داده را به خطای فیلد متناظر تبدیل می‌کند."""
+    message = str(error)
+    if "department_name_ci_unique" in message:
+        return {"name": [NAME_TAKEN]}
+    if "department_code_ci_unique" in message:
+        return {"code": [CODE_TAKEN]}
+    return {"non_field_errors": ["This department conflicts with an existing one."]}
+
+
+class DepartmentListSerializer(serializers.ListSerializer):
+    """
+    ایجاد گروهی: کل دسته با یک کوئری بررسی و با bulk_create نوشته می‌شود.
+    """
+
+    def validate(self, attrs):
+        names = [item["name"].lower() for item in attrs]
+        codes = [item["code"].lower() for item in attrs]
+
+        taken = Department.objects.annotate(
+            lower_name=Lower("name"), lower_code=Lower("code")
+        ).filter(
+            Q(lower_name__in=names) | Q(lower_code__in=codes)
+        ).values_list("lower_name", "lower_code")
+        taken_names = {name for name, _ in taken}
+        taken_codes = {code for _, code in taken}
+
+        errors = []
+        for i, (name, code) in enumerate(zip(names, codes), start=1):
+            if name in taken_names:
+                errors.append(f"Item {i}: {NAME_TAKEN}")
+            if code in taken_codes:
+                errors.append(f"Item {i}: {CODE_TAKEN}")
+            taken_names.add(name)
+            taken_codes.add(code)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                departments = Department.objects.bulk_create(Department(**item) for item in validated_data)
+                # bulk_create سیگنال post_save نمی‌فرستد
+                cache.bump_on_commit(cache.DEPARTMENTS, cache.COURSES)
+                return departments
+        except IntegrityError as e:
+            raise serializers.ValidationError(integrity_error_detail(e))
+
+
 class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = ["id", "name", "code"]
+        list_serializer_class = DepartmentListSerializer
 
-    def validate_name(self, value):
-        if Department.objects.filter(name__iexact=value).exists():
-            raise serializers.ValidationError("A department with this name already exists.")
-        return value
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as e:
+            raise serializers.ValidationError(integrity_error_detail(e))
 
-    def validate_code(self, value):
-        if Department.objects.filter(code__iexact=value).exists():
-            raise serializers.ValidationError("A department with this code already exists.")
-        return value
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as e:
+            raise serializers.ValidationError(integrity_error_detail(e))
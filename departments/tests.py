@@ -1,3 +1,65 @@
-from django.test import TestCase
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from accounts.models import User
+from .models import Department
+
+
+class DepartmentApiTests(TestCase):
+    url = "/api/departments/departments/"
+
+    def setUp(self):
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+        self.math = Department.objects.create(name="Mathematics", code="MATH")
+
+    def post(self, data):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def test_create_is_case_insensitive_unique(self):
+        response = self.post({"name": "mathematics", "code": "MTH"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["name"], ["A department with this name already exists."])
+
+        response = self.post({"name": "Maths", "code": "math"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("code", response.data)
+
+    def test_create_runs_no_uniqueness_queries(self):
+        # user lookup + savepoint + insert + release
+        with self.assertNumQueries(4):
+            response = self.post({"name": "Physics", "code": "PHYS"})
+        self.assertEqual(response.status_code, 201)
+
+    async def test_async_list_is_public_and_matches_sync_view(self):
+        response = await AsyncClient().get("/api/async/departments/")
+        expected = await sync_to_async(self.client.get)(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected.json())
+        self.assertTrue(response["ETag"].startswith('"departments-'))
+
+    def test_update_of_same_row_is_allowed(self):
+        response = self.client.put(
+            f"{self.url}{self.math.id}/", {"name": "Mathematics", "code": "MATH"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_bulk_create_uses_one_validation_query(self):
+        payload = [{"name": f"Department {i}", "code": f"D{i}"} for i in range(30)]
+        # user lookup + batch uniqueness check + savepoint + insert + release
+        with self.assertNumQueries(5):
+            response = self.post(payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 30)
+        self.assertEqual(Department.objects.count(), 31)
+
+    def test_bulk_create_reports_conflicts(self):
+        response = self.post([
+            {"name": "Physics", "code": "PHYS"},
+            {"name": "physics", "code": "PH"},
+            {"name": "Statistics", "code": "Math"},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["non_field_errors"]), 2)
+        self.assertEqual(Department.objects.count(), 1)
@@ -1,12 +1,21 @@
 from rest_framework.viewsets import ModelViewSet
+from api.cache import DEPARTMENTS, ReferenceCacheMixin
+from api.idempotency import IdempotentMixin
 from .models import Department
 from .serializers import DepartmentSerializer
 from .permissions import IsAdminOrReadOnly
 
 
-class DepartmentViewSet(ModelViewSet):
+class DepartmentViewSet(IdempotentMixin, ReferenceCacheMixin, ModelViewSet):
+    cache_namespace = DEPARTMENTS
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAdminOrReadOnly]
 
     lookup_field = "id"
+
+    def get_serializer(self, *args, **kwargs):
+        # POST با آرایه، مسیر ایجاد گروهی را فعال می‌کند
+        if self.action == "create" and isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
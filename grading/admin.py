@@ -1,3 +1,21 @@
 from django.contrib import admin
+from .models import CumulativeGPA, Grade, TermGPA
 
-# Register your models here.
+
+@admin.register(Grade)
+class GradeAdmin(admin.ModelAdmin):
+    list_display = ("enrollment", "value", "updated_at")
+    raw_id_fields = ("enrollment", "submitted_by")
+
+
+@admin.register(TermGPA)
+class TermGPAAdmin(admin.ModelAdmin):
+    list_display = ("student", "term", "units", "points", "gpa")
+    list_filter = ("term",)
+    raw_id_fields = ("student",)
+
+
+@admin.register(CumulativeGPA)
+class CumulativeGPAAdmin(admin.ModelAdmin):
+    list_display = ("student", "units", "points", "gpa")
+    raw_id_fields = ("student",)
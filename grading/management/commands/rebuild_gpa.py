@@ -0,0 +1,92 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from grading.models import CumulativeGPA, Grade, TermGPA
+
+
+class Command(BaseCommand):
+    help = "Recompute term and cumulative GPA aggregates from grades in one streaming pass (or only verify them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="Report mismatches without writing.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Students per write batch.")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = timezone.now()
+        rows = Grade.objects.order_by("enrollment__student_id").values_list(
+            "enrollment__student_id",
+            "enrollment__offering__term_id",
+            "enrollment__offering__course__units",
+            "value",
+        ).iterator(chunk_size=options["chunk_size"])
+
+        self.students = self.mismatches = 0
+        batch = []
+        for student_id, grades in groupby(rows, key=lambda row: row[0]):
+            terms = defaultdict(lambda: [0, Decimal("0")])
+            for _, term_id, units, value in grades:
+                terms[term_id][0] += units
+                terms[term_id][1] += value * units
+            batch.append((student_id, terms))
+            if len(batch) >= options["batch_size"]:
+                self.flush(batch, options["verify"])
+                batch = []
+        if batch:
+            self.flush(batch, options["verify"])
+
+        if options["verify"]:
+            # ردیف تجمیعی برای دانشجویی که هیچ نمره‌ای ندارد
+            self.mismatches += CumulativeGPA.objects.exclude(
+                student__enrollments__grade__isnull=False
+            ).count()
+            self.stdout.write(f"Checked {self.students} students: {self.mismatches} mismatched aggregate(s).")
+        else:
+            # دانشجویانی که دیگر نمره‌ای ندارند
+            TermGPA.objects.filter(updated_at__lt=started).delete()
+            CumulativeGPA.objects.filter(updated_at__lt=started).delete()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt GPA aggregates for {self.students} students."))
+
+    def flush(self, batch, verify):
+        self.students += len(batch)
+        student_ids = [student_id for student_id, _ in batch]
+
+        if verify:
+            stored_terms = {
+                (row.student_id, row.term_id): (row.units, row.points)
+                for row in TermGPA.objects.filter(student_id__in=student_ids)
+            }
+            stored_totals = {
+                row.student_id: (row.units, row.points)
+                for row in CumulativeGPA.objects.filter(student_id__in=student_ids)
+            }
+            for student_id, terms in batch:
+                expected_terms = {(student_id, term_id): tuple(v) for term_id, v in terms.items()}
+                actual_terms = {k: v for k, v in stored_terms.items() if k[0] == student_id}
+                total = (sum(v[0] for v in terms.values()), sum(v[1] for v in terms.values()))
+                if expected_terms != actual_terms or stored_totals.get(student_id) != total:
+                    self.mismatches += 1
+                    self.stderr.write(f"Mismatch for student {student_id}")
+            return
+
+        with transaction.atomic():
+            TermGPA.objects.filter(student_id__in=student_ids).delete()
+            CumulativeGPA.objects.filter(student_id__in=student_ids).delete()
+            TermGPA.objects.bulk_create(
+                TermGPA(student_id=student_id, term_id=term_id, units=units, points=points)
+                for student_id, terms in batch
+                for term_id, (units, points) in terms.items()
+            )
+            CumulativeGPA.objects.bulk_create(
+                CumulativeGPA(
+                    student_id=student_id,
+                    units=sum(v[0] for v in terms.values()),
+                    points=sum((v[1] for v in terms.values()), Decimal("0")),
+                )
+                for student_id, terms in batch
+            )
@@ -1,3 +1,104 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-# Create your models here.
+
+MAX_GRADE = Decimal("20")
+PASSING_GRADE = Decimal("10")
+
+
+class Grade(models.Model):
+    enrollment = models.OneToOneField(
+        "registration.Enrollment",
+        on_delete=models.CASCADE,
+        related_name="grade"
+    )
+
+    value = models.DecimalField(
+        max_digits=4,
+        decimal_places=2,
+        validators=[MinValueValidator(Decimal("0")), MaxValueValidator(MAX_GRADE)]
+    )
+
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="submitted_grades"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(value__gte=0, value__lte=MAX_GRADE),
+                name="grade_value_range"
+            )
+        ]
+
+    @property
+    def passed(self):
+        return self.value >= PASSING_GRADE
+
+    def __str__(self):
+        return f"{self.enrollment}: {self.value}"
+
+
+class GPAAggregate(models.Model):
+    """
+    مجموع واحد و امتیاز (نمره × واحد)؛ معدل از همین دو مقدار خوانده می‌شود و با هر تغییر
+    نمره فقط به اندازه تفاوت آن به‌روز می‌شود.
+    """
+    units = models.PositiveIntegerField(default=0)
+    points = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal("0"))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def gpa(self):
+        if not self.units:
+            return None
+        return (self.points / self.units).quantize(Decimal("0.01"))
+
+
+class TermGPA(GPAAggregate):
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="term_gpas"
+    )
+
+    term = models.ForeignKey(
+        "terms.Term",
+        on_delete=models.CASCADE,
+        related_name="student_gpas"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "term"],
+                name="unique_student_term_gpa"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.term}: {self.gpa}"
+
+
+class CumulativeGPA(GPAAggregate):
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="cumulative_gpa"
+    )
+
+    def __str__(self):
+        return f"{self.student}: {self.gpa}"
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from .models import MAX_GRADE, Grade
+
+
+class GradeRowSerializer(serializers.Serializer):
+    enrollment = serializers.IntegerField()
+    value = serializers.DecimalField(max_digits=4, decimal_places=2, min_value=0, max_value=MAX_GRADE)
+
+
+class GradeSheetSerializer(serializers.Serializer):
+    grades = GradeRowSerializer(many=True, allow_empty=False)
+
+
+class GradeSerializer(serializers.ModelSerializer):
+    student = serializers.IntegerField(source="enrollment.student_id", read_only=True)
+    student_id = serializers.CharField(source="enrollment.student.student_id", read_only=True)
+
+    class Meta:
+        model = Grade
+        fields = ["id", "enrollment", "student", "student_id", "value", "updated_at"]
+
+
+class GPASerializer(serializers.Serializer):
+    units = serializers.IntegerField()
+    points = serializers.DecimalField(max_digits=10, decimal_places=2)
+    gpa = serializers.DecimalField(max_digits=4, decimal_places=2, allow_null=True)
+
+
+class TermGPASerializer(GPASerializer):
+    term = serializers.IntegerField(source="term_id")
+    term_name = serializers.CharField(source="term.name")
@@ -0,0 +1,110 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.services import notify
+from offerings.models import Offering
+from registration.models import Enrollment
+from terms.resolver import terms
+from .models import CumulativeGPA, Grade, TermGPA
+
+
+class GradeSheetError(Exception):
+    def __init__(self, errors):
+        super().__init__("Invalid grade sheet")
+        self.errors = errors
+
+
+@transaction.atomic
+def submit_grade_sheet(offering, rows, submitted_by=None):
+    """
+    ثبت گروهی نمره‌های یک ارائه.
+
+    کل برگه اول اعتبارسنجی می‌شود و سپس با bulk_create/bulk_update نوشته می‌شود. معدل ترم و کل
+    فقط به اندازه تفاوت نمره‌ها (units و points) به‌روز می‌شوند و کارنامه دوباره خوانده نمی‌شود.
+    rows: [{"enrollment": id, "value": Decimal}, ...]
+    """
+    if not terms.grading_open(offering.term_id):
+        raise GradeSheetError([{"detail": "The grading window for this term is not open."}])
+    # برگه‌های هم‌زمان یک ارائه پشت سر هم اجرا می‌شوند؛ وگرنه هر دو تفاوت را از نمره‌های قدیمی حساب
+    # می‌کنند (اعمال دوباره روی معدل) یا هر دو یک Grade را می‌سازند (IntegrityError)
+    Offering.objects.select_for_update().only("pk").get(pk=offering.pk)
+    enrollments = {
+        e.pk: e for e in Enrollment.objects.filter(
+            offering=offering, status=Enrollment.ENROLLED
+        ).select_related("grade")
+    }
+
+    errors, seen = [], set()
+    for i, row in enumerate(rows, start=1):
+        if row["enrollment"] not in enrollments:
+            errors.append({"row": i, "enrollment": row["enrollment"], "detail": "Not an active enrollment of this offering."})
+        elif row["enrollment"] in seen:
+            errors.append({"row": i, "enrollment": row["enrollment"], "detail": "Duplicate enrollment in this sheet."})
+        seen.add(row["enrollment"])
+    if errors:
+        raise GradeSheetError(errors)
+
+    units = offering.course.units
+    now = timezone.now()
+    to_create, to_update = [], []
+    deltas = defaultdict(lambda: [0, Decimal("0")])   # student_id -> [units, points]
+
+    for row in rows:
+        enrollment = enrollments[row["enrollment"]]
+        value = row["value"]
+        grade = getattr(enrollment, "grade", None)
+
+        if grade is None:
+            to_create.append(Grade(enrollment=enrollment, value=value, submitted_by=submitted_by))
+            deltas[enrollment.student_id][0] += units
+            deltas[enrollment.student_id][1] += value * units
+        elif grade.value != value:
+            deltas[enrollment.student_id][1] += (value - grade.value) * units
+            grade.value = value
+            grade.submitted_by = submitted_by
+            grade.updated_at = now
+            to_update.append(grade)
+
+    Grade.objects.bulk_create(to_create)
+    Grade.objects.bulk_update(to_update, ["value", "submitted_by", "updated_at"])
+
+    apply_deltas(TermGPA, deltas, term_id=offering.term_id)
+    apply_deltas(CumulativeGPA, deltas)
+
+    # در همان تراکنش در outbox نوشته می‌شود؛ با rollback برگه، اعلانی هم ارسال نمی‌شود
+    notify(
+        [g.enrollment.student_id for g in to_create + to_update],
+        "grade_posted",
+        f"Grade posted for {offering.course.code}",
+        data={"offering": offering.pk, "course": offering.course.code},
+    )
+
+    return {"created": len(to_create), "updated": len(to_update), "unchanged": len(rows) - len(to_create) - len(to_update)}
+
+
+def apply_deltas(model, deltas, **scope):
+    """تفاوت‌ها را روی ردیف‌های تجمیعی اعمال می‌کند؛ یک SELECT ... FOR UPDATE و حداکثر دو نوشتن گروهی."""
+    deltas = {student_id: d for student_id, d in deltas.items() if d[0] or d[1]}
+    if not deltas:
+        return
+
+    existing = {
+        row.student_id: row
+        for row in model.objects.select_for_update().filter(student_id__in=deltas, **scope)
+    }
+    now = timezone.now()
+    to_create = []
+    for student_id, (units, points) in deltas.items():
+        row = existing.get(student_id)
+        if row is None:
+            to_create.append(model(student_id=student_id, units=units, points=points, **scope))
+        else:
+            row.units += units
+            row.points += points
+            row.updated_at = now
+
+    model.objects.bulk_create(to_create)
+    model.objects.bulk_update(existing.values(), ["units", "points", "updated_at"])
@@ -1,3 +1,113 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from notifications.models import OutboxMessage
+from registration.services import enroll
+from registration.tests import make_offering, make_student
+from terms.models import Term
+from terms.resolver import terms
+from .models import CumulativeGPA, TermGPA
+from .services import GradeSheetError, submit_grade_sheet
+
+
+def set_term_status(term, status):
+    # save سیگنال ذخیره را می‌فرستد و TermResolver بی‌اعتبار می‌شود
+    term.status = status
+    term.save(update_fields=["status"])
+
+
+class GradeSheetTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(username="p1", role="professor", professor_id="p1")
+        self.math = make_offering("MA101", units=3, capacity=50)
+        self.cs = make_offering("CS101", units=2, capacity=50, term=self.math.term)
+        self.math.professor = self.professor
+        self.math.save()
+        self.students = [make_student(f"s{i}") for i in range(3)]
+        self.math_enrollments = [enroll(s, self.math) for s in self.students]
+        self.cs_enrollment = enroll(self.students[0], self.cs)
+        set_term_status(self.math.term, Term.GRADING)
+
+    def sheet(self, enrollments, values):
+        return [{"enrollment": e.pk, "value": Decimal(v)} for e, v in zip(enrollments, values)]
+
+    def test_aggregates_follow_grade_deltas(self):
+        submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["20", "10", "15"]))
+        submit_grade_sheet(self.cs, self.sheet([self.cs_enrollment], ["15"]))
+
+        term = TermGPA.objects.get(student=self.students[0])
+        self.assertEqual((term.units, term.points, term.gpa), (5, Decimal("90"), Decimal("18.00")))
+
+        # اصلاح نمره فقط تفاوت را اعمال می‌کند
+        result = submit_grade_sheet(self.math, self.sheet(self.math_enrollments[:2], ["10", "10"]))
+        self.assertEqual(result, {"created": 0, "updated": 1, "unchanged": 1})
+        cumulative = CumulativeGPA.objects.get(student=self.students[0])
+        self.assertEqual((cumulative.units, cumulative.gpa), (5, Decimal("12.00")))
+
+    def test_sheet_is_written_in_constant_queries(self):
+        terms.current()  # ترم‌ها در پروسه بارگذاری شده‌اند
+        # offering lock + enrollments + savepoint + grade insert + (select, insert) x 2 aggregates + outbox insert + release
+        with self.assertNumQueries(10):
+            submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["12", "13", "14"]))
+
+    def test_grade_posting_queues_notifications(self):
+        submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["12", "13", "14"]))
+        submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["12", "13", "15"]))
+        messages = OutboxMessage.objects.filter(kind="grade_posted")
+        self.assertEqual(messages.count(), 4)
+        self.assertEqual(messages.filter(recipient=self.students[2]).count(), 2)
+
+    def test_sheet_is_rejected_outside_the_grading_window(self):
+        set_term_status(self.math.term, Term.IN_PROGRESS)
+        with self.assertRaises(GradeSheetError):
+            submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["12", "13", "14"]))
+        self.assertFalse(TermGPA.objects.exists())
+
+    def test_invalid_sheet_is_rejected_whole(self):
+        rows = self.sheet(self.math_enrollments[:1], ["12"]) + self.sheet([self.cs_enrollment], ["12"])
+        with self.assertRaises(GradeSheetError) as ctx:
+            submit_grade_sheet(self.math, rows)
+        self.assertEqual([e["row"] for e in ctx.exception.errors], [2])
+        self.assertFalse(TermGPA.objects.exists())
+
+    def test_api_permissions_and_gpa_read(self):
+        url = f"/api/grading/offerings/{self.math.pk}/grades/"
+        payload = {"grades": [{"enrollment": e.pk, "value": "17.5"} for e in self.math_enrollments]}
+        terms.current()
+
+        other = User.objects.create_user(username="p2", role="professor", professor_id="p2")
+        response = self.client.post(url, payload, content_type="application/json",
+                                    HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(other)}")
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post(url, payload, content_type="application/json",
+                                    HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.professor)}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 3)
+
+        response = self.client.get("/api/grading/gpa/",
+                                   HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.students[1])}")
+        self.assertEqual(response.data["cumulative"]["gpa"], "17.50")
+        self.assertEqual(len(response.data["terms"]), 1)
+
+    def test_rebuild_command_matches_incremental_aggregates(self):
+        submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["20", "10", "15"]))
+        submit_grade_sheet(self.cs, self.sheet([self.cs_enrollment], ["15"]))
+        submit_grade_sheet(self.math, self.sheet(self.math_enrollments, ["19", "11", "15"]))
+
+        out = StringIO()
+        call_command("rebuild_gpa", "--verify", stdout=out, stderr=StringIO())
+        self.assertIn("0 mismatched", out.getvalue())
+
+        CumulativeGPA.objects.filter(student=self.students[0]).update(points=0)
+        out = StringIO()
+        call_command("rebuild_gpa", "--verify", stdout=out, stderr=StringIO())
+        self.assertIn("1 mismatched", out.getvalue())
 
-# Create your tests here.
+        call_command("rebuild_gpa", "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(CumulativeGPA.objects.get(student=self.students[0]).points, Decimal("87"))
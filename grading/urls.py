@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import GradeSheetView, MyGPAView
+
+urlpatterns = [
+    path("offerings/<int:pk>/grades/", GradeSheetView.as_view()),
+    path("gpa/", MyGPAView.as_view()),
+]
@@ -1,3 +1,51 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from accounts.permissions import IsStudent
+from offerings.models import Offering
+from .models import CumulativeGPA, Grade, TermGPA
+from offerings.permissions import IsOfferingProfessorOrAdmin
+from .serializers import GPASerializer, GradeSerializer, GradeSheetSerializer, TermGPASerializer
+from .services import GradeSheetError, submit_grade_sheet
+
+
+class GradeSheetView(APIView):
+    permission_classes = [IsAuthenticated, IsOfferingProfessorOrAdmin]
+
+    def get_offering(self, pk):
+        offering = get_object_or_404(Offering.objects.select_related("course"), pk=pk)
+        self.check_object_permissions(self.request, offering)
+        return offering
+
+    def get(self, request, pk):
+        offering = self.get_offering(pk)
+        grades = Grade.objects.filter(enrollment__offering=offering).select_related("enrollment__student")
+        return Response(GradeSerializer(grades, many=True).data)
+
+    def post(self, request, pk):
+        offering = self.get_offering(pk)
+        serializer = GradeSheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = submit_grade_sheet(offering, serializer.validated_data["grades"], submitted_by=request.user)
+        except GradeSheetError as e:
+            return Response({"detail": "Invalid grade sheet", "errors": e.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class MyGPAView(APIView):
+    """معدل دانشجو فقط از جدول‌های تجمیعی خوانده می‌شود."""
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def get(self, request):
+        terms = TermGPA.objects.filter(student_id=request.user.pk).select_related("term").order_by("-term__start_date")
+        cumulative = CumulativeGPA.objects.filter(student_id=request.user.pk).first()
+        return Response({
+            "terms": TermGPASerializer(terms, many=True).data,
+            "cumulative": GPASerializer(cumulative).data if cumulative else None,
+        })
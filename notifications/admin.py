@@ -1,3 +1,22 @@
 from django.contrib import admin
+from .models import Notification, OutboxMessage, UnreadCounter
 
-# Register your models here.
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "recipient", "channel", "status", "attempts", "available_at", "sent_at")
+    list_filter = ("status", "channel", "kind")
+    raw_id_fields = ("recipient",)
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "kind", "title", "created_at", "read_at")
+    list_filter = ("kind",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(UnreadCounter)
+class UnreadCounterAdmin(admin.ModelAdmin):
+    list_display = ("user", "unread")
+    raw_id_fields = ("user",)
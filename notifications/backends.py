@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+
+from .models import Notification
+
+
+def get_backend(channel):
+    try:
+        path = settings.NOTIFICATION_BACKENDS[channel]
+    except KeyError:
+        raise ValueError(f"Unknown notification channel '{channel}'")
+    return import_string(path)()
+
+
+class BaseBackend:
+    """
+    backend تحویل؛ send_batch یک دسته OutboxMessage می‌گیرد و در صورت خطا exception می‌دهد
+    تا کل دسته دوباره تلاش شود.
+    """
+
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class InboxBackend(BaseBackend):
+    """
+    صندوق داخل برنامه. در همان تراکنشی اجرا می‌شود که وضعیت outbox را sent می‌کند،
+    پس هر پیام دقیقا یک بار در صندوق ثبت می‌شود.
+    """
+
+    def send_batch(self, messages):
+        from .services import increment_unread
+
+        Notification.objects.bulk_create(
+            Notification(user_id=m.recipient_id, kind=m.kind, title=m.title, body=m.body, data=m.data)
+            for m in messages
+        )
+        counts = {}
+        for m in messages:
+            counts[m.recipient_id] = counts.get(m.recipient_id, 0) + 1
+        increment_unread(counts)
+
+
+class EmailBackend(BaseBackend):
+    """
+    ایمیل با یک اتصال برای کل دسته؛ backend ایمیل از NOTIFICATION_EMAIL_BACKEND
+    (پیش‌فرض console، برای نوشتن در فایل filebased) خوانده می‌شود.
+    """
+
+    def send_batch(self, messages):
+        from accounts.models import User
+
+        emails = dict(
+            User.objects.filter(pk__in={m.recipient_id for m in messages})
+            .exclude(email="")
+            .values_list("pk", "email")
+        )
+        connection = get_connection(settings.NOTIFICATION_EMAIL_BACKEND)
+        connection.send_messages([
+            EmailMessage(m.title, m.body, to=[emails[m.recipient_id]], connection=connection)
+            for m in messages
+            if m.recipient_id in emails
+        ])
@@ -0,0 +1,52 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import User
+from notifications.models import Notification, OutboxMessage, UnreadCounter
+from notifications.services import notify, process_outbox, unread_count
+
+
+class Command(BaseCommand):
+    help = "Measure outbox fan-out and batched inbox delivery for a large recipient set."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=50_000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:6]
+        count = options["recipients"]
+        User.objects.bulk_create(
+            (User(username=f"bench-{tag}-{i}", role="student", student_id=f"{tag}{i}", password="!")
+             for i in range(count)),
+            batch_size=5000,
+        )
+        students = User.objects.filter(username__startswith=f"bench-{tag}-")
+        try:
+            started = time.perf_counter()
+            with transaction.atomic():
+                queued = notify(students, "benchmark", f"Benchmark {tag}", body="Fan-out benchmark")
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"fan-out: {queued} outbox rows in {elapsed:.2f}s ({queued / elapsed:,.0f} rows/s)")
+
+            started = time.perf_counter()
+            sent, failed = process_outbox(batch_size=options["batch_size"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"delivery: {sent} sent, {failed} failed in {elapsed:.2f}s ({sent / elapsed:,.0f} msg/s, "
+                f"batch size {options['batch_size']})"
+            )
+
+            user_id = students.values_list("pk", flat=True).first()
+            started = time.perf_counter()
+            for _ in range(1000):
+                unread_count(user_id)
+            self.stdout.write(f"unread badge: {(time.perf_counter() - started):.3f} ms/lookup")
+        finally:
+            OutboxMessage.objects.filter(kind="benchmark", title=f"Benchmark {tag}").delete()
+            Notification.objects.filter(user__in=students).delete()
+            UnreadCounter.objects.filter(user__in=students).delete()
+            students.delete()
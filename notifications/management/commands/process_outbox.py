@@ -0,0 +1,39 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from notifications.services import process_outbox, purge_sent
+
+
+class Command(BaseCommand):
+    help = "Deliver pending notifications from the outbox in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Keep running as a background worker, polling every N seconds when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--purge-days", type=int, default=7,
+            help="Delete sent outbox rows older than N days after each pass (0 disables).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            sent, failed = process_outbox(batch_size=options["batch_size"])
+            if sent or failed:
+                self.stdout.write(
+                    f"Delivered {sent} message(s), {failed} failed, in {time.perf_counter() - started:.2f}s"
+                )
+            if options["purge_days"]:
+                purge_sent(timezone.now() - timedelta(days=options["purge_days"]))
+            if not options["interval"]:
+                return
+            close_old_connections()
+            if not (sent or failed):
+                time.sleep(options["interval"])
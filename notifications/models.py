@@ -1,3 +1,93 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class OutboxMessage(models.Model):
+    """
+    صف خروجی اعلان‌ها؛ هم‌زمان با تغییر اصلی (در همان تراکنش) نوشته می‌شود و
+    دستور process_outbox آن را به صورت دسته‌ای به backend ها تحویل می‌دهد.
+    هر ردیف یک گیرنده و یک کانال است تا تلاش دوباره هر کانال مستقل باشد.
+    """
+    PENDING = "pending"
+    PROCESSING = "processing"
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (PROCESSING, "Processing"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="outbox_messages"
+    )
+
+    channel = models.CharField(max_length=30)
+    kind = models.CharField(max_length=50)
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_by = models.CharField(max_length=32, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at", "id"], name="outbox_claim_idx"),
+            models.Index(fields=["claimed_by"], name="outbox_claimed_by_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} -> {self.recipient_id} ({self.channel}, {self.status})"
+
+
+class Notification(models.Model):
+    """اعلان صندوق ورودی داخل برنامه."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notifications"
+    )
+
+    kind = models.CharField(max_length=50)
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True)
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["user", "-id"], name="notification_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.title}"
+
+
+class UnreadCounter(models.Model):
+    """شمارنده غیرنرمال تعداد اعلان‌های خوانده‌نشده؛ نشان صندوق با یک خواندن کلید اصلی."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="unread_counter"
+    )
+
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread}"
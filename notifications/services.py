@@ -0,0 +1,193 @@
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
+
+from api.bulk import chunked
+from .backends import get_backend
+from .models import Notification, OutboxMessage, UnreadCounter
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+LEASE = timedelta(minutes=5)
+
+
+class LeaseLost(Exception):
+    """lease دسته منقضی شده و worker دیگری ممکن است آن را دوباره رزرو کرده باشد."""
+
+
+def _owned(batch):
+    # ردیف‌هایی که هنوز با lease معتبر در اختیار همین worker هستند
+    return OutboxMessage.objects.filter(
+        pk__in=[m.pk for m in batch], claimed_by=batch[0].claimed_by,
+        status=OutboxMessage.PROCESSING, locked_until__gt=timezone.now(),
+    )
+
+
+def notify(recipients, kind, title, body="", data=None, channels=None, batch_size=2000):
+    """
+    اعلان را برای گروهی از کاربران در outbox می‌نویسد و تعداد ردیف‌ها را برمی‌گرداند.
+
+    داخل تراکنش فراخواننده صدا زده شود تا اعلان فقط با commit شدن تغییر اصلی ارسال شود.
+    recipients: queryset کاربران یا iterable از شناسه‌ها.
+    """
+    if isinstance(recipients, QuerySet):
+        recipients = recipients.values_list("pk", flat=True).iterator(chunk_size=batch_size)
+    channels = channels or settings.NOTIFICATION_DEFAULT_CHANNELS
+    data = data or {}
+
+    total = 0
+    now = timezone.now()
+    for ids in chunked(recipients, batch_size):
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage(
+                recipient_id=user_id, channel=channel, kind=kind,
+                title=title, body=body, data=data, available_at=now,
+            )
+            for user_id in ids
+            for channel in channels
+        ])
+        total += len(ids) * len(channels)
+    return total
+
+
+def _ready(now):
+    # ردیف‌های آماده و ردیف‌هایی که worker قبلی در میانه کار رها کرده (lease منقضی)
+    return Q(status=OutboxMessage.PENDING, available_at__lte=now) | Q(
+        status=OutboxMessage.PROCESSING, locked_until__lt=now
+    )
+
+
+def claim_batch(size=500, lease=LEASE):
+    """
+    یک دسته از outbox را برای این worker رزرو می‌کند.
+
+    روی Postgres با SELECT ... FOR UPDATE SKIP LOCKED چند worker بدون انتظار دسته‌های جدا برمی‌دارند.
+    SQLite قفل سطری ندارد؛ آنجا به‌روزرسانی شرطی روی وضعیت تضمین می‌کند هر ردیف فقط به یک worker برسد.
+    """
+    now = timezone.now()
+    claim = uuid.uuid4().hex
+    ready = OutboxMessage.objects.filter(_ready(now)).order_by("id")
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ready = ready.select_for_update(skip_locked=True)
+        ids = list(ready.values_list("id", flat=True)[:size])
+        if not ids:
+            return []
+        OutboxMessage.objects.filter(_ready(now), pk__in=ids).update(
+            status=OutboxMessage.PROCESSING,
+            claimed_by=claim,
+            locked_until=now + lease,
+            attempts=F("attempts") + 1,
+        )
+
+    return list(OutboxMessage.objects.filter(claimed_by=claim, status=OutboxMessage.PROCESSING).order_by("id"))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def deliver(messages):
+    """
+    پیام‌های رزروشده را به تفکیک کانال تحویل می‌دهد؛ خروجی: (ارسال‌شده، ناموفق).
+
+    وضعیت فقط برای ردیف‌هایی نوشته می‌شود که هنوز با همین claim و lease معتبر در اختیار این worker هستند.
+    اگر lease دسته در این میان منقضی شده باشد تراکنش (و نوشته‌های backend درون آن) برمی‌گردد و
+    وضعیتی که worker بعدی نوشته دست نمی‌خورد؛ آن پیام‌ها نه ارسال‌شده و نه ناموفق شمرده می‌شوند.
+    """
+    by_channel = defaultdict(list)
+    for message in messages:
+        by_channel[message.channel].append(message)
+
+    sent = failed = 0
+    for channel, batch in by_channel.items():
+        try:
+            with transaction.atomic():
+                get_backend(channel).send_batch(batch)
+                updated = _owned(batch).update(
+                    status=OutboxMessage.SENT, sent_at=timezone.now(), locked_until=None, last_error="",
+                )
+                if updated != len(batch):
+                    raise LeaseLost()
+            sent += len(batch)
+        except LeaseLost:
+            logger.warning("Lease expired while delivering %d %s messages", len(batch), channel)
+        except Exception as e:
+            _schedule_retry(batch, repr(e))
+            failed += len(batch)
+    return sent, failed
+
+
+def _schedule_retry(batch, error):
+    now = timezone.now()
+    by_attempts = defaultdict(list)
+    for message in batch:
+        by_attempts[message.attempts].append(message.pk)
+
+    for attempts, ids in by_attempts.items():
+        if attempts >= MAX_ATTEMPTS:
+            changes = {"status": OutboxMessage.FAILED}
+        else:
+            changes = {"status": OutboxMessage.PENDING, "available_at": now + retry_delay(attempts)}
+        # ردیفی که worker دیگری دوباره رزرو کرده دست نمی‌خورد
+        OutboxMessage.objects.filter(
+            pk__in=ids, claimed_by=batch[0].claimed_by, status=OutboxMessage.PROCESSING
+        ).update(locked_until=None, last_error=error, **changes)
+
+
+def process_outbox(batch_size=500, max_batches=None):
+    """تا خالی شدن صف (یا max_batches) دسته برمی‌دارد و تحویل می‌دهد."""
+    sent = failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        messages = claim_batch(batch_size)
+        if not messages:
+            break
+        s, f = deliver(messages)
+        sent += s
+        failed += f
+        batches += 1
+    return sent, failed
+
+
+def purge_sent(older_than):
+    return OutboxMessage.objects.filter(status=OutboxMessage.SENT, sent_at__lt=older_than).delete()[0]
+
+
+# ---------- unread counters ----------
+
+def increment_unread(counts):
+    """counts: {user_id: n}؛ کاربرانی که n یکسان دارند با یک UPDATE به‌روز می‌شوند."""
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id) for user_id in counts], ignore_conflicts=True
+    )
+    by_count = defaultdict(list)
+    for user_id, n in counts.items():
+        by_count[n].append(user_id)
+    for n, user_ids in by_count.items():
+        for ids in chunked(user_ids, 500):
+            UnreadCounter.objects.filter(user_id__in=ids).update(unread=F("unread") + n)
+
+
+def unread_count(user_id):
+    return UnreadCounter.objects.filter(user_id=user_id).values_list("unread", flat=True).first() or 0
+
+
+@transaction.atomic
+def mark_read(user_id, ids=None):
+    """اعلان‌ها (یا همه) را خوانده‌شده می‌کند و شمارنده را به همان تعداد کم می‌کند."""
+    unread = Notification.objects.filter(user_id=user_id, read_at__isnull=True)
+    if ids is not None:
+        unread = unread.filter(pk__in=ids)
+    changed = unread.update(read_at=timezone.now())
+    if changed:
+        UnreadCounter.objects.filter(user_id=user_id).update(unread=F("unread") - changed)
+    return changed
@@ -1,3 +1,125 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from .models import Notification, OutboxMessage, UnreadCounter
+from .services import MAX_ATTEMPTS, claim_batch, deliver, notify, process_outbox
+
+
+def make_students(count):
+    return User.objects.bulk_create(
+        User(username=f"s{i}", role="student", student_id=str(i), password="!") for i in range(count)
+    )
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.students = make_students(30)
+
+    def test_fan_out_and_batched_delivery(self):
+        self.assertEqual(notify(User.objects.filter(role="student"), "test", "Hello"), 30)
+
+        sent, failed = process_outbox(batch_size=10)
+        self.assertEqual((sent, failed), (30, 0))
+        self.assertEqual(Notification.objects.count(), 30)
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.SENT).exists())
+        self.assertEqual(set(UnreadCounter.objects.values_list("unread", flat=True)), {1})
+
+    def test_delivery_query_count_does_not_grow_with_batch(self):
+        def delivery_queries(count):
+            notify([s.pk for s in self.students[:count]], "test", "Hello")
+            with CaptureQueriesContext(connection) as ctx:
+                process_outbox(batch_size=100, max_batches=1)
+            return len(ctx)
+
+        self.assertEqual(delivery_queries(3), delivery_queries(25))
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        notify([s.pk for s in self.students], "test", "Hello")
+        first = claim_batch(20)
+        second = claim_batch(20)
+        self.assertEqual(len(first), 20)
+        self.assertEqual(len(second), 10)
+        self.assertFalse({m.pk for m in first} & {m.pk for m in second})
+
+    def test_expired_lease_is_reclaimed(self):
+        notify([self.students[0].pk], "test", "Hello")
+        claim_batch(10)
+        self.assertEqual(claim_batch(10), [])
+        OutboxMessage.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(claim_batch(10)), 1)
+
+    def test_worker_with_lost_lease_does_not_mark_sent(self):
+        notify([self.students[0].pk], "test", "Hello")
+        stale = claim_batch(10)
+        OutboxMessage.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        current = claim_batch(10)
+
+        with self.assertLogs("notifications.services", "WARNING"):
+            self.assertEqual(deliver(stale), (0, 0))
+        self.assertFalse(Notification.objects.exists())
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.claimed_by), (OutboxMessage.PROCESSING, current[0].claimed_by))
+
+        self.assertEqual(deliver(current), (1, 0))
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_failed_batch_is_retried_with_backoff(self):
+        notify([s.pk for s in self.students[:2]], "test", "Hello")
+        with mock.patch("notifications.backends.InboxBackend.send_batch", side_effect=RuntimeError("down")):
+            self.assertEqual(process_outbox(), (0, 2))
+
+        self.assertFalse(Notification.objects.exists())
+        message = OutboxMessage.objects.first()
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertGreater(message.available_at, timezone.now())
+        self.assertIn("down", message.last_error)
+
+        OutboxMessage.objects.update(attempts=MAX_ATTEMPTS - 1, available_at=timezone.now())
+        with mock.patch("notifications.backends.InboxBackend.send_batch", side_effect=RuntimeError("down")):
+            process_outbox()
+        self.assertEqual(OutboxMessage.objects.filter(status=OutboxMessage.FAILED).count(), 2)
+
+    @override_settings(NOTIFICATION_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+    def test_email_channel(self):
+        from django.core import mail
+
+        User.objects.filter(pk=self.students[0].pk).update(email="s0@example.com")
+        notify([s.pk for s in self.students[:2]], "test", "Hello", body="Hi", channels=["email"])
+        self.assertEqual(process_outbox(), (2, 0))
+        self.assertEqual([m.to for m in mail.outbox], [["s0@example.com"]])
+
+
+class InboxApiTests(TestCase):
+    def setUp(self):
+        self.student = make_students(1)[0]
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.student)}"
+        for i in range(3):
+            notify([self.student.pk], "test", f"Message {i}")
+        process_outbox()
+
+    def test_list_and_unread_count(self):
+        response = self.client.get("/api/notifications/")
+        self.assertEqual([n["title"] for n in response.data["results"]], ["Message 2", "Message 1", "Message 0"])
+
+        # user lookup + counter row
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/notifications/unread-count/")
+        self.assertEqual(response.data, {"unread": 3})
+
+    def test_mark_read_updates_counter(self):
+        first = Notification.objects.filter(user=self.student).order_by("id").first()
+        response = self.client.post("/api/notifications/read/", {"ids": [first.pk]}, content_type="application/json")
+        self.assertEqual(response.data, {"marked": 1, "unread": 2})
+
+        response = self.client.post("/api/notifications/read/", {"all": True}, content_type="application/json")
+        self.assertEqual(response.data, {"marked": 2, "unread": 0})
+
+        response = self.client.post("/api/notifications/read/", {}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from rest_framework.generics import ListAPIView
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
 
-# Create your views here.
+from .models import Notification
+from .pagination import NotificationCursorPagination
+from .serializers import MarkReadSerializer, NotificationSerializer
+from .services import mark_read, unread_count
+
+
+class NotificationListView(ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = NotificationSerializer
+    pagination_class = NotificationCursorPagination
+
+    def get_queryset(self):
+        notifications = Notification.objects.filter(user_id=self.request.user.pk)
+        if self.request.query_params.get("unread") == "1":
+            notifications = notifications.filter(read_at__isnull=True)
+        return notifications
+
+
+class UnreadCountView(APIView):
+    """نشان صندوق؛ فقط شمارنده غیرنرمال خوانده می‌شود."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"unread": unread_count(request.user.pk)})
+
+
+class MarkReadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = None if serializer.validated_data["all"] else serializer.validated_data["ids"]
+        changed = mark_read(request.user.pk, ids)
+        return Response({"marked": changed, "unread": unread_count(request.user.pk)})
@@ -1,3 +1,17 @@
 from django.contrib import admin
+from .models import Offering, MeetingSlot
 
-# Register your models here.
+
+class MeetingSlotInline(admin.TabularInline):
+    model = MeetingSlot
+    extra = 0
+
+
+@admin.register(Offering)
+class OfferingAdmin(admin.ModelAdmin):
+    list_display = ("course", "term", "section", "capacity", "enrolled_count", "waitlist_count")
+    list_filter = ("term",)
+    search_fields = ("course__code", "course__title")
+    readonly_fields = ("enrolled_count", "waitlist_count")
+    raw_id_fields = ("professor",)
+    inlines = [MeetingSlotInline]
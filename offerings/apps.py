@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OfferingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offerings'
+
+    def ready(self):
+        from . import timetable  # noqa: F401  (signal receivers)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0002_course_units_idx'),
+        ('terms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Offering',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.PositiveSmallIntegerField(default=1)),
+                ('capacity', models.PositiveIntegerField()),
+                ('enrolled_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='offerings', to='courses.course')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='offerings', to='terms.term')),
+            ],
+            options={
+                'ordering': ['term', 'course', 'section'],
+                'constraints': [models.UniqueConstraint(fields=('course', 'term', 'section'), name='unique_offering_section'), models.CheckConstraint(condition=models.Q(('enrolled_count__lte', models.F('capacity'))), name='offering_not_oversold')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offerings', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offering',
+            name='professor',
+            field=models.ForeignKey(blank=True, limit_choices_to={'role': 'professor'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='offerings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='MeetingSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Saturday'), (1, 'Sunday'), (2, 'Monday'), (3, 'Tuesday'), (4, 'Wednesday'), (5, 'Thursday'), (6, 'Friday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='meeting_slots', to='offerings.offering')),
+            ],
+            options={
+                'ordering': ['weekday', 'start_time'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('start_time__lt', models.F('end_time'))), name='meeting_slot_start_before_end')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_prerequisite'),
+        ('offerings', '0002_offering_professor_meetingslot'),
+        ('terms', '0002_term_windows_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offering',
+            name='waitlist_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='offering',
+            index=models.Index(condition=models.Q(('waitlist_count__gt', 0)), fields=['id'], name='offering_waitlisted_idx'),
+        ),
+    ]
@@ -1,3 +1,105 @@
+from django.conf import settings
 from django.db import models
+from django.core.exceptions import ValidationError
 
-# Create your models here.
+
+class Offering(models.Model):
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.PROTECT,
+        related_name="offerings"
+    )
+
+    term = models.ForeignKey(
+        "terms.Term",
+        on_delete=models.PROTECT,
+        related_name="offerings"
+    )
+
+    professor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        limit_choices_to={"role": "professor"},
+        related_name="offerings"
+    )
+
+    section = models.PositiveSmallIntegerField(default=1)
+
+    capacity = models.PositiveIntegerField()
+
+    # شمارنده ظرفیت پرشده؛ فقط با UPDATE شرطی در registration.services تغییر می‌کند
+    enrolled_count = models.PositiveIntegerField(default=0)
+
+    # طول صف انتظار؛ مثل enrolled_count فقط در registration.services تغییر می‌کند
+    waitlist_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["term", "course", "section"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "term", "section"],
+                name="unique_offering_section"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(enrolled_count__lte=models.F("capacity")),
+                name="offering_not_oversold"
+            ),
+        ]
+        indexes = [
+            # worker ارتقای صف فقط ارائه‌های دارای صف انتظار را پیمایش می‌کند
+            models.Index(fields=["id"], condition=models.Q(waitlist_count__gt=0), name="offering_waitlisted_idx"),
+        ]
+
+    @property
+    def seats_left(self):
+        return self.capacity - self.enrolled_count
+
+    def clean(self):
+        if self.capacity < self.enrolled_count:
+            raise ValidationError("capacity cannot be lower than the number of enrolled students.")
+
+    def __str__(self):
+        return f"{self.course.code}-{self.section} ({self.term})"
+
+
+class MeetingSlot(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, "Saturday"),
+        (1, "Sunday"),
+        (2, "Monday"),
+        (3, "Tuesday"),
+        (4, "Wednesday"),
+        (5, "Thursday"),
+        (6, "Friday"),
+    ]
+
+    offering = models.ForeignKey(
+        Offering,
+        on_delete=models.CASCADE,
+        related_name="meeting_slots"
+    )
+
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ["weekday", "start_time"]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(start_time__lt=models.F("end_time")),
+                name="meeting_slot_start_before_end"
+            )
+        ]
+
+    def clean(self):
+        if self.start_time >= self.end_time:
+            raise ValidationError("start_time must be before end_time.")
+
+    def __str__(self):
+        return f"{self.get_weekday_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
@@ -0,0 +1,8 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsOfferingProfessorOrAdmin(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        if request.user.role == "admin":
+            return True
+        return request.user.role == "professor" and obj.professor_id == request.user.pk
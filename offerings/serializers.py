@@ -0,0 +1,46 @@
+from django.db import transaction
+from rest_framework import serializers
+from .models import Offering, MeetingSlot
+
+
+class MeetingSlotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MeetingSlot
+        fields = ["weekday", "start_time", "end_time"]
+
+    def validate(self, data):
+        if data["start_time"] >= data["end_time"]:
+            raise serializers.ValidationError("start_time must be before end_time.")
+        return data
+
+
+class OfferingSerializer(serializers.ModelSerializer):
+    meeting_slots = MeetingSlotSerializer(many=True, required=False)
+
+    class Meta:
+        model = Offering
+        fields = [
+            "id", "course", "term", "professor", "section",
+            "capacity", "enrolled_count", "waitlist_count", "meeting_slots",
+        ]
+        read_only_fields = ["enrolled_count", "waitlist_count"]
+
+    @transaction.atomic
+    def create(self, validated_data):
+        slots = validated_data.pop("meeting_slots", [])
+        offering = super().create(validated_data)
+        self._save_slots(offering, slots)
+        return offering
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        slots = validated_data.pop("meeting_slots", None)
+        offering = super().update(instance, validated_data)
+        if slots is not None:
+            offering.meeting_slots.all().delete()
+            self._save_slots(offering, slots)
+        return offering
+
+    def _save_slots(self, offering, slots):
+        for slot in slots:
+            MeetingSlot.objects.create(offering=offering, **slot)
@@ -1,3 +1,90 @@
-from django.test import TestCase
+from datetime import date, time
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from courses.models import Course
+from registration.services import RegistrationError, enroll
+from terms.models import Term
+from .models import Offering, MeetingSlot
+from .timetable import TimetableIndex, conflict_pairs
+
+
+class TimetableIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = TimetableIndex.from_slots([
+            (0, 480, 570, 1),     # 8:00-9:30
+            (0, 600, 690, 2),     # 10:00-11:30
+            (2, 480, 570, 3),
+        ])
+
+    def test_conflicts(self):
+        self.assertEqual(self.index.conflicts(0, 540, 620), [1, 2])
+        self.assertEqual(self.index.conflicts(0, 570, 600), [])      # بازه‌های مجاور تداخل ندارند
+        self.assertEqual(self.index.conflicts(1, 480, 570), [])
+        self.assertEqual(self.index.conflicts_with_slots([(0, 650, 700), (2, 500, 510)]), [2, 3])
+
+    def test_conflict_pairs(self):
+        slots = [
+            (0, 480, 570, 1), (0, 540, 600, 2), (0, 590, 700, 3),
+            (1, 480, 570, 1), (1, 480, 570, 4),
+        ]
+        self.assertEqual(conflict_pairs(slots), [(1, 2), (1, 4), (2, 3)])
+
+
+class OfferingConflictTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.term = Term.objects.create(
+            name="1405-1", start_date=date(2026, 9, 1), end_date=date(2027, 1, 1), status=Term.ADD_DROP
+        )
+        self.student = User.objects.create_user(username="s1", role="student", student_id="s1")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.student)}"
+        self.a = self.make_offering("CS101", 0, time(8), time(10))
+        self.b = self.make_offering("CS102", 0, time(9), time(11))
+        self.c = self.make_offering("CS103", 1, time(9), time(11))
+
+    def make_offering(self, code, weekday, start, end):
+        course = Course.objects.create(code=code, title=code, units=3)
+        offering = Offering.objects.create(course=course, term=self.term, capacity=10)
+        MeetingSlot.objects.create(offering=offering, weekday=weekday, start_time=start, end_time=end)
+        return offering
+
+    def test_enroll_rejects_time_conflict(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enroll(self.student, self.a)
+        with self.assertRaises(RegistrationError) as ctx:
+            enroll(self.student, self.b)
+        self.assertEqual(ctx.exception.code, "time_conflict")
+        enroll(self.student, self.c)
+
+    def test_enroll_ignores_stale_cached_index(self):
+        # ایندکس کش‌شده قبل از ثبت‌نام ساخته شده و invalidate آن (مثل پروسه‌ای دیگر) اجرا نمی‌شود
+        self.client.get("/api/offerings/conflicts/", {"term": self.term.pk})
+        enroll(self.student, self.a)
+        with self.assertRaises(RegistrationError) as ctx:
+            enroll(self.student, self.b)
+        self.assertEqual(ctx.exception.code, "time_conflict")
+
+    def test_conflict_matrix(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enroll(self.student, self.a)
+
+        response = self.client.get("/api/offerings/conflicts/", {"term": self.term.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["pairs"], [(self.a.pk, self.b.pk)])
+        self.assertEqual(response.data["enrolled"], {self.b.pk: [self.a.pk]})
+
+    def test_slot_change_invalidates_cached_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enroll(self.student, self.a)
+        response = self.client.get("/api/offerings/conflicts/", {"term": self.term.pk})
+        self.assertIn(self.b.pk, response.data["enrolled"])
+
+        slot = self.a.meeting_slots.get()
+        slot.weekday = 3
+        slot.save()
+        response = self.client.get("/api/offerings/conflicts/", {"term": self.term.pk})
+        self.assertEqual(response.data["enrolled"], {})
@@ -0,0 +1,137 @@
+from bisect import bisect_right, insort
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import MeetingSlot
+
+
+def to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class TimetableIndex:
+    """
+    ایندکس بازه‌ای زمان جلسات یک دانشجو.
+
+    برای هر روز هفته بازه‌ها مرتب و بدون هم‌پوشانی نگه داشته می‌شوند؛ پس انتهای بازه‌ها هم
+    مرتب است و بررسی تداخل یک بازه جدید با یک جستجوی دودویی (O(log n)) انجام می‌شود.
+    """
+
+    def __init__(self):
+        self.days = defaultdict(list)   # weekday -> [(start, end, offering_id), ...]
+
+    @classmethod
+    def from_slots(cls, slots):
+        index = cls()
+        for weekday, start, end, offering_id in slots:
+            index.add(weekday, start, end, offering_id)
+        return index
+
+    def add(self, weekday, start, end, offering_id):
+        insort(self.days[weekday], (start, end, offering_id))
+
+    def conflicts(self, weekday, start, end):
+        intervals = self.days.get(weekday)
+        if not intervals:
+            return []
+
+        # اولین بازه‌ای که بعد از شروع بازه جدید تمام می‌شود
+        i = bisect_right(intervals, start, key=lambda iv: iv[1])
+        found = []
+        while i < len(intervals) and intervals[i][0] < end:
+            found.append(intervals[i][2])
+            i += 1
+        return found
+
+    def conflicts_with_slots(self, slots):
+        """slots: [(weekday, start, end), ...]; شناسه ارائه‌های متداخل را برمی‌گرداند."""
+        found = set()
+        for weekday, start, end in slots:
+            found.update(self.conflicts(weekday, start, end))
+        return sorted(found)
+
+
+def slot_tuples(queryset):
+    return [
+        (weekday, to_minutes(start), to_minutes(end), offering_id)
+        for weekday, start, end, offering_id in queryset.values_list(
+            "weekday", "start_time", "end_time", "offering_id"
+        )
+    ]
+
+
+# ---------- per-student cached index ----------
+
+VERSION_KEY = "timetable:version"
+
+
+def _cache_key(student_id, term_id):
+    version = cache.get_or_set(VERSION_KEY, 1, None)
+    return f"timetable:{version}:{student_id}:{term_id}"
+
+
+def enrolled_slots(student_id, term_id):
+    from registration.models import Enrollment
+
+    return slot_tuples(MeetingSlot.objects.filter(
+        offering__term_id=term_id,
+        offering__enrollments__student_id=student_id,
+        offering__enrollments__status=Enrollment.ENROLLED,
+    ))
+
+
+def student_timetable(student_id, term_id):
+    """
+    ایندکس دانشجو را از کش برمی‌گرداند و در صورت نبودن با یک کوئری می‌سازد.
+
+    کش درون‌پروسه است و invalidate فقط در پروسه ثبت‌نام‌کننده اجرا می‌شود؛ پس این ایندکس فقط برای
+    خواندن (ماتریس تداخل) است و حداکثر TIMETABLE_CACHE_TTL ثانیه کهنه می‌ماند. enroll تداخل را
+    مستقیما از enrolled_slots زیر قفل بار ترم بررسی می‌کند.
+    """
+    key = _cache_key(student_id, term_id)
+    index = cache.get(key)
+    if index is None:
+        index = TimetableIndex.from_slots(enrolled_slots(student_id, term_id))
+        cache.set(key, index, getattr(settings, "TIMETABLE_CACHE_TTL", 60))
+    return index
+
+
+def invalidate_student_timetable(student_id, term_id):
+    cache.delete(_cache_key(student_id, term_id))
+
+
+@receiver([post_save, post_delete], sender=MeetingSlot)
+def _meeting_slots_changed(sender, **kwargs):
+    # تغییر برنامه یک ارائه روی ایندکس همه دانشجویان اثر دارد؛ نسخه کلیدها عوض می‌شود
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+# ---------- conflict matrix ----------
+
+def conflict_pairs(slots):
+    """
+    جفت ارائه‌های متداخل بین مجموعه‌ای از جلسات با یک sweep روی هر روز (O(n log n + k)).
+    slots: [(weekday, start, end, offering_id), ...]
+    """
+    by_day = defaultdict(list)
+    for weekday, start, end, offering_id in slots:
+        by_day[weekday].append((start, end, offering_id))
+
+    pairs = set()
+    for intervals in by_day.values():
+        intervals.sort()
+        active = []
+        for start, end, offering_id in intervals:
+            active = [iv for iv in active if iv[0] > start]
+            for _, other_id in active:
+                if other_id != offering_id:
+                    pairs.add(tuple(sorted((offering_id, other_id))))
+            active.append((end, offering_id))
+    return sorted(pairs)
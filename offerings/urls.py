@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .views import OfferingViewSet
+
+router = DefaultRouter()
+router.register("", OfferingViewSet, basename="offerings")
+
+urlpatterns = router.urls
@@ -1,3 +1,54 @@
-from django.shortcuts import render
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from departments.permissions import IsAdminOrReadOnly
+from .models import Offering, MeetingSlot
+from .serializers import OfferingSerializer
+from .timetable import conflict_pairs, slot_tuples, student_timetable
+
+
+class OfferingViewSet(viewsets.ModelViewSet):
+    queryset = Offering.objects.prefetch_related("meeting_slots")
+    serializer_class = OfferingSerializer
+    permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        term = self.request.query_params.get("term")
+        if term and term.isdigit():
+            queryset = queryset.filter(term_id=term)
+        return queryset
+
+    @action(detail=False, methods=["get"])
+    def conflicts(self, request):
+        """
+        ماتریس تداخل برای برنامه‌ساز فرانت‌اند در یک درخواست:
+        جفت‌های متداخل بین ارائه‌های خواسته‌شده و، برای دانشجو، تداخل هر ارائه با برنامه فعلی او.
+        """
+        term = request.query_params.get("term")
+        if not term or not term.isdigit():
+            return Response({"detail": "term is required"}, status=400)
+
+        slots = MeetingSlot.objects.filter(offering__term_id=term)
+        ids = request.query_params.get("offerings")
+        if ids:
+            try:
+                slots = slots.filter(offering_id__in=[int(i) for i in ids.split(",")])
+            except ValueError:
+                return Response({"detail": "offerings must be a comma separated id list"}, status=400)
+
+        slots = slot_tuples(slots)
+        data = {"pairs": conflict_pairs(slots)}
+
+        if getattr(request.user, "role", None) == "student":
+            index = student_timetable(request.user.pk, int(term))
+            enrolled = {}
+            for weekday, start, end, offering_id in slots:
+                hits = [o for o in index.conflicts(weekday, start, end) if o != offering_id]
+                if hits:
+                    enrolled.setdefault(offering_id, set()).update(hits)
+            data["enrolled"] = {k: sorted(v) for k, v in enrolled.items()}
+
+        return Response(data)
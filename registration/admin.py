@@ -1,3 +1,22 @@
 from django.contrib import admin
+from .models import Enrollment, StudentTermLoad, WaitlistEntry
 
-# Register your models here.
+
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+    list_display = ("student", "offering", "status", "created_at")
+    list_filter = ("status",)
+    raw_id_fields = ("student", "offering")
+
+
+@admin.register(StudentTermLoad)
+class StudentTermLoadAdmin(admin.ModelAdmin):
+    list_display = ("student", "term", "units")
+    raw_id_fields = ("student",)
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ("student", "offering", "status", "position", "created_at")
+    list_filter = ("status",)
+    raw_id_fields = ("student", "offering", "enrollment")
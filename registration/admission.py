@@ -0,0 +1,157 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from terms.resolver import terms
+
+
+def _setting(name, default):
+    # هنگام هر درخواست خوانده می‌شود تا override_settings اثر کند
+    return getattr(settings, name, default)
+
+
+def _year(value):
+    prefix = (value or "")[:4]
+    return int(prefix) if len(prefix) == 4 and prefix.isdigit() else None
+
+
+def _jalali_year(day):
+    """سال شمسی یک تاریخ میلادی (الگوریتم jdf، فقط بخش سال)."""
+    days_before_month = [0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+    year = day.year + 1 if day.month > 2 else day.year
+    days = (
+        355666 + 365 * day.year + (year + 3) // 4 - (year + 99) // 100 + (year + 399) // 400
+        + day.day + days_before_month[day.month - 1]
+    )
+    jalali = -1595 + 33 * (days // 12053)
+    days %= 12053
+    jalali += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        jalali += (days - 1) // 365
+    return jalali
+
+
+def _term_year(term, entry):
+    """سال شروع ترم به همان تقویم شماره دانشجویی: ورودی‌های مثل 1401 شمسی‌اند و 2022 میلادی."""
+    return _jalali_year(term.start_date) if entry < 1700 else term.start_date.year
+
+
+def cohort(user):
+    """ورودی دانشجو: سال اول شماره دانشجویی (مثل 1401xxxxxxx)؛ شماره‌های دیگر یک ورودی مشترک دارند."""
+    year = _year(user.student_id)
+    return str(year) if year else "other"
+
+
+def slot_opens_at(user, term):
+    """
+    زمان شروع نوبت ثبت‌نام دانشجو در ترم.
+
+    نوبت از سابقه ورودی نسبت به سال شروع ترم (start_date، نه نام آزاد ترم) به دست می‌آید: هرچه قدیمی‌تر، زودتر؛
+    ورودی ناشناخته آخرین نوبت را می‌گیرد. داخل هر نوبت، شروع هر دانشجو بر اساس شناسه‌اش تا
+    REGISTRATION_SLOT_SPREAD_SECONDS پخش می‌شود تا همه یک ورودی در یک ثانیه نرسند.
+    """
+    count = _setting("REGISTRATION_SLOT_COUNT", 4)
+    entry = _year(user.student_id)
+    index = count - 1
+    if entry is not None:
+        index = min(max(count - 1 - (_term_year(term, entry) - entry), 0), count - 1)
+    spread = _setting("REGISTRATION_SLOT_SPREAD_SECONDS", 60)
+    offset = index * _setting("REGISTRATION_SLOT_MINUTES", 30) * 60 + (user.pk % spread if spread else 0)
+    return term.registration_opens_at + timedelta(seconds=offset)
+
+
+class TokenBucket:
+    def __init__(self, capacity, now):
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, capacity, rate, now):
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait(self, rate):
+        """ثانیه‌های لازم تا توکن بعدی؛ 0 اگر توکن هست."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / rate
+
+
+class AdmissionController:
+    """
+    token bucket های درون‌پروسه؛ ظرفیت سطل حداکثر نوشتن‌های هم‌زمان (burst) و نرخ پر شدن، نوشتن پایدار
+    در ثانیه است. هر درخواست از سطل خود دانشجو و سطل ورودی‌اش با هم توکن برمی‌دارد، یا از هیچ‌کدام:
+    دانشجویی که سطل خودش خالی است سهمی از سطل ورودی مصرف نمی‌کند و نمی‌تواند هم‌ورودی‌هایش را گرسنه
+    نگه دارد. هیچ وضعیتی در پایگاه‌داده یا کش مشترک نیست، پس سقف واقعی به اندازه تعداد پروسه‌ها ضرب می‌شود.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, *limits):
+        """limits: (کلید، ظرفیت، نرخ) ها. 0 یعنی پذیرفته شد، وگرنه ثانیه‌های لازم تا پذیرش."""
+        now = time.monotonic()
+        with self._lock:
+            buckets = []
+            for key, capacity, rate in limits:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(capacity, now)
+                bucket.refill(capacity, rate, now)
+                buckets.append((bucket, rate))
+            wait = max(bucket.wait(rate) for bucket, rate in buckets)
+            if wait:
+                return wait
+            for bucket, _ in buckets:
+                bucket.tokens -= 1
+            return 0.0
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+admission = AdmissionController()
+
+
+class RegistrationAdmissionThrottle(BaseThrottle):
+    """
+    کنترل ورود نوشتن‌های ثبت‌نام دانشجو: در بازه ثبت‌نام اولیه، پیش از نوبت دانشجو و بعد از آن وقتی
+    سطل خودش یا سطل ورودی‌اش خالی است، بلافاصله ۴۲۹ با Retry-After برمی‌گردد و درخواست به قفل‌های
+    پایگاه‌داده نمی‌رسد. ترم از TermResolver و کاربر از احراز هویت خوانده می‌شود؛ کوئری اضافه‌ای ندارد.
+    تکرار درخواستی با Idempotency-Key که قبلا انجام شده پیش از این throttle پاسخ ذخیره‌شده را می‌گیرد.
+    """
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        if request.method in SAFE_METHODS or getattr(request.user, "role", None) != "student":
+            return True
+
+        term = terms.registering()
+        if term is not None and term.registration_opens_at is not None:
+            now = timezone.now()
+            opens_at = slot_opens_at(request.user, term)
+            if now < opens_at:
+                self.retry_after = (opens_at - now).total_seconds()
+                return False
+
+        user_limit = (
+            f"user:{request.user.pk}",
+            _setting("REGISTRATION_USER_BURST", 5), _setting("REGISTRATION_USER_RATE", 1.0),
+        )
+        cohort_limit = (
+            f"cohort:{cohort(request.user)}",
+            _setting("REGISTRATION_COHORT_BURST", 20), _setting("REGISTRATION_COHORT_RATE", 10.0),
+        )
+        wait = admission.acquire(user_limit, cohort_limit)
+        if wait:
+            self.retry_after = wait
+            return False
+        return True
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,102 @@
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from accounts.models import User
+from courses.models import Course
+from offerings.models import Offering
+from registration.models import Enrollment, StudentTermLoad
+from registration.services import RegistrationError, enroll
+from terms.models import Term
+
+
+class Command(BaseCommand):
+    help = "Concurrent add storm against a few sections; checks for overselling and reports registrations/sec."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=2000)
+        parser.add_argument("--sections", type=int, default=5)
+        parser.add_argument("--capacity", type=int, default=150)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--keep", action="store_true", help="Keep the generated rows.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        term = Term.objects.create(
+            name=f"bench-{tag}", start_date=date(2000, 1, 1), end_date=date(2000, 6, 1), status=Term.ADD_DROP
+        )
+        offerings = []
+        for i in range(options["sections"]):
+            course = Course.objects.create(code=f"B{tag}{i}", title=f"Bench {tag} {i}", units=1)
+            offerings.append(Offering.objects.create(course=course, term=term, capacity=options["capacity"]))
+
+        User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}", role="student", student_id=f"{tag}{i}", password="!")
+            for i in range(options["students"])
+        )
+        students = list(User.objects.filter(username__startswith=f"bench-{tag}-"))
+
+        jobs = [(s, o) for s in students for o in offerings]
+        cursor = iter(jobs)
+        cursor_lock = threading.Lock()
+        stats = {"ok": 0, "rejected": 0, "retries": 0}
+
+        def worker():
+            try:
+                while True:
+                    with cursor_lock:
+                        job = next(cursor, None)
+                    if job is None:
+                        return
+                    while True:
+                        try:
+                            enroll(*job)
+                            key = "ok"
+                            break
+                        except RegistrationError:
+                            key = "rejected"
+                            break
+                        except OperationalError:
+                            with cursor_lock:
+                                stats["retries"] += 1
+                            time.sleep(0.001)
+                    with cursor_lock:
+                        stats[key] += 1
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        try:
+            for offering in offerings:
+                offering.refresh_from_db()
+                active = Enrollment.objects.filter(offering=offering, status=Enrollment.ENROLLED).count()
+                if active != offering.enrolled_count or active > offering.capacity:
+                    raise CommandError(
+                        f"Oversold {offering}: counter={offering.enrolled_count} rows={active} capacity={offering.capacity}"
+                    )
+
+            self.stdout.write(
+                f"{len(jobs)} attempts in {elapsed:.2f}s with {options['threads']} threads "
+                f"({len(jobs) / elapsed:.0f} attempts/s, {stats['ok'] / elapsed:.0f} registrations/s); "
+                f"ok={stats['ok']} rejected={stats['rejected']} lock_retries={stats['retries']}"
+            )
+            self.stdout.write(self.style.SUCCESS("No overselling detected."))
+        finally:
+            if not options["keep"]:
+                Enrollment.objects.filter(offering__term=term).delete()
+                StudentTermLoad.objects.filter(term=term).delete()
+                Offering.objects.filter(term=term).delete()
+                Course.objects.filter(code__startswith=f"B{tag}").delete()
+                term.delete()
+                User.objects.filter(username__startswith=f"bench-{tag}-").delete()
@@ -0,0 +1,136 @@
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from accounts.models import User
+from courses.models import Course
+from notifications.models import OutboxMessage
+from offerings.models import Offering
+from registration.models import Enrollment, StudentTermLoad, WaitlistEntry
+from registration.services import drop, enroll, join_waitlist, promote_waitlists
+from terms.models import Term
+
+
+def retrying(fn, *args, **kwargs):
+    # SQLite قفل پایگاه‌داده را به‌جای انتظار برمی‌گرداند
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError:
+            time.sleep(0.001)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill a few sections, queue students on their waitlists, then drop seats from many threads while a "
+        "promotion worker runs; checks queue order and seat counters and reports promotions/sec."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sections", type=int, default=5)
+        parser.add_argument("--capacity", type=int, default=100)
+        parser.add_argument("--waitlist", type=int, default=50)
+        parser.add_argument("--drops", type=int, default=40, help="Seats dropped per section.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--batch-size", type=int, default=100)
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        sections, capacity, waitlist = options["sections"], options["capacity"], options["waitlist"]
+        drops = min(options["drops"], capacity)
+        term = Term.objects.create(
+            name=f"bench-{tag}", start_date=date(2000, 1, 1), end_date=date(2000, 6, 1), status=Term.ADD_DROP
+        )
+        User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}", role="student", student_id=f"{tag}{i}", password="!")
+            for i in range(capacity + waitlist)
+        )
+        students = list(User.objects.filter(username__startswith=f"bench-{tag}-").order_by("pk"))
+        seated, queued = students[:capacity], students[capacity:]
+
+        try:
+            offerings, jobs = [], []
+            for i in range(sections):
+                course = Course.objects.create(code=f"W{tag}{i}", title=f"Bench {tag} {i}", units=1)
+                offering = Offering.objects.create(course=course, term=term, capacity=capacity)
+                enrollments = [enroll(s, offering) for s in seated]
+                for student in queued:
+                    join_waitlist(student, offering)
+                offerings.append(offering)
+                jobs += [(e.student, e.pk) for e in enrollments[:drops]]
+
+            cursor = iter(jobs)
+            cursor_lock = threading.Lock()
+            done = threading.Event()
+            totals = {"promoted": 0, "passes": 0}
+
+            def dropper():
+                try:
+                    while True:
+                        with cursor_lock:
+                            job = next(cursor, None)
+                        if job is None:
+                            return
+                        retrying(drop, *job)
+                finally:
+                    connection.close()
+
+            def promoter():
+                try:
+                    while True:
+                        finished = done.is_set()
+                        promoted, _ = retrying(promote_waitlists, batch_size=options["batch_size"])
+                        totals["promoted"] += promoted
+                        totals["passes"] += 1
+                        if finished:
+                            return
+                finally:
+                    connection.close()
+
+            started = time.perf_counter()
+            worker = threading.Thread(target=promoter)
+            worker.start()
+            threads = [threading.Thread(target=dropper) for _ in range(options["threads"])]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            done.set()
+            worker.join()
+            elapsed = time.perf_counter() - started
+
+            expected = min(drops, waitlist)
+            for offering in offerings:
+                offering.refresh_from_db()
+                active = Enrollment.objects.filter(offering=offering, status=Enrollment.ENROLLED).count()
+                if not offering.enrolled_count == active == capacity - drops + expected:
+                    raise CommandError(f"{offering}: counter={offering.enrolled_count} rows={active}")
+                promoted = set(WaitlistEntry.objects.filter(
+                    offering=offering, status=WaitlistEntry.PROMOTED
+                ).values_list("student_id", flat=True))
+                if promoted != {s.pk for s in queued[:expected]}:
+                    raise CommandError(f"{offering}: seats were not given out in queue order")
+                positions = list(WaitlistEntry.objects.filter(
+                    offering=offering, status=WaitlistEntry.WAITING
+                ).order_by("position").values_list("position", flat=True))
+                if positions != list(range(1, waitlist - expected + 1)) or offering.waitlist_count != len(positions):
+                    raise CommandError(f"{offering}: waitlist positions are not contiguous")
+
+            self.stdout.write(
+                f"{len(jobs)} drops from {options['threads']} threads, {totals['promoted']} promotions in "
+                f"{totals['passes']} worker passes, {elapsed:.2f}s ({totals['promoted'] / elapsed:.0f} promotions/s)"
+            )
+            self.stdout.write(self.style.SUCCESS("Queue order and seat counters are consistent."))
+        finally:
+            OutboxMessage.objects.filter(recipient__username__startswith=f"bench-{tag}-").delete()
+            WaitlistEntry.objects.filter(offering__term=term).delete()
+            Enrollment.objects.filter(offering__term=term).delete()
+            StudentTermLoad.objects.filter(term=term).delete()
+            Offering.objects.filter(term=term).delete()
+            Course.objects.filter(code__startswith=f"W{tag}").delete()
+            term.delete()
+            User.objects.filter(username__startswith=f"bench-{tag}-").delete()
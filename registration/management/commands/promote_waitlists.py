@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from registration.services import promote_waitlists
+
+
+class Command(BaseCommand):
+    help = "Enroll waitlisted students into freed seats, in queue order."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Keep running as a background worker, checking every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            promoted, skipped = promote_waitlists(batch_size=options["batch_size"])
+            if promoted or skipped:
+                self.stdout.write(f"promoted={promoted} skipped={skipped}")
+            if not options["interval"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
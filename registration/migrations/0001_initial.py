@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offerings', '0001_initial'),
+        ('terms', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Enrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('enrolled', 'Enrolled'), ('dropped', 'Dropped')], default='enrolled', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('dropped_at', models.DateTimeField(blank=True, null=True)),
+                ('offering', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='offerings.offering')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['student', 'status'], name='enrollment_student_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'enrolled')), fields=('student', 'offering'), name='unique_active_enrollment')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentTermLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units', models.PositiveSmallIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_loads', to=settings.AUTH_USER_MODEL)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_loads', to='terms.term')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('student', 'term'), name='unique_student_term_load')],
+            },
+        ),
+    ]
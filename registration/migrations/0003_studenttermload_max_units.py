@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('registration', '0002_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studenttermload',
+            name='max_units',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
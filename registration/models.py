@@ -1,3 +1,141 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class Enrollment(models.Model):
+    ENROLLED = "enrolled"
+    DROPPED = "dropped"
+    STATUS_CHOICES = [
+        (ENROLLED, "Enrolled"),
+        (DROPPED, "Dropped"),
+    ]
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="enrollments"
+    )
+
+    offering = models.ForeignKey(
+        "offerings.Offering",
+        on_delete=models.PROTECT,
+        related_name="enrollments"
+    )
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=ENROLLED)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    dropped_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # یک دانشجو فقط یک ثبت‌نام فعال در هر ارائه می‌تواند داشته باشد
+            models.UniqueConstraint(
+                fields=["student", "offering"],
+                condition=models.Q(status="enrolled"),
+                name="unique_active_enrollment"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["student", "status"], name="enrollment_student_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} -> {self.offering} ({self.status})"
+
+
+class StudentTermLoad(models.Model):
+    """
+    مجموع واحدهای فعال دانشجو در یک ترم؛ سقف واحد با UPDATE شرطی روی همین ردیف کنترل می‌شود.
+    max_units سقف اختصاصی دانشجو در این ترم است (درخواست اضافه واحد تاییدشده)؛ خالی یعنی سقف عمومی.
+    """
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="term_loads"
+    )
+
+    term = models.ForeignKey(
+        "terms.Term",
+        on_delete=models.CASCADE,
+        related_name="student_loads"
+    )
+
+    units = models.PositiveSmallIntegerField(default=0)
+    max_units = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "term"],
+                name="unique_student_term_load"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.term}: {self.units}"
+
+
+class WaitlistEntry(models.Model):
+    """
+    نوبت دانشجو در صف انتظار یک ارائه پر.
+
+    position شماره فعلی در صف (از ۱) است و با هر خروج از صف برای ردیف‌های پشت سر با یک UPDATE
+    جابه‌جا می‌شود؛ خواندن جایگاه (پرتکرارترین عمل) فقط خواندن همین ستون است.
+    """
+    WAITING = "waiting"
+    PROMOTED = "promoted"
+    SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (WAITING, "Waiting"),
+        (PROMOTED, "Promoted"),
+        (SKIPPED, "Skipped"),
+        (CANCELLED, "Cancelled"),
+    ]
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries"
+    )
+
+    offering = models.ForeignKey(
+        "offerings.Offering",
+        on_delete=models.CASCADE,
+        related_name="waitlist"
+    )
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=WAITING)
+    position = models.PositiveIntegerField(null=True, blank=True)
+
+    # ثبت‌نامی که با ارتقا ساخته شد، یا دلیل رد شدن هنگام ارتقا
+    enrollment = models.OneToOneField(
+        Enrollment,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="waitlist_entry"
+    )
+    reason = models.CharField(max_length=30, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["offering", "position"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "offering"],
+                condition=models.Q(status="waiting"),
+                name="unique_waiting_entry"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["offering", "status", "position"], name="waitlist_queue_idx"),
+            models.Index(fields=["student", "status"], name="waitlist_student_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} -> {self.offering} ({self.status} #{self.position})"
@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from offerings.models import Offering
+from .models import Enrollment, WaitlistEntry
+
+
+class EnrollmentSerializer(serializers.ModelSerializer):
+    course_code = serializers.CharField(source="offering.course.code", read_only=True)
+    units = serializers.IntegerField(source="offering.course.units", read_only=True)
+    term = serializers.IntegerField(source="offering.term_id", read_only=True)
+
+    class Meta:
+        model = Enrollment
+        fields = ["id", "offering", "course_code", "units", "term", "status", "created_at", "dropped_at"]
+        read_only_fields = ["status", "created_at", "dropped_at"]
+
+
+class EnrollRequestSerializer(serializers.Serializer):
+    offering = serializers.PrimaryKeyRelatedField(
+        queryset=Offering.objects.select_related("course")
+    )
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    course_code = serializers.CharField(source="offering.course.code", read_only=True)
+    term = serializers.IntegerField(source="offering.term_id", read_only=True)
+    waitlist_length = serializers.IntegerField(source="offering.waitlist_count", read_only=True)
+
+    class Meta:
+        model = WaitlistEntry
+        fields = ["id", "offering", "course_code", "term", "status", "position", "waitlist_length", "created_at"]
+        read_only_fields = ["status", "position", "created_at"]
@@ -0,0 +1,300 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from offerings.models import Offering
+from offerings.timetable import TimetableIndex, enrolled_slots, invalidate_student_timetable, slot_tuples
+from notifications.services import notify
+from terms.resolver import terms
+from .models import Enrollment, StudentTermLoad, WaitlistEntry
+
+
+class RegistrationError(Exception):
+    status_code = 400
+
+    def __init__(self, detail, code, status_code=None):
+        super().__init__(detail)
+        self.detail = detail
+        self.code = code
+        if status_code is not None:
+            self.status_code = status_code
+
+
+def max_units():
+    return getattr(settings, "REGISTRATION_MAX_UNITS", 20)
+
+
+def waitlist_limit():
+    return getattr(settings, "REGISTRATION_WAITLIST_LIMIT", 50)
+
+
+def check_registration_open(term_id):
+    # از TermResolver خوانده می‌شود؛ روی مسیر داغ کوئری ندارد
+    if not terms.registration_open(term_id):
+        raise RegistrationError("Registration is not open for this term.", "registration_closed", 409)
+
+
+@transaction.atomic
+def enroll(student, offering, from_waitlist=False):
+    """
+    ثبت‌نام دانشجو در یک ارائه.
+
+    تمام قیدها با UPDATE شرطی روی شمارنده‌ها اعمال می‌شوند، نه با خواندن و نوشتن در پایتون:
+    اگر شرط برقرار نباشد هیچ ردیفی به‌روز نمی‌شود و کل تراکنش برگشت می‌خورد.
+    تا صف انتظار ارائه خالی نشده، صندلی آزاد فقط با from_waitlist (ارتقای صف) گرفته می‌شود.
+    بیرون از بازه ثبت‌نام و حذف و اضافه فقط ارتقای صف (که پیش‌تر در بازه ثبت شده) ثبت‌نام می‌کند.
+    """
+    if not from_waitlist:
+        check_registration_open(offering.term_id)
+    units = offering.course.units
+
+    # UPDATE روی ردیف بار ترم، ثبت‌نام‌های هم‌زمانِ همان دانشجو را پشت سر هم قرار می‌دهد
+    load, _ = StudentTermLoad.objects.get_or_create(student=student, term_id=offering.term_id)
+    updated = StudentTermLoad.objects.filter(
+        pk=load.pk, units__lte=Coalesce(F("max_units"), Value(max_units())) - units
+    ).update(units=F("units") + units)
+    if not updated:
+        raise RegistrationError("Unit limit for this term would be exceeded.", "unit_limit")
+
+    already_taken = Enrollment.objects.filter(
+        student=student,
+        status=Enrollment.ENROLLED,
+        offering__course_id=offering.course_id,
+        offering__term_id=offering.term_id,
+    ).exists()
+    if already_taken:
+        raise RegistrationError("Already enrolled in this course for this term.", "duplicate", 409)
+
+    # برنامه فعلی از خود پایگاه داده و بعد از UPDATE بالا (زیر قفل ردیف بار ترم) خوانده می‌شود؛
+    # ایندکس کش‌شده ممکن است در پروسه دیگری کهنه باشد و برای این تصمیم قابل اعتماد نیست
+    slots = [slot[:3] for slot in slot_tuples(offering.meeting_slots.all())]
+    if slots and TimetableIndex.from_slots(enrolled_slots(student.pk, offering.term_id)).conflicts_with_slots(slots):
+        raise RegistrationError("Time conflict with another enrolled section.", "time_conflict", 409)
+
+    seats = Offering.objects.filter(pk=offering.pk, enrolled_count__lt=F("capacity"))
+    if not from_waitlist:
+        seats = seats.filter(waitlist_count=0)
+    updated = seats.update(enrolled_count=F("enrolled_count") + 1)
+    if not updated:
+        raise RegistrationError("This section is full.", "full", 409)
+
+    try:
+        with transaction.atomic():
+            enrollment = Enrollment.objects.create(student=student, offering=offering)
+    except IntegrityError:
+        raise RegistrationError("Already enrolled in this section.", "duplicate", 409)
+
+    transaction.on_commit(lambda: invalidate_student_timetable(student.pk, offering.term_id))
+    return enrollment
+
+
+@transaction.atomic
+def drop(student, enrollment_id):
+    """
+    حذف درس؛ تغییر وضعیت شرطی است تا درخواست‌های تکراری ظرفیت را دوبار آزاد نکنند.
+    """
+    updated = Enrollment.objects.filter(
+        pk=enrollment_id, student=student, status=Enrollment.ENROLLED
+    ).update(status=Enrollment.DROPPED, dropped_at=timezone.now())
+    if not updated:
+        raise RegistrationError("Active enrollment not found.", "not_found", 404)
+
+    enrollment = Enrollment.objects.select_related("offering__course").get(pk=enrollment_id)
+    offering = enrollment.offering
+    # بیرون از بازه، حذف فقط با درخواست حذف اضطراری (requests) ممکن است؛ خطا کل تراکنش را برمی‌گرداند
+    check_registration_open(offering.term_id)
+
+    Offering.objects.filter(pk=offering.pk).update(enrolled_count=F("enrolled_count") - 1)
+    StudentTermLoad.objects.filter(
+        student=student, term_id=offering.term_id
+    ).update(units=F("units") - offering.course.units)
+
+    transaction.on_commit(lambda: invalidate_student_timetable(student.pk, offering.term_id))
+    return enrollment
+
+
+def drop_many(enrollment_ids):
+    """
+    حذف دسته‌ای درس‌ها (مثلا حذف اضطراری تاییدشده)، داخل تراکنش فراخواننده.
+
+    به جای چند UPDATE برای هر ثبت‌نام، شمارنده ارائه‌ها و بار ترم دانشجوها هر کدام با یک UPDATE و
+    CASE کم می‌شوند. ثبت‌نام‌هایی که دیگر فعال نیستند نادیده گرفته می‌شوند؛ خروجی شناسه‌های حذف‌شده است.
+
+    اول UPDATE شرطی اجرا می‌شود و شمارنده‌ها فقط از ردیف‌هایی ساخته می‌شوند که همین UPDATE تغییر داده
+    (همان dropped_at)؛ اگر drop همزمان یکی از ثبت‌نام‌ها را زودتر حذف کرده باشد، ظرفیت دوبار آزاد نمی‌شود.
+    """
+    now = timezone.now()
+    if not Enrollment.objects.filter(pk__in=enrollment_ids, status=Enrollment.ENROLLED).update(
+        status=Enrollment.DROPPED, dropped_at=now
+    ):
+        return []
+    rows = list(
+        Enrollment.objects.filter(pk__in=enrollment_ids, status=Enrollment.DROPPED, dropped_at=now)
+        .values_list("pk", "student_id", "offering_id", "offering__term_id", "offering__course__units")
+    )
+    ids = [row[0] for row in rows]
+
+    seats, loads = {}, {}
+    for _, student_id, offering_id, term_id, units in rows:
+        seats[offering_id] = seats.get(offering_id, 0) + 1
+        loads[student_id, term_id] = loads.get((student_id, term_id), 0) + units
+
+    Offering.objects.filter(pk__in=seats).update(enrolled_count=F("enrolled_count") - Case(
+        *[When(pk=offering_id, then=Value(count)) for offering_id, count in seats.items()]
+    ))
+    load_ids = {
+        (student_id, term_id): pk for pk, student_id, term_id in StudentTermLoad.objects.filter(
+            student_id__in={student_id for student_id, _ in loads}, term_id__in={term_id for _, term_id in loads}
+        ).values_list("pk", "student_id", "term_id")
+    }
+    StudentTermLoad.objects.filter(pk__in=load_ids.values()).update(units=F("units") - Case(
+        *[When(pk=load_ids[key], then=Value(units)) for key, units in loads.items() if key in load_ids],
+        default=Value(0),
+    ))
+
+    def invalidate():
+        for student_id, term_id in loads:
+            invalidate_student_timetable(student_id, term_id)
+
+    transaction.on_commit(invalidate)
+    return ids
+
+
+# ---------- waitlist ----------
+
+@transaction.atomic
+def join_waitlist(student, offering):
+    """
+    ورود به صف انتظار یک ارائه پر.
+
+    جایگاه با UPDATE شرطی روی waitlist_count گرفته می‌شود؛ همان UPDATE ردیف ارائه را تا پایان تراکنش
+    قفل می‌کند، پس خواندن بعدی شمارنده، جایگاه همین دانشجو است.
+    """
+    check_registration_open(offering.term_id)
+    if Offering.objects.filter(pk=offering.pk, enrolled_count__lt=F("capacity"), waitlist_count=0).exists():
+        raise RegistrationError("This section has free seats; enroll directly.", "not_full", 409)
+
+    already_taken = Enrollment.objects.filter(
+        student=student,
+        status=Enrollment.ENROLLED,
+        offering__course_id=offering.course_id,
+        offering__term_id=offering.term_id,
+    ).exists()
+    if already_taken:
+        raise RegistrationError("Already enrolled in this course for this term.", "duplicate", 409)
+
+    updated = Offering.objects.filter(
+        pk=offering.pk, waitlist_count__lt=waitlist_limit()
+    ).update(waitlist_count=F("waitlist_count") + 1)
+    if not updated:
+        raise RegistrationError("The waitlist for this section is full.", "waitlist_full", 409)
+    position = Offering.objects.filter(pk=offering.pk).values_list("waitlist_count", flat=True).get()
+
+    try:
+        with transaction.atomic():
+            return WaitlistEntry.objects.create(student=student, offering=offering, position=position)
+    except IntegrityError:
+        raise RegistrationError("Already on the waitlist for this section.", "duplicate", 409)
+
+
+@transaction.atomic
+def leave_waitlist(student, entry_id):
+    """خروج از صف؛ ردیف‌های پشت سر با یک UPDATE یک جایگاه جلو می‌آیند."""
+    offering_id = WaitlistEntry.objects.filter(
+        pk=entry_id, student=student, status=WaitlistEntry.WAITING
+    ).values_list("offering_id", flat=True).first()
+    if offering_id is None:
+        raise RegistrationError("Waitlist entry not found.", "not_found", 404)
+
+    # قفل صف ارائه (مثل promote_offering) پیش از خواندن جایگاه
+    Offering.objects.filter(pk=offering_id).update(waitlist_count=F("waitlist_count") - 1)
+    position = WaitlistEntry.objects.filter(
+        pk=entry_id, status=WaitlistEntry.WAITING
+    ).values_list("position", flat=True).first()
+    if position is None:
+        # در همین فاصله ارتقا یافته است
+        raise RegistrationError("Waitlist entry not found.", "not_found", 404)
+
+    WaitlistEntry.objects.filter(pk=entry_id).update(
+        status=WaitlistEntry.CANCELLED, position=None, resolved_at=timezone.now()
+    )
+    WaitlistEntry.objects.filter(
+        offering_id=offering_id, status=WaitlistEntry.WAITING, position__gt=position
+    ).update(position=F("position") - 1)
+
+
+@transaction.atomic
+def promote_offering(offering_id, batch_size=100):
+    """
+    صندلی‌های آزاد یک ارائه را به ترتیب صف پر می‌کند، همه در یک تراکنش.
+
+    سر صف دسته‌دسته برداشته می‌شود و هر نفر با enroll (با همه قیدهایش) ثبت‌نام می‌شود؛ کسی که به
+    سقف واحد یا تداخل زمانی بخورد از صف خارج و مطلع می‌شود و صندلی به نفر بعدی می‌رسد.
+    خروجی: (ارتقا یافته‌ها، ردشده‌ها) به صورت لیست WaitlistEntry.
+    """
+    offering = Offering.objects.select_for_update().select_related("course").prefetch_related(
+        "meeting_slots"
+    ).get(pk=offering_id)
+    seats = offering.capacity - offering.enrolled_count
+    label = f"{offering.course.code}-{offering.section}"
+
+    promoted, skipped = [], []
+    while seats > 0:
+        entries = list(
+            WaitlistEntry.objects.filter(offering_id=offering_id, status=WaitlistEntry.WAITING)
+            .select_related("student").order_by("position")[:min(seats, batch_size)]
+        )
+        if not entries:
+            break
+
+        now = timezone.now()
+        for entry in entries:
+            try:
+                entry.enrollment = enroll(entry.student, offering, from_waitlist=True)
+                entry.status = WaitlistEntry.PROMOTED
+                promoted.append(entry)
+                seats -= 1
+            except RegistrationError as e:
+                entry.status, entry.reason = WaitlistEntry.SKIPPED, e.code
+                skipped.append(entry)
+            entry.position, entry.resolved_at = None, now
+
+        WaitlistEntry.objects.bulk_update(entries, ["status", "position", "enrollment", "reason", "resolved_at"])
+        # نفرات برداشته‌شده جایگاه‌های ۱ تا n بودند
+        WaitlistEntry.objects.filter(
+            offering_id=offering_id, status=WaitlistEntry.WAITING
+        ).update(position=F("position") - len(entries))
+        Offering.objects.filter(pk=offering_id).update(waitlist_count=F("waitlist_count") - len(entries))
+
+    if promoted:
+        notify(
+            [e.student_id for e in promoted], "waitlist_promoted", f"Enrolled in {label}",
+            body="A seat opened up and you were enrolled from the waitlist.", data={"offering": offering_id},
+        )
+    reasons = {}
+    for entry in skipped:
+        reasons.setdefault(entry.reason, []).append(entry.student_id)
+    for reason, student_ids in reasons.items():
+        notify(
+            student_ids, "waitlist_skipped", f"Removed from the {label} waitlist",
+            body="A seat opened up but you could not be enrolled.", data={"offering": offering_id, "reason": reason},
+        )
+    return promoted, skipped
+
+
+def promote_waitlists(batch_size=100):
+    """
+    کار worker پس‌زمینه: ارائه‌هایی که صف انتظار و صندلی آزاد دارند را پر می‌کند.
+    خروجی: (تعداد ارتقا یافته، تعداد ردشده).
+    """
+    offering_ids = list(
+        Offering.objects.filter(waitlist_count__gt=0, enrolled_count__lt=F("capacity")).values_list("pk", flat=True)
+    )
+    promoted = skipped = 0
+    for offering_id in offering_ids:
+        p, s = promote_offering(offering_id, batch_size)
+        promoted += len(p)
+        skipped += len(s)
+    return promoted, skipped
@@ -1,3 +1,446 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from courses.models import Course
+from offerings.models import Offering
+from terms.models import Term
+from notifications.models import OutboxMessage
+from terms.resolver import terms
+from .admission import admission, cohort, slot_opens_at
+from .models import Enrollment, StudentTermLoad, WaitlistEntry
+from .services import (
+    RegistrationError, drop, enroll, join_waitlist, leave_waitlist, promote_offering, promote_waitlists,
+)
+
+
+def make_offering(code="CS101", units=3, capacity=2, term=None):
+    term = term or Term.objects.get_or_create(
+        name="1405-1", defaults={"start_date": date(2026, 9, 1), "end_date": date(2027, 1, 1), "status": Term.ADD_DROP}
+    )[0]
+    course = Course.objects.create(code=code, title=f"Course {code}", units=units)
+    return Offering.objects.create(course=course, term=term, capacity=capacity)
+
+
+def make_student(username):
+    return User.objects.create_user(username=username, role="student", student_id=username)
+
+
+class EnrollmentServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student("s1")
+        self.offering = make_offering()
+
+    def test_enroll_updates_counters(self):
+        enroll(self.student, self.offering)
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 1)
+        self.assertEqual(StudentTermLoad.objects.get(student=self.student).units, 3)
+
+    def test_capacity_is_enforced(self):
+        enroll(make_student("s2"), self.offering)
+        enroll(make_student("s3"), self.offering)
+        with self.assertRaises(RegistrationError) as ctx:
+            enroll(self.student, self.offering)
+        self.assertEqual(ctx.exception.code, "full")
+        # رد شدن نباید بار ترم دانشجو را تغییر دهد
+        self.assertFalse(StudentTermLoad.objects.filter(student=self.student, units__gt=0).exists())
+
+    def test_duplicate_enrollment_is_rejected(self):
+        enroll(self.student, self.offering)
+        other_section = Offering.objects.create(
+            course=self.offering.course, term=self.offering.term, section=2, capacity=5
+        )
+        for offering in (self.offering, other_section):
+            with self.assertRaises(RegistrationError) as ctx:
+                enroll(self.student, offering)
+            self.assertEqual(ctx.exception.code, "duplicate")
+
+    def test_unit_limit_is_enforced(self):
+        with self.settings(REGISTRATION_MAX_UNITS=5):
+            enroll(self.student, self.offering)
+            with self.assertRaises(RegistrationError) as ctx:
+                enroll(self.student, make_offering("CS102", units=3, term=self.offering.term))
+        self.assertEqual(ctx.exception.code, "unit_limit")
+
+    def test_drop_releases_seat_once(self):
+        enrollment = enroll(self.student, self.offering)
+        drop(self.student, enrollment.pk)
+        with self.assertRaises(RegistrationError):
+            drop(self.student, enrollment.pk)
+
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 0)
+        self.assertEqual(StudentTermLoad.objects.get(student=self.student).units, 0)
+        enroll(self.student, self.offering)
+
+    def test_writes_are_limited_to_the_registration_windows(self):
+        enrollment = enroll(self.student, self.offering)
+        term = self.offering.term
+        term.status = Term.IN_PROGRESS
+        term.save()
+
+        for attempt in (
+            lambda: enroll(make_student("s2"), self.offering),
+            lambda: drop(self.student, enrollment.pk),
+            lambda: join_waitlist(make_student("s3"), self.offering),
+        ):
+            with self.assertRaises(RegistrationError) as ctx:
+                attempt()
+            self.assertEqual(ctx.exception.code, "registration_closed")
+        # حذف رد‌شده چیزی را تغییر نداده است
+        self.assertEqual(Enrollment.objects.get(pk=enrollment.pk).status, Enrollment.ENROLLED)
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 1)
+
+
+class EnrollmentApiTests(TestCase):
+    url = "/api/registration/enrollments/"
+
+    def setUp(self):
+        admission.reset()
+        self.student = make_student("s1")
+        self.offering = make_offering(capacity=1)
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.student)}"
+
+    def test_enroll_list_and_drop(self):
+        response = self.client.post(self.url, {"offering": self.offering.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        enrollment_id = response.data["id"]
+
+        response = self.client.get(self.url)
+        self.assertEqual([e["id"] for e in response.data], [enrollment_id])
+
+        response = self.client.delete(f"{self.url}{enrollment_id}/")
+        self.assertEqual(response.status_code, 204)
+
+    def test_full_section_returns_conflict(self):
+        enroll(make_student("s2"), self.offering)
+        response = self.client.post(self.url, {"offering": self.offering.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["code"], "full")
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.offering = make_offering(capacity=1)
+        self.seated = make_student("seated")
+        self.enrollment = enroll(self.seated, self.offering)
+        self.waiting = [make_student(f"w{i}") for i in range(4)]
+        self.entries = [join_waitlist(s, self.offering) for s in self.waiting]
+
+    def positions(self):
+        return dict(WaitlistEntry.objects.filter(status=WaitlistEntry.WAITING).values_list("student__username", "position"))
+
+    def test_join_assigns_positions(self):
+        self.assertEqual([e.position for e in self.entries], [1, 2, 3, 4])
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.waitlist_count, 4)
+
+        for student in (self.waiting[0], self.seated):
+            with self.assertRaises(RegistrationError) as ctx:
+                join_waitlist(student, self.offering)
+            self.assertEqual(ctx.exception.code, "duplicate")
+
+        with self.assertRaises(RegistrationError) as ctx:
+            join_waitlist(self.seated, make_offering("CS102", capacity=1))
+        self.assertEqual(ctx.exception.code, "not_full")
+
+    def test_leaving_shifts_the_queue(self):
+        leave_waitlist(self.waiting[1], self.entries[1].pk)
+        self.assertEqual(self.positions(), {"w0": 1, "w2": 2, "w3": 3})
+        with self.assertRaises(RegistrationError):
+            leave_waitlist(self.waiting[1], self.entries[1].pk)
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.waitlist_count, 3)
+
+    def test_freed_seat_goes_to_the_queue_not_to_retries(self):
+        drop(self.seated, self.enrollment.pk)
+        with self.assertRaises(RegistrationError) as ctx:
+            enroll(make_student("late"), self.offering)
+        self.assertEqual(ctx.exception.code, "full")
+
+        self.assertEqual(promote_waitlists(), (1, 0))
+        entry = WaitlistEntry.objects.get(pk=self.entries[0].pk)
+        self.assertEqual((entry.status, entry.position), (WaitlistEntry.PROMOTED, None))
+        self.assertEqual(entry.enrollment.status, Enrollment.ENROLLED)
+        self.assertEqual(self.positions(), {"w1": 1, "w2": 2, "w3": 3})
+        message = OutboxMessage.objects.get(kind="waitlist_promoted")
+        self.assertEqual(message.recipient_id, self.waiting[0].pk)
+        self.assertEqual(promote_waitlists(), (0, 0))
+
+    def test_students_who_cannot_enroll_are_skipped(self):
+        heavy = make_offering("CS900", units=20, capacity=5)
+        enroll(self.waiting[0], heavy)
+        Offering.objects.filter(pk=self.offering.pk).update(capacity=3)
+
+        promoted, skipped = promote_offering(self.offering.pk)
+        self.assertEqual([e.student_id for e in promoted], [self.waiting[1].pk, self.waiting[2].pk])
+        self.assertEqual([(e.student_id, e.reason) for e in skipped], [(self.waiting[0].pk, "unit_limit")])
+        self.assertEqual(self.positions(), {"w3": 1})
+        self.offering.refresh_from_db()
+        self.assertEqual((self.offering.enrolled_count, self.offering.waitlist_count), (3, 1))
+        self.assertEqual(OutboxMessage.objects.get(kind="waitlist_skipped").data["reason"], "unit_limit")
+
+
+class WaitlistApiTests(TestCase):
+    url = "/api/registration/waitlist/"
+
+    def setUp(self):
+        cache.clear()
+        admission.reset()
+        self.offering = make_offering(capacity=1)
+        enroll(make_student("seated"), self.offering)
+        join_waitlist(make_student("first"), self.offering)
+        self.student = make_student("s1")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.student)}"
+
+    def test_join_list_and_leave(self):
+        response = self.client.post(self.url, {"offering": self.offering.pk}, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["position"], response.data["waitlist_length"]), (2, 2))
+        entry_id = response.data["id"]
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual([(e["id"], e["position"]) for e in response.data], [(entry_id, 2)])
+
+        response = self.client.delete(f"{self.url}{entry_id}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(self.url).data, [])
+
+        enrollments = "/api/registration/enrollments/"
+        response = self.client.post(enrollments, {"offering": self.offering.pk}, content_type="application/json")
+        self.assertEqual(response.data["code"], "full")
+
+
+@override_settings(REGISTRATION_SLOT_COUNT=4, REGISTRATION_SLOT_MINUTES=30, REGISTRATION_SLOT_SPREAD_SECONDS=0)
+class AdmissionControlTests(TestCase):
+    url = "/api/registration/enrollments/"
+
+    def setUp(self):
+        cache.clear()
+        admission.reset()
+        self.opens_at = timezone.now() - timedelta(minutes=10)
+        self.term = Term.objects.create(
+            name="1405-1", start_date=date(2026, 9, 1), end_date=date(2027, 1, 1), status=Term.REGISTRATION,
+            registration_opens_at=self.opens_at, registration_closes_at=self.opens_at + timedelta(days=3),
+        )
+        terms.invalidate()
+
+    def post(self, student, offering):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(student)}"
+        return self.client.post(self.url, {"offering": offering.pk}, content_type="application/json")
+
+    def test_slots_follow_seniority(self):
+        def slot(student_id):
+            student = User(pk=1, role="student", student_id=student_id)
+            return (slot_opens_at(student, self.term) - self.opens_at) / timedelta(minutes=30)
+
+        self.assertEqual([slot(s) for s in ("13990001", "14010001", "14030001", "14050001", "x1")], [0, 0, 1, 3, 3])
+        self.assertEqual(cohort(User(student_id="14030001")), "1403")
+
+        # سال ترم از start_date است، نه نام آزاد ترم؛ به همان تقویم شماره دانشجویی
+        self.term.name = "Fall term"
+        self.assertEqual([slot(s) for s in ("14010001", "14030001", "14050001")], [0, 1, 3])
+        self.assertEqual([slot(s) for s in ("20220001", "20240001", "20260001")], [0, 1, 3])
+        self.assertEqual(cohort(User(student_id="x1")), "other")
+
+    def test_students_before_their_slot_get_a_fast_429(self):
+        offering = make_offering(capacity=5, term=self.term)
+        senior, freshman = make_student("14010001"), make_student("14050001")
+        terms.current()  # ترم‌ها در پروسه بارگذاری شده‌اند
+
+        self.assertEqual(self.post(senior, offering).status_code, 201)
+        with self.assertNumQueries(1):  # فقط خواندن کاربر در احراز هویت
+            response = self.post(freshman, offering)
+        self.assertEqual(response.status_code, 429)
+        self.assertAlmostEqual(int(response["Retry-After"]), 80 * 60, delta=5)
+        # خواندن آزاد است
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with override_settings(REGISTRATION_SLOT_MINUTES=1):
+            self.assertEqual(self.post(freshman, offering).status_code, 201)
+
+    @override_settings(REGISTRATION_COHORT_BURST=2, REGISTRATION_COHORT_RATE=0.01)
+    def test_cohort_bucket_limits_writers(self):
+        self.term.status = Term.ADD_DROP
+        self.term.save()
+        offerings = [make_offering(f"CS{i}", units=1, capacity=5, term=self.term) for i in range(4)]
+        student = make_student("14030001")
+
+        self.assertEqual([self.post(student, o).status_code for o in offerings[:2]], [201, 201])
+        response = self.post(student, offerings[2])
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response["Retry-After"]), 90)
+        # سطل هر ورودی جداست
+        self.assertEqual(self.post(make_student("14040001"), offerings[3]).status_code, 201)
+        self.assertEqual(Enrollment.objects.count(), 3)
+
+    @override_settings(REGISTRATION_USER_BURST=2, REGISTRATION_USER_RATE=0.01, REGISTRATION_COHORT_BURST=4)
+    def test_one_student_cannot_drain_the_cohort_bucket(self):
+        self.term.status = Term.ADD_DROP
+        self.term.save()
+        offerings = [make_offering(f"CS{i}", units=1, capacity=5, term=self.term) for i in range(4)]
+        greedy, classmate = make_student("14030001"), make_student("14030002")
+
+        statuses = [self.post(greedy, offerings[i % 3]).status_code for i in range(10)]
+        self.assertEqual(statuses[:2], [201, 201])
+        self.assertEqual(set(statuses[2:]), {429})
+        # درخواست‌های رد‌شده از سطل ورودی چیزی برنداشته‌اند
+        self.assertEqual([self.post(classmate, o).status_code for o in offerings[2:]], [201, 201])
+
+    @override_settings(REGISTRATION_USER_BURST=1, REGISTRATION_USER_RATE=0.01)
+    def test_idempotent_replay_is_not_throttled(self):
+        self.term.status = Term.ADD_DROP
+        self.term.save()
+        first, second = make_offering("CS1", units=1, capacity=5, term=self.term), make_offering("CS2", term=self.term)
+        student = make_student("14030001")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(student)}"
+
+        def post(offering, key):
+            return self.client.post(
+                self.url, {"offering": offering.pk}, content_type="application/json", HTTP_IDEMPOTENCY_KEY=key
+            )
+
+        self.assertEqual(post(first, "k1").status_code, 201)
+        response = post(first, "k1")
+        self.assertEqual((response.status_code, response["Idempotent-Replayed"]), (201, "true"))
+        # درخواست تازه ۴۲۹ می‌گیرد و کلیدش برای تلاش بعدی آزاد می‌ماند
+        self.assertEqual(post(second, "k2").status_code, 429)
+        admission.reset()
+        self.assertEqual(post(second, "k2").status_code, 201)
+
+
+class RosterExportTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(username="p1", role="professor")
+        self.offering = make_offering(capacity=5)
+        self.offering.professor = self.professor
+        self.offering.save()
+        self.url = f"/api/registration/offerings/{self.offering.pk}/roster/export/"
+        enroll(make_student("s1"), self.offering)
+        enrollment = enroll(make_student("s2"), self.offering)
+        drop(enrollment.student, enrollment.pk)
+
+    def test_professor_exports_enrolled_students(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(self.professor)}"
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("s1,s1,"))
+
+    def test_other_professor_is_forbidden(self):
+        other = User.objects.create_user(username="p2", role="professor")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(other)}"
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ConcurrentEnrollmentTests(TransactionTestCase):
+    """
+    طوفان هم‌زمان ثبت‌نام: تعداد ثبت‌نام‌ها هرگز نباید از ظرفیت بیشتر شود.
+    """
+    def test_no_overselling_under_concurrency(self):
+        offering = make_offering(capacity=10)
+        students = [make_student(f"s{i}") for i in range(40)]
+        outcomes = []
+        lock = threading.Lock()
+
+        def worker(student):
+            try:
+                while True:
+                    try:
+                        enroll(student, offering)
+                        result = "ok"
+                        break
+                    except RegistrationError as e:
+                        result = e.code
+                        break
+                    except OperationalError:
+                        # SQLite قفل جدول را به‌جای انتظار برمی‌گرداند؛ تلاش دوباره
+                        time.sleep(0.005)
+                with lock:
+                    outcomes.append(result)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(s,)) for s in students]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        offering.refresh_from_db()
+        self.assertEqual(outcomes.count("ok"), 10)
+        self.assertEqual(outcomes.count("full"), 30)
+        self.assertEqual(offering.enrolled_count, 10)
+        self.assertEqual(Enrollment.objects.filter(offering=offering).count(), 10)
+
+
+class ConcurrentPromotionTests(TransactionTestCase):
+    """
+    حذف درس‌های هم‌زمان در حالی که worker صف را ارتقا می‌دهد: هیچ صندلی دوبار داده نمی‌شود و
+    ترتیب صف حفظ می‌شود.
+    """
+    def test_promotion_under_concurrent_drops(self):
+        offering = make_offering(capacity=10)
+        seated = [make_student(f"s{i}") for i in range(10)]
+        enrollments = [enroll(s, offering) for s in seated]
+        waiting = [make_student(f"w{i}") for i in range(15)]
+        for student in waiting:
+            join_waitlist(student, offering)
+
+        done = threading.Event()
+
+        def retrying(fn, *args):
+            while True:
+                try:
+                    return fn(*args)
+                except OperationalError:
+                    time.sleep(0.005)
+
+        def dropper(student, enrollment):
+            try:
+                retrying(drop, student, enrollment.pk)
+            finally:
+                connection.close()
+
+        def promoter():
+            try:
+                while not done.is_set():
+                    retrying(promote_waitlists)
+                    time.sleep(0.001)
+                retrying(promote_waitlists)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=promoter)
+        worker.start()
+        threads = [threading.Thread(target=dropper, args=pair) for pair in zip(seated[:8], enrollments[:8])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        done.set()
+        worker.join()
+
+        offering.refresh_from_db()
+        active = Enrollment.objects.filter(offering=offering, status=Enrollment.ENROLLED)
+        self.assertEqual((offering.enrolled_count, active.count()), (10, 10))
+        promoted = WaitlistEntry.objects.filter(status=WaitlistEntry.PROMOTED)
+        self.assertEqual(sorted(promoted.values_list("student__username", flat=True)), sorted(f"w{i}" for i in range(8)))
+        self.assertEqual(
+            list(WaitlistEntry.objects.filter(status=WaitlistEntry.WAITING).values_list("student__username", "position")),
+            [(f"w{i}", i - 7) for i in range(8, 15)],
+        )
+        self.assertEqual(offering.waitlist_count, 7)
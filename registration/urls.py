@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import (
+    EnrollmentListCreateView, EnrollmentDropView, RosterExportView, WaitlistListCreateView, WaitlistLeaveView,
+)
+
+urlpatterns = [
+    path("enrollments/", EnrollmentListCreateView.as_view()),
+    path("enrollments/<int:pk>/", EnrollmentDropView.as_view()),
+    path("waitlist/", WaitlistListCreateView.as_view()),
+    path("waitlist/<int:pk>/", WaitlistLeaveView.as_view()),
+    path("offerings/<int:pk>/roster/export/", RosterExportView.as_view()),
+]
@@ -1,3 +1,114 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from django.shortcuts import get_object_or_404
+
+from accounts.permissions import IsStudent
+from api.export import export_response, requested_format
+from api.idempotency import IdempotentMixin
+from offerings.models import Offering
+from offerings.permissions import IsOfferingProfessorOrAdmin
+from .admission import RegistrationAdmissionThrottle
+from .models import Enrollment, WaitlistEntry
+from .serializers import EnrollmentSerializer, EnrollRequestSerializer, WaitlistEntrySerializer
+from .services import RegistrationError, enroll, drop, join_waitlist, leave_waitlist
+
+
+class EnrollmentListCreateView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+    throttle_classes = [RegistrationAdmissionThrottle]
+
+    def get(self, request):
+        enrollments = Enrollment.objects.filter(
+            student_id=request.user.pk, status=Enrollment.ENROLLED
+        ).select_related("offering__course")
+        return Response(EnrollmentSerializer(enrollments, many=True).data)
+
+    def post(self, request):
+        serializer = EnrollRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            enrollment = enroll(request.user, serializer.validated_data["offering"])
+        except RegistrationError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        return Response(EnrollmentSerializer(enrollment).data, status=status.HTTP_201_CREATED)
+
+
+class EnrollmentDropView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+    throttle_classes = [RegistrationAdmissionThrottle]
+
+    def delete(self, request, pk):
+        try:
+            drop(request.user, pk)
+        except RegistrationError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class WaitlistListCreateView(IdempotentMixin, APIView):
+    """صف‌های انتظار دانشجو با جایگاه فعلی؛ ارتقا با اعلان خبر داده می‌شود، نیازی به polling نیست."""
+    permission_classes = [IsAuthenticated, IsStudent]
+    throttle_classes = [RegistrationAdmissionThrottle]
+
+    def get(self, request):
+        entries = WaitlistEntry.objects.filter(
+            student_id=request.user.pk, status=WaitlistEntry.WAITING
+        ).select_related("offering__course")
+        return Response(WaitlistEntrySerializer(entries, many=True).data)
+
+    def post(self, request):
+        serializer = EnrollRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            entry = join_waitlist(request.user, serializer.validated_data["offering"])
+        except RegistrationError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        # نمونه ارائه قبل از پیوستن خوانده شده؛ در لحظه پیوستن طول صف همان جایگاه تازه‌وارد است
+        entry.offering.waitlist_count = entry.position
+        return Response(WaitlistEntrySerializer(entry).data, status=status.HTTP_201_CREATED)
+
+
+class WaitlistLeaveView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+    throttle_classes = [RegistrationAdmissionThrottle]
+
+    def delete(self, request, pk):
+        try:
+            leave_waitlist(request.user, pk)
+        except RegistrationError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class RosterExportView(APIView):
+    """فهرست دانشجویان ثبت‌نامی یک ارائه به صورت CSV/XLSX جریانی."""
+    permission_classes = [IsAuthenticated, IsOfferingProfessorOrAdmin]
+
+    header = ["student_id", "username", "first_name", "last_name", "email", "enrolled_at"]
+
+    def get(self, request, pk):
+        offering = get_object_or_404(Offering.objects.select_related("course"), pk=pk)
+        self.check_object_permissions(request, offering)
+
+        fmt = requested_format(request)
+        if fmt is None:
+            return Response({"detail": "Unsupported file_format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = Enrollment.objects.filter(
+            offering=offering, status=Enrollment.ENROLLED
+        ).order_by("student__student_id").values_list(
+            "student__student_id", "student__username", "student__first_name",
+            "student__last_name", "student__email", "created_at",
+        ).iterator(chunk_size=2000)
+
+        filename = f"roster-{offering.course.code}-{offering.section}"
+        return export_response(filename, self.header, rows, fmt)
@@ -1,3 +1,16 @@
 from django.contrib import admin
+from .models import DepartmentTermStat, RefreshState, TermStat
 
-# Register your models here.
+
+@admin.register(TermStat)
+class TermStatAdmin(admin.ModelAdmin):
+    list_display = ("term", "students", "offerings", "enrolled", "capacity", "refreshed_at")
+
+
+@admin.register(DepartmentTermStat)
+class DepartmentTermStatAdmin(admin.ModelAdmin):
+    list_display = ("department", "term", "offerings", "enrolled", "capacity", "refreshed_at")
+    list_filter = ("term",)
+
+
+admin.site.register(RefreshState)
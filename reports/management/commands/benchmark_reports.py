@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from courses.models import Course
+from departments.models import Department
+from grading.models import Grade
+from offerings.models import Offering
+from registration.models import Enrollment
+from reports.models import DepartmentTermStat, TermStat
+from reports.stats import live_term_stats, refresh_term
+from terms.models import Term
+
+
+class Command(BaseCommand):
+    help = "Compare reading the report summary tables with the equivalent live annotate() aggregation."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offerings", type=int, default=500)
+        parser.add_argument("--students", type=int, default=5000)
+        parser.add_argument("--per-student", type=int, default=5)
+        parser.add_argument("--rounds", type=int, default=10)
+
+    def handle(self, *args, **options):
+        rng = random.Random(1)
+        tag = uuid.uuid4().hex[:6].upper()
+        term = Term.objects.create(name=f"bench-{tag}", start_date=date(2000, 1, 1), end_date=date(2000, 6, 1))
+        try:
+            self.seed(term, tag, rng, options)
+
+            started = time.perf_counter()
+            refresh_term(term.pk)
+            self.stdout.write(f"refresh_term: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+            live, summary = [], []
+            for _ in range(options["rounds"]):
+                started = time.perf_counter()
+                live_term_stats(term.pk)
+                live.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                list(TermStat.objects.filter(term=term))
+                list(DepartmentTermStat.objects.filter(term=term).select_related("department"))
+                summary.append((time.perf_counter() - started) * 1000)
+
+            self.stdout.write(f"live annotate(): median {statistics.median(live):.2f} ms")
+            self.stdout.write(f"summary tables:  median {statistics.median(summary):.2f} ms")
+        finally:
+            Grade.objects.filter(enrollment__offering__term=term).delete()
+            Enrollment.objects.filter(offering__term=term).delete()
+            Offering.objects.filter(term=term).delete()
+            Course.objects.filter(code__startswith=tag).delete()
+            Department.objects.filter(code__startswith=tag).delete()
+            User.objects.filter(username__startswith=f"bench-{tag}-").delete()
+            term.delete()
+
+    def seed(self, term, tag, rng, options):
+        departments = Department.objects.bulk_create(
+            Department(code=f"{tag}{i}", name=f"Bench {tag} {i}") for i in range(10)
+        )
+        courses = Course.objects.bulk_create(
+            Course(code=f"{tag}{i:05d}", title=f"Bench {tag} {i}", units=rng.randint(1, 4))
+            for i in range(options["offerings"])
+        )
+        through = Course.departments.through
+        through.objects.bulk_create(
+            through(course_id=c.pk, department_id=rng.choice(departments).pk) for c in courses
+        )
+        offerings = Offering.objects.bulk_create(
+            Offering(course=c, term=term, capacity=200) for c in courses
+        )
+        students = User.objects.bulk_create(
+            User(username=f"bench-{tag}-{i}", role="student", student_id=str(i), password="!")
+            for i in range(options["students"])
+        )
+
+        enrollments, counts = [], {}
+        for student in students:
+            for offering in rng.sample(offerings, options["per_student"]):
+                enrollments.append(Enrollment(student=student, offering=offering))
+                counts[offering.pk] = counts.get(offering.pk, 0) + 1
+        enrollments = Enrollment.objects.bulk_create(enrollments, batch_size=5000)
+        for offering in offerings:
+            offering.enrolled_count = counts.get(offering.pk, 0)
+        Offering.objects.bulk_update(offerings, ["enrolled_count"], batch_size=1000)
+        Grade.objects.bulk_create(
+            (Grade(enrollment=e, value=Decimal(rng.randint(0, 40)) / 2) for e in enrollments),
+            batch_size=5000,
+        )
+        self.stdout.write(f"Seeded {len(offerings)} offerings, {len(enrollments)} enrollments and grades")
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reports.stats import refresh
+
+
+class Command(BaseCommand):
+    help = "Refresh the report summary tables for terms that changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every term.")
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Keep running as a background worker, refreshing every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            started = time.perf_counter()
+            terms = refresh(full=full)
+            self.stdout.write(
+                f"Refreshed {len(terms)} term(s) in {time.perf_counter() - started:.2f}s"
+            )
+            if not options["interval"]:
+                return
+            full = False
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('departments', '0002_department_case_insensitive_unique'),
+        ('terms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TermStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offerings', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('enrolled', models.PositiveIntegerField(default=0)),
+                ('units_distribution', models.JSONField(default=dict)),
+                ('grade_distribution', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField()),
+                ('students', models.PositiveIntegerField(default=0)),
+                ('term', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stat', to='terms.term')),
+            ],
+            options={
+                'ordering': ['-term__start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DepartmentTermStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offerings', models.PositiveIntegerField(default=0)),
+                ('capacity', models.PositiveIntegerField(default=0)),
+                ('enrolled', models.PositiveIntegerField(default=0)),
+                ('units_distribution', models.JSONField(default=dict)),
+                ('grade_distribution', models.JSONField(default=dict)),
+                ('refreshed_at', models.DateTimeField()),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='term_stats', to='departments.department')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='department_stats', to='terms.term')),
+            ],
+            options={
+                'ordering': ['department__code'],
+                'constraints': [models.UniqueConstraint(fields=('term', 'department'), name='unique_department_term_stat')],
+            },
+        ),
+    ]
@@ -1,3 +1,73 @@
 from django.db import models
 
-# Create your models here.
+
+class StatFields(models.Model):
+    """
+    ستون‌های مشترک جدول‌های خلاصه؛ فقط دستور refresh_reports آن‌ها را می‌نویسد.
+    """
+    offerings = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+    enrolled = models.PositiveIntegerField(default=0)
+    units_distribution = models.JSONField(default=dict)    # {"3": تعداد ثبت‌نام درس‌های ۳ واحدی}
+    grade_distribution = models.JSONField(default=dict)    # {"16-18": تعداد نمره در این بازه}
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def fill_rate(self):
+        if not self.capacity:
+            return None
+        return round(self.enrolled / self.capacity, 4)
+
+
+class TermStat(StatFields):
+    term = models.OneToOneField(
+        "terms.Term",
+        on_delete=models.CASCADE,
+        related_name="stat"
+    )
+
+    students = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-term__start_date"]
+
+    def __str__(self):
+        return f"{self.term} stats"
+
+
+class DepartmentTermStat(StatFields):
+    term = models.ForeignKey(
+        "terms.Term",
+        on_delete=models.CASCADE,
+        related_name="department_stats"
+    )
+
+    department = models.ForeignKey(
+        "departments.Department",
+        on_delete=models.CASCADE,
+        related_name="term_stats"
+    )
+
+    class Meta:
+        ordering = ["department__code"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["term", "department"],
+                name="unique_department_term_stat"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.department.code} - {self.term} stats"
+
+
+class RefreshState(models.Model):
+    """نقطه آخرین refresh؛ فقط ترم‌هایی که بعد از آن تغییر کرده‌اند دوباره محاسبه می‌شوند."""
+    name = models.CharField(max_length=50, unique=True)
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name}: {self.refreshed_at}"
@@ -0,0 +1,33 @@
+from django.utils import timezone
+from rest_framework import serializers
+from .models import DepartmentTermStat, TermStat
+
+
+class StatSerializer(serializers.ModelSerializer):
+    fill_rate = serializers.FloatField(read_only=True)
+    stale_seconds = serializers.SerializerMethodField()
+
+    def get_stale_seconds(self, obj):
+        return int((timezone.now() - obj.refreshed_at).total_seconds())
+
+
+class TermStatSerializer(StatSerializer):
+    term_name = serializers.CharField(source="term.name")
+
+    class Meta:
+        model = TermStat
+        fields = [
+            "term", "term_name", "students", "offerings", "capacity", "enrolled", "fill_rate",
+            "units_distribution", "grade_distribution", "refreshed_at", "stale_seconds",
+        ]
+
+
+class DepartmentTermStatSerializer(StatSerializer):
+    department_code = serializers.CharField(source="department.code")
+
+    class Meta:
+        model = DepartmentTermStat
+        fields = [
+            "department", "department_code", "term", "offerings", "capacity", "enrolled", "fill_rate",
+            "units_distribution", "grade_distribution", "refreshed_at", "stale_seconds",
+        ]
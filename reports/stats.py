@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, Count, Q, Sum, Value, When
+from django.utils import timezone
+
+from grading.models import Grade
+from offerings.models import Offering
+from registration.models import Enrollment
+from .models import DepartmentTermStat, RefreshState, TermStat
+
+
+GRADE_BUCKETS = [
+    ("0-10", 0, 10),
+    ("10-12", 10, 12),
+    ("12-14", 12, 14),
+    ("14-16", 14, 16),
+    ("16-18", 16, 18),
+    ("18-20", 18, 21),
+]
+
+STATE_NAME = "term_stats"
+
+
+def grade_bucket():
+    return Case(
+        *[When(value__gte=low, value__lt=high, then=Value(label)) for label, low, high in GRADE_BUCKETS],
+        output_field=CharField(),
+    )
+
+
+def live_term_stats(term_id):
+    """
+    آمار یک ترم با aggregate مستقیم روی جدول‌های تراکنشی (گران؛ فقط در refresh پس‌زمینه اجرا می‌شود).
+    خروجی: (آمار ترم، {department_id: آمار دانشکده})
+    """
+    departments = defaultdict(lambda: {
+        "offerings": 0, "capacity": 0, "enrolled": 0,
+        "units_distribution": {}, "grade_distribution": {},
+    })
+
+    offerings = Offering.objects.filter(term_id=term_id)
+    term = offerings.aggregate(
+        offerings=Count("id"),
+        capacity=Sum("capacity", default=0),
+        enrolled=Sum("enrolled_count", default=0),
+    )
+    for row in offerings.filter(course__departments__isnull=False).values("course__departments").annotate(
+        offerings=Count("id"), capacity=Sum("capacity"), enrolled=Sum("enrolled_count"),
+    ):
+        departments[row["course__departments"]].update(
+            offerings=row["offerings"], capacity=row["capacity"], enrolled=row["enrolled"]
+        )
+
+    enrollments = Enrollment.objects.filter(offering__term_id=term_id, status=Enrollment.ENROLLED)
+    term["students"] = enrollments.values("student_id").distinct().count()
+    term["units_distribution"] = {
+        str(row["offering__course__units"]): row["n"]
+        for row in enrollments.values("offering__course__units").annotate(n=Count("id"))
+    }
+    for row in enrollments.filter(offering__course__departments__isnull=False).values(
+        "offering__course__departments", "offering__course__units"
+    ).annotate(n=Count("id")):
+        departments[row["offering__course__departments"]]["units_distribution"][
+            str(row["offering__course__units"])
+        ] = row["n"]
+
+    grades = Grade.objects.filter(enrollment__offering__term_id=term_id).annotate(bucket=grade_bucket())
+    term["grade_distribution"] = {
+        row["bucket"]: row["n"] for row in grades.values("bucket").annotate(n=Count("id"))
+    }
+    for row in grades.filter(enrollment__offering__course__departments__isnull=False).values(
+        "enrollment__offering__course__departments", "bucket"
+    ).annotate(n=Count("id")):
+        departments[row["enrollment__offering__course__departments"]]["grade_distribution"][row["bucket"]] = row["n"]
+
+    return term, dict(departments)
+
+
+def changed_terms(since):
+    """ترم‌هایی که بعد از since ثبت‌نام، حذف، نمره یا ارائه تغییر کرده‌اند."""
+    terms = set(Enrollment.objects.filter(
+        Q(created_at__gt=since) | Q(dropped_at__gt=since)
+    ).values_list("offering__term_id", flat=True).distinct())
+    terms.update(Grade.objects.filter(updated_at__gt=since).values_list(
+        "enrollment__offering__term_id", flat=True
+    ).distinct())
+    terms.update(Offering.objects.filter(updated_at__gt=since).values_list("term_id", flat=True).distinct())
+    return terms
+
+
+def refresh_term(term_id, now=None):
+    now = now or timezone.now()
+    term, departments = live_term_stats(term_id)
+    with transaction.atomic():
+        TermStat.objects.update_or_create(term_id=term_id, defaults={**term, "refreshed_at": now})
+        DepartmentTermStat.objects.filter(term_id=term_id).delete()
+        DepartmentTermStat.objects.bulk_create(
+            DepartmentTermStat(term_id=term_id, department_id=department_id, refreshed_at=now, **values)
+            for department_id, values in departments.items()
+        )
+
+
+def refresh(full=False):
+    """
+    فقط ترم‌های تغییرکرده از refresh قبلی دوباره محاسبه می‌شوند (یا همه با full).
+    watermark قبل از خواندن ثبت می‌شود، ولی زمان ردیف‌ها موقع نوشتن ثبت می‌شود نه موقع commit؛ تراکنشی
+    که بعد از این دور commit شود ممکن است زمانی قبل از watermark داشته باشد. برای همین هر دور
+    REPORTS_REFRESH_OVERLAP ثانیه قبل از watermark را هم دوباره می‌خواند.
+    """
+    from terms.models import Term
+
+    now = timezone.now()
+    state = RefreshState.objects.filter(name=STATE_NAME).first()
+    if full or state is None:
+        term_ids = set(Term.objects.values_list("id", flat=True))
+    else:
+        term_ids = changed_terms(state.refreshed_at - timedelta(seconds=settings.REPORTS_REFRESH_OVERLAP))
+
+    for term_id in term_ids:
+        refresh_term(term_id, now)
+
+    RefreshState.objects.update_or_create(name=STATE_NAME, defaults={"refreshed_at": now})
+    return term_ids
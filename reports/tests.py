@@ -1,3 +1,95 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from departments.models import Department
+from grading.models import Grade
+from grading.services import submit_grade_sheet
+from grading.tests import set_term_status
+from offerings.models import Offering
+from registration.models import Enrollment
+from registration.services import enroll
+from registration.tests import make_offering, make_student
+from terms.models import Term
+from .models import DepartmentTermStat, RefreshState, TermStat
+from .stats import STATE_NAME, live_term_stats, refresh
+
+
+class ReportRefreshTests(TestCase):
+    def setUp(self):
+        self.math = Department.objects.create(code="MATH", name="Mathematics")
+        self.cs = Department.objects.create(code="CS", name="Computer Science")
+        self.calculus = make_offering("MA101", units=3, capacity=4)
+        self.calculus.course.departments.set([self.math])
+        self.programming = make_offering("CS101", units=2, capacity=6, term=self.calculus.term)
+        self.programming.course.departments.set([self.math, self.cs])
+
+        self.students = [make_student(f"s{i}") for i in range(3)]
+        enrollments = [enroll(s, self.calculus) for s in self.students]
+        enroll(self.students[0], self.programming)
+        set_term_status(self.calculus.term, Term.GRADING)
+        submit_grade_sheet(self.calculus, [
+            {"enrollment": e.pk, "value": Decimal(v)} for e, v in zip(enrollments, ["9", "17", "20"])
+        ])
+
+    def test_refresh_materializes_live_aggregates(self):
+        refresh()
+        stat = TermStat.objects.get(term=self.calculus.term)
+        self.assertEqual((stat.students, stat.offerings, stat.capacity, stat.enrolled), (3, 2, 10, 4))
+        self.assertEqual(stat.fill_rate, 0.4)
+        self.assertEqual(stat.units_distribution, {"3": 3, "2": 1})
+        self.assertEqual(stat.grade_distribution, {"0-10": 1, "16-18": 1, "18-20": 1})
+
+        math = DepartmentTermStat.objects.get(department=self.math)
+        self.assertEqual((math.offerings, math.enrolled), (2, 4))
+        cs = DepartmentTermStat.objects.get(department=self.cs)
+        self.assertEqual((cs.offerings, cs.enrolled, cs.grade_distribution), (1, 1, {}))
+
+        term, departments = live_term_stats(self.calculus.term_id)
+        self.assertEqual(term["enrolled"], stat.enrolled)
+
+    @override_settings(REPORTS_REFRESH_OVERLAP=0)
+    def test_refresh_is_incremental(self):
+        other = Term.objects.create(name="1405-2", start_date=date(2027, 2, 1), end_date=date(2027, 6, 1))
+        self.assertEqual(refresh(), {self.calculus.term_id, other.pk})
+        self.assertEqual(refresh(), set())
+
+        set_term_status(self.calculus.term, Term.ADD_DROP)
+        enroll(self.students[1], self.programming)
+        self.assertEqual(refresh(), {self.calculus.term_id})
+        self.assertEqual(TermStat.objects.get(term=self.calculus.term).enrolled, 5)
+
+    def test_late_commit_before_the_watermark_is_picked_up(self):
+        day_ago = timezone.now() - timedelta(days=1)
+        Enrollment.objects.update(created_at=day_ago)
+        Grade.objects.update(updated_at=day_ago)
+        Offering.objects.update(updated_at=day_ago)
+        refresh()
+        watermark = RefreshState.objects.get(name=STATE_NAME).refreshed_at
+
+        # زمان ثبت‌نام موقع نوشتن گرفته شده و تراکنشش بعد از دور قبلی commit شده است
+        set_term_status(self.calculus.term, Term.ADD_DROP)
+        enrollment = enroll(self.students[1], self.programming)
+        Enrollment.objects.filter(pk=enrollment.pk).update(created_at=watermark - timedelta(seconds=1))
+        with self.settings(REPORTS_REFRESH_OVERLAP=0):
+            self.assertEqual(refresh(), set())
+        self.assertEqual(refresh(), {self.calculus.term_id})
+        self.assertEqual(TermStat.objects.get(term=self.calculus.term).enrolled, 5)
+
+    def test_endpoints_read_summary_tables_only(self):
+        refresh()
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+
+        # user lookup + summary table
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/reports/terms/")
+        self.assertEqual(response.data[0]["enrolled"], 4)
+        self.assertIn("stale_seconds", response.data[0])
+
+        response = self.client.get(f"/api/reports/terms/{self.calculus.term_id}/departments/")
+        self.assertEqual([d["department_code"] for d in response.data], ["CS", "MATH"])
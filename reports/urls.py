@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import DepartmentTermStatListView, TermStatListView
+
+urlpatterns = [
+    path("terms/", TermStatListView.as_view()),
+    path("terms/<int:term_id>/departments/", DepartmentTermStatListView.as_view()),
+]
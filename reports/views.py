@@ -1,3 +1,21 @@
-from django.shortcuts import render
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
 
-# Create your views here.
+from accounts.permissions import IsAdmin
+from .models import DepartmentTermStat, TermStat
+from .serializers import DepartmentTermStatSerializer, TermStatSerializer
+
+
+class TermStatListView(ListAPIView):
+    """فقط جدول خلاصه خوانده می‌شود؛ stale_seconds فاصله از آخرین refresh است."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+    serializer_class = TermStatSerializer
+    queryset = TermStat.objects.select_related("term")
+
+
+class DepartmentTermStatListView(ListAPIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    serializer_class = DepartmentTermStatSerializer
+
+    def get_queryset(self):
+        return DepartmentTermStat.objects.filter(term_id=self.kwargs["term_id"]).select_related("department")
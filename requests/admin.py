@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import Petition
 
-# Register your models here.
+
+@admin.register(Petition)
+class PetitionAdmin(admin.ModelAdmin):
+    list_display = ("student", "kind", "term", "status", "approver", "created_at")
+    list_filter = ("status", "kind")
+    raw_id_fields = ("student", "approver", "enrollment")
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('registration', '0003_studenttermload_max_units'),
+        ('terms', '0002_term_windows_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Petition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('unit_overload', 'Unit overload'), ('late_drop', 'Late drop')], max_length=20)),
+                ('requested_units', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('reason', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], default='pending', max_length=10)),
+                ('decision_note', models.CharField(blank=True, max_length=500)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('decided_at', models.DateTimeField(blank=True, null=True)),
+                ('approver', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='petitions_to_review', to=settings.AUTH_USER_MODEL)),
+                ('enrollment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='petitions', to='registration.enrollment')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='petitions', to=settings.AUTH_USER_MODEL)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='petitions', to='terms.term')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'approver', 'created_at', 'id'], name='petition_queue_idx'), models.Index(fields=['student', 'status'], name='petition_student_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('kind', 'unit_overload'), ('status', 'pending')), fields=('student', 'term'), name='unique_pending_overload'), models.UniqueConstraint(condition=models.Q(('kind', 'late_drop'), ('status', 'pending')), fields=('enrollment',), name='unique_pending_late_drop')],
+            },
+        ),
+    ]
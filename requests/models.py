@@ -1,3 +1,89 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class Petition(models.Model):
+    """
+    درخواست دانشجو (اضافه واحد، حذف اضطراری) که باید یک استاد/مدیر آن را تایید یا رد کند.
+
+    approver بررسی‌کننده تعیین‌شده است؛ خالی یعنی در صف عمومی مدیران. صف هر بررسی‌کننده
+    (status=pending, approver, created_at) با ایندکس مرکب و صفحه‌بندی keyset خوانده می‌شود.
+    """
+    UNIT_OVERLOAD = "unit_overload"
+    LATE_DROP = "late_drop"
+    KIND_CHOICES = [
+        (UNIT_OVERLOAD, "Unit overload"),
+        (LATE_DROP, "Late drop"),
+    ]
+
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (APPROVED, "Approved"),
+        (REJECTED, "Rejected"),
+        (CANCELLED, "Cancelled"),
+    ]
+
+    student = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="petitions"
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    term = models.ForeignKey(
+        "terms.Term",
+        on_delete=models.CASCADE,
+        related_name="petitions"
+    )
+
+    # اضافه واحد: سقف درخواستی؛ حذف اضطراری: ثبت‌نامی که باید حذف شود
+    requested_units = models.PositiveSmallIntegerField(null=True, blank=True)
+    enrollment = models.ForeignKey(
+        "registration.Enrollment",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="petitions"
+    )
+    reason = models.TextField(blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    approver = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="petitions_to_review"
+    )
+    decision_note = models.CharField(max_length=500, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    decided_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # یک درخواست باز اضافه واحد در هر ترم و یک درخواست باز حذف برای هر ثبت‌نام
+            models.UniqueConstraint(
+                fields=["student", "term"],
+                condition=models.Q(status="pending", kind="unit_overload"),
+                name="unique_pending_overload"
+            ),
+            models.UniqueConstraint(
+                fields=["enrollment"],
+                condition=models.Q(status="pending", kind="late_drop"),
+                name="unique_pending_late_drop"
+            ),
+        ]
+        indexes = [
+            # id ترتیب ردیف‌های هم‌زمان را در صفحه‌بندی keyset یکتا می‌کند
+            models.Index(fields=["status", "approver", "created_at", "id"], name="petition_queue_idx"),
+            models.Index(fields=["student", "status"], name="petition_student_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.student} {self.kind} ({self.status})"
@@ -0,0 +1,61 @@
+from base64 import b64decode, b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PetitionQueuePagination(BasePagination):
+    """
+    صفحه‌بندی keyset روی (created_at, id) فقط رو به جلو، مثل کار کردن یک صف.
+
+    CursorPagination در DRF برای ردیف‌های با created_at یکسان OFFSET می‌گذارد؛ اینجا cursor خود
+    (created_at, id) آخرین ردیف است و صفحه بعد با created_at >= x (بازه روی ایندکس) و شرط id برای
+    ردیف‌های هم‌زمان خوانده می‌شود، پس صفحه‌های عمیق صف هم هزینه‌ای برابر صفحه اول دارند.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        after = self.decode_cursor(request)
+        if after is not None:
+            created_at, pk = after
+            queryset = queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, pk__lte=pk)
+
+        rows = list(queryset.order_by("created_at", "id")[:size + 1])
+        self.next_position = (rows[size - 1].created_at, rows[size - 1].pk) if len(rows) > size else None
+        return rows[:size]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            created_at, pk = b64decode(encoded.encode("ascii")).decode("ascii").split("|")
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound("Invalid cursor")
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        created_at, pk = self.next_position
+        encoded = b64encode(f"{created_at.isoformat()}|{pk}".encode("ascii")).decode("ascii")
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,77 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from registration.models import Enrollment
+from registration.services import max_units
+from .models import Petition
+from .services import APPROVE, REJECT
+
+
+class PetitionSerializer(serializers.ModelSerializer):
+    course_code = serializers.CharField(source="enrollment.offering.course.code", read_only=True, default=None)
+    enrollment = serializers.PrimaryKeyRelatedField(
+        queryset=Enrollment.objects.select_related("offering"), required=False, allow_null=True
+    )
+
+    class Meta:
+        model = Petition
+        fields = [
+            "id", "kind", "term", "requested_units", "enrollment", "course_code", "reason",
+            "status", "approver", "decision_note", "created_at", "decided_at",
+        ]
+        # بررسی‌کننده را سرور تعیین می‌کند (services.create_petition)، نه دانشجو
+        read_only_fields = ["status", "approver", "decision_note", "created_at", "decided_at"]
+        extra_kwargs = {"term": {"required": False}}
+
+    def validate_enrollment(self, enrollment):
+        # فقط ثبت‌نام فعال خود دانشجو
+        student = self.context["request"].user
+        active = enrollment is None or (
+            enrollment.student_id == student.pk and enrollment.status == Enrollment.ENROLLED
+        )
+        if not active:
+            raise serializers.ValidationError("Active enrollment not found.")
+        return enrollment
+
+    def validate(self, attrs):
+        kind = attrs["kind"]
+        if kind == Petition.UNIT_OVERLOAD:
+            units = attrs.get("requested_units")
+            limit = getattr(settings, "REGISTRATION_OVERLOAD_MAX_UNITS", 24)
+            if attrs.get("term") is None:
+                raise serializers.ValidationError({"term": "This field is required."})
+            if units is None or not max_units() < units <= limit:
+                raise serializers.ValidationError(
+                    {"requested_units": f"Must be more than {max_units()} and at most {limit}."}
+                )
+            attrs["enrollment"] = None
+        else:
+            enrollment = attrs.get("enrollment")
+            if enrollment is None:
+                raise serializers.ValidationError({"enrollment": "This field is required."})
+            attrs["term"] = enrollment.offering.term
+            attrs["requested_units"] = None
+        return attrs
+
+
+class PetitionQueueSerializer(PetitionSerializer):
+    student_username = serializers.CharField(source="student.username", read_only=True)
+    student_number = serializers.CharField(source="student.student_id", read_only=True)
+
+    class Meta(PetitionSerializer.Meta):
+        fields = ["id", "student", "student_username", "student_number"] + PetitionSerializer.Meta.fields[1:]
+
+
+class DecisionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    decision = serializers.ChoiceField(choices=[APPROVE, REJECT])
+    note = serializers.CharField(max_length=500, required=False, allow_blank=True, default="")
+
+
+class BulkDecisionSerializer(serializers.Serializer):
+    decisions = DecisionSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_decisions(self, value):
+        if len({d["id"] for d in value}) != len(value):
+            raise serializers.ValidationError("Each petition may appear only once.")
+        return value
@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from api.bulk import chunked
+from notifications.services import notify
+from registration.models import StudentTermLoad
+from registration.services import drop_many
+from .models import Petition
+
+
+APPROVE = "approve"
+REJECT = "reject"
+
+
+class PetitionError(Exception):
+    status_code = 400
+
+    def __init__(self, detail, code, status_code=None):
+        super().__init__(detail)
+        self.detail = detail
+        self.code = code
+        if status_code is not None:
+            self.status_code = status_code
+
+
+def create_petition(student, **fields):
+    """
+    بررسی‌کننده سمت سرور تعیین می‌شود: حذف اضطراری به استاد همان ارائه و اضافه واحد (یا ارائه بدون استاد)
+    به صف عمومی مدیران می‌رود، تا دانشجو نتواند درخواستش را به بررسی‌کننده دلخواه بفرستد.
+    """
+    enrollment = fields.get("enrollment")
+    approver_id = enrollment.offering.professor_id if enrollment is not None else None
+    try:
+        with transaction.atomic():
+            return Petition.objects.create(student=student, approver_id=approver_id, **fields)
+    except IntegrityError:
+        raise PetitionError("A pending petition for this already exists.", "duplicate", 409)
+
+
+def cancel_petition(student, petition_id):
+    updated = Petition.objects.filter(
+        pk=petition_id, student=student, status=Petition.PENDING
+    ).update(status=Petition.CANCELLED, decided_at=timezone.now())
+    if not updated:
+        raise PetitionError("Pending petition not found.", "not_found", 404)
+
+
+def review_queue(reviewer, approver=None):
+    """
+    درخواست‌های در انتظار یک بررسی‌کننده به ترتیب قدیمی‌ترین؛ مدیر صف دیگران (یا unassigned) را هم می‌بیند.
+    فیلترها دقیقا پیشوند ایندکس petition_queue_idx هستند و ترتیب (created_at, id) از همان ایندکس خوانده می‌شود.
+    """
+    petitions = Petition.objects.filter(status=Petition.PENDING)
+    if reviewer.role == "admin" and approver == "unassigned":
+        petitions = petitions.filter(approver__isnull=True)
+    elif reviewer.role == "admin" and approver and approver.isdigit():
+        petitions = petitions.filter(approver_id=approver)
+    else:
+        petitions = petitions.filter(approver_id=reviewer.pk)
+    return petitions.select_related("student", "term", "enrollment__offering__course")
+
+
+@transaction.atomic
+def decide(reviewer, decisions, batch_size=200):
+    """
+    اعمال صدها تصمیم در یک تراکنش.
+
+    decisions: [{"id", "decision", "note"}]. درخواست‌ها با select_for_update قفل و با bulk_update
+    بسته می‌شوند؛ استاد فقط درخواست‌های خودش و مدیر همه را تصمیم می‌گیرد. اثرها دسته‌ای اعمال می‌شوند:
+    حذف اضطراری با drop_many، اضافه واحد با یک upsert روی بار ترم و اعلان با یک notify برای هر گروه.
+    خروجی: (درخواست‌های تصمیم‌گرفته، شناسه‌هایی که در انتظار یا در دسترس این کاربر نبودند).
+    """
+    wanted = {decision["id"]: decision for decision in decisions}
+    petitions = Petition.objects.select_for_update().filter(pk__in=wanted, status=Petition.PENDING)
+    if reviewer.role != "admin":
+        petitions = petitions.filter(approver_id=reviewer.pk)
+    petitions = list(petitions.order_by("pk"))
+
+    now = timezone.now()
+    for petition in petitions:
+        decision = wanted[petition.pk]
+        petition.status = Petition.APPROVED if decision["decision"] == APPROVE else Petition.REJECTED
+        petition.decision_note = decision.get("note", "")
+        # تصمیم‌گیرنده ثبت می‌شود؛ درخواست صف عمومی به مدیری که آن را بسته می‌رسد
+        petition.approver_id = reviewer.pk
+        petition.decided_at = now
+    Petition.objects.bulk_update(
+        petitions, ["status", "decision_note", "approver", "decided_at"], batch_size=batch_size
+    )
+
+    approved = [p for p in petitions if p.status == Petition.APPROVED]
+    for batch in chunked([p.enrollment_id for p in approved if p.kind == Petition.LATE_DROP], batch_size):
+        drop_many(batch)
+    overloads = [p for p in approved if p.kind == Petition.UNIT_OVERLOAD]
+    StudentTermLoad.objects.bulk_create(
+        [StudentTermLoad(student_id=p.student_id, term_id=p.term_id, max_units=p.requested_units) for p in overloads],
+        update_conflicts=True, unique_fields=["student", "term"], update_fields=["max_units"], batch_size=batch_size,
+    )
+
+    groups = defaultdict(list)
+    for petition in petitions:
+        groups[petition.kind, petition.status].append(petition.student_id)
+    labels = dict(Petition.KIND_CHOICES)
+    for (kind, status), student_ids in groups.items():
+        notify(
+            student_ids, f"petition_{status}", f"Your {labels[kind].lower()} petition was {status}",
+            data={"kind": kind, "status": status},
+        )
+
+    decided = {p.pk for p in petitions}
+    return petitions, [pk for pk in wanted if pk not in decided]
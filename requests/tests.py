@@ -1,3 +1,275 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from notifications.models import OutboxMessage
+from offerings.models import Offering
+from registration.models import Enrollment, StudentTermLoad
+from registration.services import RegistrationError, drop, enroll
+from registration.tests import make_offering, make_student
+from .models import Petition
+from .services import decide
+
+
+def bearer(user):
+    return f"Bearer {AccessToken.for_user(user)}"
+
+
+class PetitionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student("s1")
+        self.advisor = User.objects.create_user(username="p1", role="professor", professor_id="p1")
+        self.admin = User.objects.create_user(username="admin", role="admin")
+        self.offering = make_offering(units=3, capacity=5)
+        self.term = self.offering.term
+
+
+class PetitionApiTests(PetitionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.student)
+
+    def test_create_and_cancel(self):
+        response = self.client.post("/api/requests/petitions/", {
+            "kind": "unit_overload", "term": self.term.pk, "requested_units": 24, "approver": self.advisor.pk,
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content)
+        # دانشجو بررسی‌کننده را انتخاب نمی‌کند؛ اضافه واحد به صف عمومی مدیران می‌رود
+        self.assertIsNone(response.json()["approver"])
+        petition_id = response.json()["id"]
+
+        duplicate = self.client.post("/api/requests/petitions/", {
+            "kind": "unit_overload", "term": self.term.pk, "requested_units": 22,
+        }, content_type="application/json")
+        self.assertEqual(duplicate.status_code, 409)
+
+        self.assertEqual(self.client.delete(f"/api/requests/petitions/{petition_id}/").status_code, 204)
+        self.assertEqual(self.client.delete(f"/api/requests/petitions/{petition_id}/").status_code, 404)
+        self.assertEqual(Petition.objects.get().status, Petition.CANCELLED)
+
+    def test_validation(self):
+        other = make_student("s2")
+        enrollment = enroll(other, self.offering)
+        cases = [
+            {"kind": "unit_overload", "term": self.term.pk, "requested_units": 18},
+            {"kind": "unit_overload", "term": self.term.pk, "requested_units": 30},
+            {"kind": "unit_overload", "requested_units": 22},
+            {"kind": "late_drop"},
+            # ثبت‌نام دانشجوی دیگر
+            {"kind": "late_drop", "enrollment": enrollment.pk},
+        ]
+        for data in cases:
+            response = self.client.post("/api/requests/petitions/", data, content_type="application/json")
+            self.assertEqual(response.status_code, 400, data)
+
+    def test_late_drop_takes_term_from_enrollment(self):
+        enrollment = enroll(self.student, self.offering)
+        response = self.client.post("/api/requests/petitions/", {
+            "kind": "late_drop", "enrollment": enrollment.pk, "reason": "medical",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["term"], self.term.pk)
+        self.assertEqual(response.json()["course_code"], "CS101")
+
+    def test_late_drop_is_routed_to_the_offering_professor(self):
+        Offering.objects.filter(pk=self.offering.pk).update(professor=self.advisor)
+        other = User.objects.create_user(username="p2", role="professor", professor_id="p2")
+        response = self.client.post("/api/requests/petitions/", {
+            "kind": "late_drop", "enrollment": enroll(self.student, self.offering).pk, "approver": other.pk,
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["approver"], self.advisor.pk)
+
+    def test_students_cannot_review(self):
+        self.assertEqual(self.client.get("/api/requests/queue/").status_code, 403)
+        response = self.client.post(
+            "/api/requests/decisions/", {"decisions": [{"id": 1, "decision": "approve"}]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class ReviewQueueTests(PetitionTestCase):
+    def make_petitions(self, count, approver=None):
+        now = timezone.now()
+        petitions = Petition.objects.bulk_create([
+            Petition(
+                student=make_student(f"q{approver and approver.pk}-{i}"), kind=Petition.UNIT_OVERLOAD,
+                term=self.term, requested_units=22, approver=approver,
+            )
+            for i in range(count)
+        ])
+        # چند ردیف با created_at یکسان تا ترتیب id در keyset آزموده شود
+        for i, petition in enumerate(petitions):
+            petition.created_at = now + timedelta(seconds=i // 3)
+        Petition.objects.bulk_update(petitions, ["created_at"])
+        return petitions
+
+    def test_keyset_pagination_walks_the_queue_in_order(self):
+        petitions = self.make_petitions(12, approver=self.advisor)
+        self.make_petitions(3)
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.advisor)
+
+        seen, url = [], "/api/requests/queue/?page_size=5"
+        while url:
+            with CaptureQueriesContext(connection) as captured:
+                page = self.client.get(url).json()
+            seen += [row["id"] for row in page["results"]]
+            url = page["next"]
+            self.assertNotIn("OFFSET", captured.captured_queries[-1]["sql"].upper())
+        self.assertEqual(seen, [p.pk for p in petitions])
+        self.assertEqual(self.client.get("/api/requests/queue/?cursor=bogus").status_code, 404)
+
+    def test_queue_uses_the_composite_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("EXPLAIN QUERY PLAN is SQLite specific")
+        last = self.make_petitions(3, approver=self.advisor)[-1]
+        queryset = Petition.objects.filter(
+            status=Petition.PENDING, approver=self.advisor, created_at__gte=last.created_at
+        ).exclude(created_at=last.created_at, pk__lte=last.pk).order_by("created_at", "id")
+        plan = queryset.explain()
+        self.assertIn("petition_queue_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_admin_sees_other_queues(self):
+        self.make_petitions(2, approver=self.advisor)
+        self.make_petitions(3)
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.admin)
+        self.assertEqual(len(self.client.get("/api/requests/queue/").json()["results"]), 0)
+        self.assertEqual(len(self.client.get("/api/requests/queue/?approver=unassigned").json()["results"]), 3)
+        response = self.client.get(f"/api/requests/queue/?approver={self.advisor.pk}")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+        # استاد فقط صف خودش را می‌بیند
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.advisor)
+        response = self.client.get("/api/requests/queue/?approver=unassigned")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+
+class BulkDecisionTests(PetitionTestCase):
+    def test_side_effects_are_applied_in_one_pass(self):
+        drops, overloads = [], []
+        self.offering.capacity = 10
+        self.offering.save()
+        for i in range(6):
+            student = make_student(f"d{i}")
+            enrollment = enroll(student, self.offering)
+            drops.append(Petition.objects.create(
+                student=student, kind=Petition.LATE_DROP, term=self.term, enrollment=enrollment,
+                approver=self.advisor,
+            ))
+        for i in range(4):
+            overloads.append(Petition.objects.create(
+                student=make_student(f"o{i}"), kind=Petition.UNIT_OVERLOAD, term=self.term, requested_units=24,
+                approver=self.advisor,
+            ))
+        decisions = [{"id": p.pk, "decision": "approve"} for p in drops[:5] + overloads[:3]]
+        decisions += [{"id": drops[5].pk, "decision": "reject", "note": "too late"}]
+
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.advisor)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(
+                "/api/requests/decisions/", {"decisions": decisions + [{"id": 999, "decision": "approve"}]},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body["approved"]), 8)
+        self.assertEqual(body["rejected"], [drops[5].pk])
+        self.assertEqual(body["skipped"], [999])
+        # تعداد کوئری به تعداد تصمیم‌ها بستگی ندارد
+        self.assertLessEqual(len(captured), 20)
+
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 1)
+        self.assertEqual(Enrollment.objects.filter(status=Enrollment.DROPPED).count(), 5)
+        self.assertFalse(StudentTermLoad.objects.filter(student__username__in=["d0", "d4"], units__gt=0).exists())
+        self.assertEqual(StudentTermLoad.objects.get(student__username="d5").units, 3)
+        self.assertEqual(
+            list(StudentTermLoad.objects.filter(max_units__isnull=False).values_list("student__username", flat=True)
+                 .order_by("student__username")),
+            ["o0", "o1", "o2"],
+        )
+        self.assertEqual(Petition.objects.get(pk=drops[5].pk).decision_note, "too late")
+        self.assertEqual(OutboxMessage.objects.filter(kind="petition_approved").values("recipient").distinct().count(), 8)
+        self.assertEqual(OutboxMessage.objects.filter(kind="petition_rejected").values("recipient").distinct().count(), 1)
+
+    def test_approved_overload_raises_the_unit_limit(self):
+        petition = Petition.objects.create(
+            student=self.student, kind=Petition.UNIT_OVERLOAD, term=self.term, requested_units=8,
+        )
+        with self.settings(REGISTRATION_MAX_UNITS=5):
+            enroll(self.student, self.offering)
+            second = make_offering("CS102", units=3, term=self.term)
+            with self.assertRaises(RegistrationError):
+                enroll(self.student, second)
+            decide(self.admin, [{"id": petition.pk, "decision": "approve"}])
+            enroll(self.student, second)
+        self.assertEqual(StudentTermLoad.objects.get(student=self.student).units, 6)
+
+    def test_reviewers_only_decide_their_own_petitions(self):
+        other = User.objects.create_user(username="p2", role="professor", professor_id="p2")
+        petition = Petition.objects.create(
+            student=self.student, kind=Petition.UNIT_OVERLOAD, term=self.term, requested_units=22, approver=other,
+        )
+        decided, skipped = decide(self.advisor, [{"id": petition.pk, "decision": "approve"}])
+        self.assertEqual((decided, skipped), ([], [petition.pk]))
+
+        # مدیر درخواست صف عمومی را می‌بندد و تصمیم‌گیرنده ثبت می‌شود
+        petition.approver = None
+        petition.save()
+        decided, _ = decide(self.admin, [{"id": petition.pk, "decision": "reject"}])
+        petition.refresh_from_db()
+        self.assertEqual((petition.status, petition.approver), (Petition.REJECTED, self.admin))
+        # تصمیم دوباره روی درخواست بسته اثری ندارد
+        self.assertEqual(decide(self.admin, [{"id": petition.pk, "decision": "approve"}])[1], [petition.pk])
+
+    def test_already_dropped_enrollment_is_not_released_twice(self):
+        enrollment = enroll(self.student, self.offering)
+        petition = Petition.objects.create(
+            student=self.student, kind=Petition.LATE_DROP, term=self.term, enrollment=enrollment,
+        )
+        Enrollment.objects.filter(pk=enrollment.pk).update(status=Enrollment.DROPPED)
+        Offering.objects.filter(pk=self.offering.pk).update(enrolled_count=0)
+        decide(self.admin, [{"id": petition.pk, "decision": "approve"}])
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 0)
+
+    def test_concurrent_drop_does_not_release_the_seat_twice(self):
+        enrollment = enroll(self.student, self.offering)
+        petition = Petition.objects.create(
+            student=self.student, kind=Petition.LATE_DROP, term=self.term, enrollment=enrollment,
+        )
+        real_now = timezone.now
+
+        calls = []
+
+        def drop_in_between():
+            # فراخوانی دوم now داخل drop_many است: دانشجو همان لحظه خودش درس را حذف می‌کند
+            calls.append(None)
+            moment = real_now()
+            if len(calls) == 2:
+                drop(self.student, enrollment.pk)
+            return moment
+
+        with mock.patch("registration.services.timezone.now", side_effect=drop_in_between):
+            decide(self.admin, [{"id": petition.pk, "decision": "approve"}])
+
+        self.offering.refresh_from_db()
+        self.assertEqual(self.offering.enrolled_count, 0)
+        self.assertEqual(StudentTermLoad.objects.get(student=self.student).units, 0)
 
-# Create your tests here.
+    def test_duplicate_ids_are_rejected(self):
+        self.client.defaults["HTTP_AUTHORIZATION"] = bearer(self.admin)
+        response = self.client.post("/api/requests/decisions/", {"decisions": [
+            {"id": 1, "decision": "approve"}, {"id": 1, "decision": "reject"},
+        ]}, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,9 @@
+from django.urls import path
+from .views import PetitionCancelView, PetitionDecisionView, PetitionListCreateView, PetitionQueueView
+
+urlpatterns = [
+    path("petitions/", PetitionListCreateView.as_view()),
+    path("petitions/<int:pk>/", PetitionCancelView.as_view()),
+    path("queue/", PetitionQueueView.as_view()),
+    path("decisions/", PetitionDecisionView.as_view()),
+]
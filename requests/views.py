@@ -1,3 +1,68 @@
-from django.shortcuts import render
+from rest_framework.generics import ListAPIView
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 
-# Create your views here.
+from accounts.permissions import IsAdmin, IsProfessor, IsStudent
+from api.idempotency import IdempotentMixin
+from .models import Petition
+from .pagination import PetitionQueuePagination
+from .serializers import BulkDecisionSerializer, PetitionQueueSerializer, PetitionSerializer
+from .services import PetitionError, cancel_petition, create_petition, decide, review_queue
+
+
+class PetitionListCreateView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def get(self, request):
+        petitions = Petition.objects.filter(student_id=request.user.pk).select_related("enrollment__offering__course")
+        return Response(PetitionSerializer(petitions, many=True).data)
+
+    def post(self, request):
+        serializer = PetitionSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            petition = create_petition(request.user, **serializer.validated_data)
+        except PetitionError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        return Response(PetitionSerializer(petition).data, status=status.HTTP_201_CREATED)
+
+
+class PetitionCancelView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsStudent]
+
+    def delete(self, request, pk):
+        try:
+            cancel_petition(request.user, pk)
+        except PetitionError as e:
+            return Response({"detail": e.detail, "code": e.code}, status=e.status_code)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PetitionQueueView(ListAPIView):
+    """صف بررسی: ?approver=unassigned یا شناسه بررسی‌کننده فقط برای مدیر."""
+    permission_classes = [IsAuthenticated, IsProfessor | IsAdmin]
+    serializer_class = PetitionQueueSerializer
+    pagination_class = PetitionQueuePagination
+
+    def get_queryset(self):
+        return review_queue(self.request.user, self.request.query_params.get("approver"))
+
+
+class PetitionDecisionView(IdempotentMixin, APIView):
+    permission_classes = [IsAuthenticated, IsProfessor | IsAdmin]
+
+    def post(self, request):
+        serializer = BulkDecisionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        petitions, skipped = decide(request.user, serializer.validated_data["decisions"])
+        return Response({
+            "approved": [p.pk for p in petitions if p.status == Petition.APPROVED],
+            "rejected": [p.pk for p in petitions if p.status == Petition.REJECTED],
+            "skipped": skipped,
+        })
@@ -144,6 +144,63 @@ const API = {
         this.clearAuth();
     },
 
+    /**
+     * Identical mutating requests still in flight (double clicks, retries) share one Idempotency-Key
+     */
+    pendingKeys: new Map(),
+
+    newIdempotencyKey() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+    },
+
+    /**
+     * Send a POST/PUT/DELETE with an Idempotency-Key; network errors and "still in progress"
+     * answers (409 with Retry-After) are retried with the same key, so the server runs it once
+     */
+    async sendMutation(url, method, data) {
+        const body = data === undefined ? undefined : JSON.stringify(data);
+        const signature = `${method} ${url} ${body || ''}`;
+        let pending = this.pendingKeys.get(signature);
+        if (!pending) {
+            pending = { key: this.newIdempotencyKey(), users: 0 };
+            this.pendingKeys.set(signature, pending);
+        }
+        pending.users++;
+
+        const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+        try {
+            for (let attempt = 0; ; attempt++) {
+                let response;
+                try {
+                    response = await fetch(url, {
+                        method,
+                        headers: { ...this.getAuthHeaders(), 'Idempotency-Key': pending.key },
+                        body
+                    });
+                } catch (e) {
+                    if (attempt >= 2) {
+                        throw e;
+                    }
+                    await sleep(500 * (attempt + 1));
+                    continue;
+                }
+                const retryAfter = response.headers.get('Retry-After');
+                if (response.status === 409 && retryAfter && attempt < 5) {
+                    await sleep(Number(retryAfter) * 1000);
+                    continue;
+                }
+                return response;
+            }
+        } finally {
+            if (--pending.users === 0) {
+                this.pendingKeys.delete(signature);
+            }
+        }
+    },
+
     // ========== DEPARTMENTS API ==========
     
     /**
@@ -172,11 +229,7 @@ const API = {
      * Create new department
      */
     async createDepartment(data) {
-        const response = await fetch(`${this.baseURL}/departments/departments/`, {
-            method: 'POST',
-            headers: this.getAuthHeaders(),
-            body: JSON.stringify(data)
-        });
+        const response = await this.sendMutation(`${this.baseURL}/departments/departments/`, 'POST', data);
         return this.handleResponse(response);
     },
 
@@ -184,11 +237,7 @@ const API = {
      * Update department
      */
     async updateDepartment(id, data) {
-        const response = await fetch(`${this.baseURL}/departments/departments/${id}/`, {
-            method: 'PUT',
-            headers: this.getAuthHeaders(),
-            body: JSON.stringify(data)
-        });
+        const response = await this.sendMutation(`${this.baseURL}/departments/departments/${id}/`, 'PUT', data);
         return this.handleResponse(response);
     },
 
@@ -196,10 +245,7 @@ const API = {
      * Delete department
      */
     async deleteDepartment(id) {
-        const response = await fetch(`${this.baseURL}/departments/departments/${id}/`, {
-            method: 'DELETE',
-            headers: this.getAuthHeaders()
-        });
+        const response = await this.sendMutation(`${this.baseURL}/departments/departments/${id}/`, 'DELETE');
         if (response.status === 204) {
             return null;
         }
@@ -209,14 +255,34 @@ const API = {
     // ========== COURSES API ==========
 
     /**
-     * Get all courses
+     * Get all courses (follows cursor pagination until the last page)
      */
     async getCourses() {
-        const response = await fetch(`${this.baseURL}/courses/`, {
+        let url = `${this.baseURL}/courses/`;
+        const courses = [];
+        while (url) {
+            const response = await fetch(url, {
+                method: 'GET',
+                headers: this.getAuthHeaders()
+            });
+            const data = await this.handleResponse(response);
+            courses.push(...data.results);
+            url = data.next;
+        }
+        return courses;
+    },
+
+    /**
+     * Ranked search by partial code or title (typos tolerated)
+     */
+    async searchCourses(query, limit = 50) {
+        const params = new URLSearchParams({ q: query, limit });
+        const response = await fetch(`${this.baseURL}/courses/search/?${params}`, {
             method: 'GET',
             headers: this.getAuthHeaders()
         });
-        return this.handleResponse(response);
+        const data = await this.handleResponse(response);
+        return data.results;
     },
 
     /**
@@ -234,11 +300,7 @@ const API = {
      * Create new course
      */
     async createCourse(data) {
-        const response = await fetch(`${this.baseURL}/courses/`, {
-            method: 'POST',
-            headers: this.getAuthHeaders(),
-            body: JSON.stringify(data)
-        });
+        const response = await this.sendMutation(`${this.baseURL}/courses/`, 'POST', data);
         return this.handleResponse(response);
     },
 
@@ -246,11 +308,7 @@ const API = {
      * Update course
      */
     async updateCourse(id, data) {
-        const response = await fetch(`${this.baseURL}/courses/${id}/`, {
-            method: 'PUT',
-            headers: this.getAuthHeaders(),
-            body: JSON.stringify(data)
-        });
+        const response = await this.sendMutation(`${this.baseURL}/courses/${id}/`, 'PUT', data);
         return this.handleResponse(response);
     },
 
@@ -258,10 +316,7 @@ const API = {
      * Delete course
      */
     async deleteCourse(id) {
-        const response = await fetch(`${this.baseURL}/courses/${id}/`, {
-            method: 'DELETE',
-            headers: this.getAuthHeaders()
-        });
+        const response = await this.sendMutation(`${this.baseURL}/courses/${id}/`, 'DELETE');
         if (response.status === 204) {
             return null;
         }
@@ -3,6 +3,7 @@ function coursesManager() {
     return {
         courses: [],
         departments: [],
+        query: '',
         loading: false,
         error: '',
         success: '',
@@ -26,7 +27,8 @@ function coursesManager() {
             this.loading = true;
             this.error = '';
             try {
-                this.courses = await API.getCourses();
+                const query = this.query.trim();
+                this.courses = query ? await API.searchCourses(query) : await API.getCourses();
             } catch (err) {
                 this.error = err.message || 'خطا در بارگذاری دروس';
             } finally {
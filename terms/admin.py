@@ -1,3 +1,18 @@
 from django.contrib import admin
+from .models import Term
 
-# Register your models here.
+
+@admin.register(Term)
+class TermAdmin(admin.ModelAdmin):
+    list_display = ("name", "start_date", "end_date", "status", "status_changed_at")
+    list_filter = ("status",)
+    search_fields = ("name",)
+    readonly_fields = ("status", "status_changed_at")
+    fieldsets = (
+        (None, {"fields": ("name", "start_date", "end_date", "status", "status_changed_at")}),
+        ("Windows", {"fields": (
+            ("registration_opens_at", "registration_closes_at"),
+            ("add_drop_opens_at", "add_drop_closes_at"),
+            ("grading_opens_at", "grading_closes_at"),
+        )}),
+    )
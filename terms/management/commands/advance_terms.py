@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from terms.services import advance_terms
+
+
+class Command(BaseCommand):
+    help = "Move terms into the status matching their registration, add/drop and grading windows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval", type=int, default=0,
+            help="Keep running as a scheduler, checking every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for term, previous in advance_terms():
+                self.stdout.write(f"{term.name}: {previous} -> {term.status}")
+            if not options["interval"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
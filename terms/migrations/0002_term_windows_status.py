@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:50
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def initial_status(apps, schema_editor):
+    # ترم‌های موجود بازه ندارند؛ وضعیت فقط از تاریخ‌ها (بقیه را advance_terms به‌روز می‌کند)
+    Term = apps.get_model("terms", "Term")
+    today = timezone.localdate()
+    Term.objects.filter(start_date__lte=today, end_date__gte=today).update(status="in_progress")
+    Term.objects.filter(end_date__lt=today).update(status="closed")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='term',
+            name='add_drop_closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='add_drop_opens_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='grading_closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='grading_opens_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='registration_closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='registration_opens_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='status',
+            field=models.CharField(choices=[('upcoming', 'Upcoming'), ('registration', 'Registration'), ('add_drop', 'Add/drop'), ('in_progress', 'In progress'), ('grading', 'Grading'), ('closed', 'Closed')], default='upcoming', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(initial_status, migrations.RunPython.noop),
+    ]
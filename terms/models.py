@@ -1,16 +1,50 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 class Term(models.Model):
+    UPCOMING = "upcoming"
+    REGISTRATION = "registration"
+    ADD_DROP = "add_drop"
+    IN_PROGRESS = "in_progress"
+    GRADING = "grading"
+    CLOSED = "closed"
+    STATUS_CHOICES = [
+        (UPCOMING, "Upcoming"),
+        (REGISTRATION, "Registration"),
+        (ADD_DROP, "Add/drop"),
+        (IN_PROGRESS, "In progress"),
+        (GRADING, "Grading"),
+        (CLOSED, "Closed"),
+    ]
+
+    # (وضعیت، فیلد شروع، فیلد پایان) به ترتیب زمانی؛ هر بازه [شروع، پایان) است
+    WINDOWS = [
+        (REGISTRATION, "registration_opens_at", "registration_closes_at"),
+        (ADD_DROP, "add_drop_opens_at", "add_drop_closes_at"),
+        (GRADING, "grading_opens_at", "grading_closes_at"),
+    ]
+
     name = models.CharField(
         max_length=64,
-        unique=True,                  
+        unique=True,
     )
-    
+
     start_date = models.DateField()   # تاریخ شروع ترم
     end_date = models.DateField()     # تاریخ پایان ترم
 
+    registration_opens_at = models.DateTimeField(null=True, blank=True)
+    registration_closes_at = models.DateTimeField(null=True, blank=True)
+    add_drop_opens_at = models.DateTimeField(null=True, blank=True)
+    add_drop_closes_at = models.DateTimeField(null=True, blank=True)
+    grading_opens_at = models.DateTimeField(null=True, blank=True)
+    grading_closes_at = models.DateTimeField(null=True, blank=True)
+
+    # فقط دستور advance_terms وضعیت را تغییر می‌دهد؛ درخواست‌ها فقط آن را می‌خوانند
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=UPCOMING)
+    status_changed_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ["-start_date"]    # جدیدترین ترم‌ها اول نمایش داده شوند
 
@@ -21,3 +55,47 @@ class Term(models.Model):
 
         if self.start_date >= self.end_date:
             raise ValidationError("start_date must be before end_date.") #این ورودی اشتباهه، اجازه نمی‌دم توی دیتابیس بره
+
+        previous_close = None
+        for status, opens_field, closes_field in self.WINDOWS:
+            opens, closes = getattr(self, opens_field), getattr(self, closes_field)
+            if (opens is None) != (closes is None):
+                raise ValidationError(f"{opens_field} and {closes_field} must be set together.")
+            if opens is None:
+                continue
+            if opens >= closes:
+                raise ValidationError(f"{opens_field} must be before {closes_field}.")
+            if previous_close and opens < previous_close:
+                raise ValidationError(f"The {status} window must not start before the previous window closes.")
+            previous_close = closes
+
+    def status_at(self, now):
+        """وضعیتی که ترم در لحظه now باید داشته باشد (برای scheduler؛ در مسیر درخواست استفاده نمی‌شود)."""
+        for status, opens_field, closes_field in self.WINDOWS:
+            opens, closes = getattr(self, opens_field), getattr(self, closes_field)
+            if opens is not None and opens <= now < closes:
+                return status
+
+        if self.grading_closes_at is not None and now >= self.grading_closes_at:
+            return self.CLOSED
+        today = timezone.localdate(now)
+        if today < self.start_date:
+            return self.UPCOMING
+        if today <= self.end_date:
+            return self.IN_PROGRESS
+        # بعد از پایان کلاس‌ها تا بسته شدن بازه نمره‌دهی
+        if self.grading_opens_at is not None:
+            return self.IN_PROGRESS
+        return self.CLOSED
+
+    @property
+    def registration_open(self):
+        return self.status in (self.REGISTRATION, self.ADD_DROP)
+
+    @property
+    def add_drop_open(self):
+        return self.status == self.ADD_DROP
+
+    @property
+    def grading_open(self):
+        return self.status == self.GRADING
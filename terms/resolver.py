@@ -0,0 +1,87 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Term
+
+
+# ترم‌هایی که «جاری» حساب می‌شوند؛ بین چند ترم فعال، ترمی که دیرتر شروع می‌شود
+ACTIVE_STATUSES = (Term.REGISTRATION, Term.ADD_DROP, Term.IN_PROGRESS, Term.GRADING)
+
+
+class TermResolver:
+    """
+    نسخه درون‌پروسه‌ای همه ترم‌ها برای بررسی‌های مسیر داغ (ترم جاری، باز بودن ثبت‌نام و نمره‌دهی).
+
+    کل جدول (چند ده ردیف) با یک کوئری خوانده می‌شود و تا ttl ثانیه بدون کوئری پاسخ داده می‌شود.
+    ذخیره یا حذف ترم در همین پروسه فوراً آن را بی‌اعتبار می‌کند؛ پروسه‌های دیگر حداکثر بعد از ttl
+    تغییر (مثلا وضعیت جدید از advance_terms) را می‌بینند. نمونه‌های برگشتی فقط خواندنی هستند.
+    """
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._terms = None
+        self._current = None
+        self._expires_at = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._terms is not None and self._expires_at > now:
+                return self._terms, self._current
+            generation = self._generation
+
+        terms = {term.pk: term for term in Term.objects.all()}
+        active = [term for term in terms.values() if term.status in ACTIVE_STATUSES]
+        current = max(active, key=lambda term: term.start_date, default=None)
+        with self._lock:
+            # اگر وسط خواندن بی‌اعتبار شده باشد، نتیجه (شاید قدیمی) نگه داشته نمی‌شود
+            if generation == self._generation:
+                self._terms, self._current, self._expires_at = terms, current, now + self.ttl
+        return terms, current
+
+    def current(self):
+        """ترم جاری یا None."""
+        return self._load()[1]
+
+    def get(self, term_id):
+        return self._load()[0].get(term_id)
+
+    def registration_open(self, term_id):
+        term = self.get(term_id)
+        return term is not None and term.registration_open
+
+    def add_drop_open(self, term_id):
+        term = self.get(term_id)
+        return term is not None and term.add_drop_open
+
+    def registering(self):
+        """ترمی که در بازه ثبت‌نام اولیه (REGISTRATION) است یا None؛ بین چند ترم، ترمی که دیرتر شروع می‌شود."""
+        open_terms = [term for term in self._load()[0].values() if term.status == Term.REGISTRATION]
+        return max(open_terms, key=lambda term: term.start_date, default=None)
+
+    def grading_open(self, term_id):
+        term = self.get(term_id)
+        return term is not None and term.grading_open
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._terms = None
+            self._current = None
+
+
+terms = TermResolver(ttl=getattr(settings, "TERM_RESOLVER_TTL", 30))
+
+
+@receiver([post_save, post_delete], sender=Term)
+def _term_changed(sender, **kwargs):
+    # بعد از commit هم، تا خواندنی که بین این دو اتفاق افتاده داده قبل از commit را نگه ندارد
+    terms.invalidate()
+    transaction.on_commit(terms.invalidate)
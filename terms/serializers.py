@@ -0,0 +1,32 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from .models import Term
+
+
+class TermSerializer(serializers.ModelSerializer):
+    registration_open = serializers.BooleanField(read_only=True)
+    add_drop_open = serializers.BooleanField(read_only=True)
+    grading_open = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = Term
+        fields = [
+            "id", "name", "start_date", "end_date",
+            "registration_opens_at", "registration_closes_at",
+            "add_drop_opens_at", "add_drop_closes_at",
+            "grading_opens_at", "grading_closes_at",
+            "status", "status_changed_at", "registration_open", "add_drop_open", "grading_open",
+        ]
+        read_only_fields = ["status", "status_changed_at"]
+
+    def validate(self, attrs):
+        # قواعد بازه‌ها در Term.clean است؛ روی نسخه ذخیره‌نشده (مقادیر فعلی + ورودی) اجرا می‌شود
+        values = {}
+        if self.instance is not None:
+            values = {field.attname: getattr(self.instance, field.attname) for field in Term._meta.concrete_fields}
+        try:
+            Term(**{**values, **attrs}).clean()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return attrs
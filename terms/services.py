@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Term
+
+
+def advance_terms(now=None):
+    """
+    وضعیت هر ترم بسته‌نشده را با بازه‌هایش هم‌گام می‌کند؛ فقط ترم‌های تغییرکرده ذخیره می‌شوند
+    (سیگنال post_save کش‌های ترم را بی‌اعتبار می‌کند). خروجی: [(ترم، وضعیت قبلی)، ...]
+    """
+    now = now or timezone.now()
+    changed = []
+    with transaction.atomic():
+        for term in Term.objects.exclude(status=Term.CLOSED).select_for_update():
+            status = term.status_at(now)
+            if status != term.status:
+                changed.append((term, term.status))
+                term.status = status
+                term.status_changed_at = now
+                term.save(update_fields=["status", "status_changed_at"])
+    return changed
@@ -1,3 +1,123 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from api.cache import reference_cache
+from .models import Term
+from .resolver import terms
+from .services import advance_terms
+
+
+def at(month, day, hour=0):
+    return datetime(2030, month, day, hour, tzinfo=dt_timezone.utc)
+
+
+def make_term(name="Fall 2030", **kwargs):
+    return Term.objects.create(
+        name=name, start_date=date(2030, 9, 1), end_date=date(2030, 12, 20),
+        registration_opens_at=at(8, 1), registration_closes_at=at(8, 20),
+        add_drop_opens_at=at(9, 1), add_drop_closes_at=at(9, 10),
+        grading_opens_at=at(12, 21), grading_closes_at=at(12, 31),
+        **kwargs,
+    )
+
+
+class TermStatusTests(TestCase):
+    def setUp(self):
+        terms.invalidate()
+
+    def test_status_follows_windows(self):
+        term = make_term()
+        self.assertEqual(term.status_at(at(7, 1)), Term.UPCOMING)
+        self.assertEqual(term.status_at(at(8, 1)), Term.REGISTRATION)
+        self.assertEqual(term.status_at(at(8, 25)), Term.UPCOMING)
+        self.assertEqual(term.status_at(at(9, 5)), Term.ADD_DROP)
+        self.assertEqual(term.status_at(at(10, 1)), Term.IN_PROGRESS)
+        self.assertEqual(term.status_at(at(12, 21, 12)), Term.GRADING)
+        self.assertEqual(term.status_at(at(12, 31)), Term.CLOSED)
+
+    def test_overlapping_windows_are_rejected(self):
+        term = make_term()
+        term.add_drop_opens_at = at(8, 10)
+        with self.assertRaises(ValidationError):
+            term.clean()
+        term.add_drop_opens_at = None
+        with self.assertRaises(ValidationError):
+            term.clean()
+
+    def test_advance_terms_updates_the_resolver(self):
+        term = make_term()
+        self.assertFalse(terms.registration_open(term.pk))
+
+        changed = advance_terms(now=at(8, 2))
+        self.assertEqual([(t.pk, previous) for t, previous in changed], [(term.pk, Term.UPCOMING)])
+        self.assertTrue(terms.registration_open(term.pk))
+        self.assertEqual(terms.current().pk, term.pk)
+
+        self.assertEqual(advance_terms(now=at(8, 3)), [])
+        advance_terms(now=at(12, 22))
+        self.assertTrue(terms.grading_open(term.pk))
+        self.assertFalse(terms.registration_open(term.pk))
+
+    def test_resolver_checks_cost_no_queries(self):
+        term = make_term(status=Term.ADD_DROP)
+        terms.current()
+        with self.assertNumQueries(0):
+            for _ in range(100):
+                self.assertTrue(terms.add_drop_open(term.pk))
+                self.assertEqual(terms.current().pk, term.pk)
+
+    def test_current_is_latest_active_term(self):
+        make_term(status=Term.GRADING)
+        spring = Term.objects.create(
+            name="Spring 2031", start_date=date(2031, 2, 1), end_date=date(2031, 6, 1), status=Term.REGISTRATION
+        )
+        Term.objects.create(name="Fall 2031", start_date=date(2031, 9, 1), end_date=date(2031, 12, 1))
+        self.assertEqual(terms.current().pk, spring.pk)
+
+
+class TermApiTests(TestCase):
+    url = "/api/terms/"
+
+    def setUp(self):
+        terms.invalidate()
+        reference_cache().clear()
+        admin = User.objects.create_user(username="admin", role="admin")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(admin)}"
+
+    def test_create_validates_windows_and_ignores_status(self):
+        data = {
+            "name": "Fall 2030", "start_date": "2030-09-01", "end_date": "2030-12-20",
+            "registration_opens_at": "2030-08-20T00:00:00Z", "registration_closes_at": "2030-08-01T00:00:00Z",
+        }
+        response = self.client.post(self.url, data, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+        data["registration_closes_at"] = "2030-08-25T00:00:00Z"
+        data["status"] = Term.GRADING
+        response = self.client.post(self.url, data, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["status"], Term.UPCOMING)
+
+        response = self.client.patch(
+            f"{self.url}{response.data['id']}/", {"registration_opens_at": None}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_current(self):
+        self.assertIsNone(self.client.get(f"{self.url}current/").data)
+        term = make_term(status=Term.REGISTRATION)
+        response = self.client.get(f"{self.url}current/")
+        self.assertEqual(response.data["id"], term.pk)
+        self.assertTrue(response.data["registration_open"])
+        self.assertEqual(response.data["registration_opens_at"], "2030-08-01T00:00:00Z")
 
-# Create your tests here.
+    def test_list_is_invalidated_when_status_changes(self):
+        make_term()
+        self.assertEqual(self.client.get(self.url).data[0]["status"], Term.UPCOMING)
+        with self.captureOnCommitCallbacks(execute=True):
+            advance_terms(now=at(8, 2))
+        self.assertEqual(self.client.get(self.url).data[0]["status"], Term.REGISTRATION)
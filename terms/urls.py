@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .views import TermViewSet
+
+router = DefaultRouter()
+router.register("", TermViewSet, basename="terms")
+
+urlpatterns = router.urls
@@ -1,3 +1,25 @@
-from django.shortcuts import render
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
-# Create your views here.
+from api.cache import TERMS, ReferenceCacheMixin
+from departments.permissions import IsAdminOrReadOnly
+from .models import Term
+from .resolver import terms
+from .serializers import TermSerializer
+
+
+class TermViewSet(ReferenceCacheMixin, viewsets.ModelViewSet):
+    """
+    ترم‌ها و بازه‌هایشان؛ وضعیت فقط خواندنی است و با دستور advance_terms جلو می‌رود.
+    """
+    cache_namespace = TERMS
+    queryset = Term.objects.all()
+    serializer_class = TermSerializer
+    permission_classes = [IsAdminOrReadOnly]
+
+    @action(detail=False, methods=["get"])
+    def current(self, request):
+        """ترم جاری از resolver درون‌پروسه‌ای (بدون کوئری)؛ اگر ترم فعالی نباشد null."""
+        term = terms.current()
+        return Response(TermSerializer(term).data if term else None)